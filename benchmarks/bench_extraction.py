@@ -0,0 +1,103 @@
+"""
+Бенчмарк извлечения полей вакансии
+
+Сравнивает прежний способ (все _extract_* по очереди, каждый со своим
+поиском по дереву) с ExtractionPlan (один обход документа) на страницах
+из кэша HTML. Работает без сети и браузера; результаты обоих способов
+сверяются по каждой странице.
+
+Запуск:
+    python benchmarks/bench_extraction.py
+    python benchmarks/bench_extraction.py --limit 500 --repeat 3
+"""
+
+import sys
+import os
+import glob
+import gzip
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.parser import VacancyParser
+from src.config import Config
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+
+
+def load_cached_pages(cache_dir: str, limit: int):
+    """Читает до limit страниц из кэша HTML"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(cache_dir, '*', '*.html.gz')))[:limit]:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            pages.append(f.read())
+    return pages
+
+
+def timed(func, soups, repeat: int) -> float:
+    """Лучшее из repeat время обработки всех страниц, мс на страницу"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for soup in soups:
+            func(soup)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(soups) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Бенчмарк извлечения полей вакансии')
+    arg_parser.add_argument('--cache-dir', default=None, help='Каталог кэша HTML (по умолчанию data/html_cache)')
+    arg_parser.add_argument('--limit', type=int, default=200, help='Сколько страниц взять из кэша')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Повторов замера')
+    args = arg_parser.parse_args()
+
+    config = Config()
+    cache_dir = args.cache_dir or config.get_data_file('html_cache')
+    pages = load_cached_pages(cache_dir, args.limit)
+    if not pages:
+        print(f"[ERROR] В {cache_dir} нет страниц. Сначала соберите вакансии с включенным CACHE_CONFIG")
+        return
+
+    parser = VacancyParser(config, use_cache=False)
+    extractors = parser._field_extractors()
+
+    def sequential(soup):
+        return {field: extractor(soup) for field, extractor in extractors.items()}
+
+    started = time.perf_counter()
+    soups = [BeautifulSoup(content, 'lxml') for content in pages]
+    parse_ms = (time.perf_counter() - started) / len(pages) * 1000
+
+    mismatches = sum(1 for soup in soups if sequential(soup) != parser._extract_fields(soup))
+
+    sequential_ms = timed(sequential, soups, args.repeat)
+    plan_ms = timed(parser._extract_fields, soups, args.repeat)
+
+    print(f"[+] Страниц: {len(pages)}, средний размер {statistics.mean(len(p) for p in pages) / 1024:.0f} КБ")
+    print()
+    print(f"{'Этап':<36}{'мс/страница':>14}")
+    print(f"{'Разбор BeautifulSoup (lxml)':<36}{parse_ms:>14.2f}")
+    print(f"{'Извлечение: _extract_* по очереди':<36}{sequential_ms:>14.2f}")
+    print(f"{'Извлечение: ExtractionPlan':<36}{plan_ms:>14.2f}")
+    print()
+    print(f"[OK] Извлечение быстрее в x{sequential_ms / plan_ms:.2f}, "
+          f"вся страница (разбор + извлечение) в x{(parse_ms + sequential_ms) / (parse_ms + plan_ms):.2f}")
+    if mismatches:
+        print(f"[!] Результаты различаются на {mismatches} страницах")
+    else:
+        print("[OK] Результаты совпадают на всех страницах")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""
+Бенчмарк разбора на офлайн-корпусе страниц (tests/fixtures)
+
+Корпус синтетический (разметка по образцу rabota.by, данные выдуманы),
+поэтому замеры сравнивают версии парсера между собой, а не предсказывают
+скорость на реальных страницах.
+
+Замеряет каждый _extract_* VacancyParser, извлечение всех полей за один
+проход, бэкенды разбора целиком (HTML → поля), извлечение ссылок и числа
+страниц выдачи и DataProcessor.process_single_vacancy. Для каждого этапа
+выводятся страницы в секунду и пиковый объем памяти, выделенной на
+одну страницу (tracemalloc).
+
+Пороги в benchmarks/thresholds.json: минимальная скорость и максимальная
+память по каждому этапу, с запасом на более медленные машины. С --check
+выход с кодом 1, если какой-то этап оказался медленнее или прожорливее
+порога. Сеть и браузер не нужны; те же проверки запускает
+tests/test_benchmarks.py (только с python -m pytest tests --benchmark).
+
+Запуск:
+    python benchmarks/bench_parser.py
+    python benchmarks/bench_parser.py --repeat 5 --check
+    python benchmarks/bench_parser.py --save-thresholds
+"""
+
+import sys
+import os
+import gc
+import glob
+import json
+import math
+import time
+import argparse
+import tracemalloc
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from src.config import Config
+from src.parser import VacancyParser
+from src.parser_backends import PARSER_BACKENDS
+from src.processor import DataProcessor
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), 'tests', 'fixtures')
+THRESHOLDS_FILE = os.path.join(BENCHMARKS_DIR, 'thresholds.json')
+
+# Запас порогов при --save-thresholds: скорость в N раз ниже замеренной, память в N раз больше
+SPEED_MARGIN = 5
+MEMORY_MARGIN = 2
+# Порог памяти не меньше, чем это значение, КБ: у мелких этапов пик зависит от версии Python
+MIN_PEAK_KB = 16
+
+
+def load_corpus(fixtures_dir: str = FIXTURES_DIR) -> Dict[str, Dict[str, str]]:
+    """
+    Читает страницы синтетического корпуса
+
+    Returns:
+        Dict: {'vacancy': {имя: HTML}, 'serp': {имя: HTML}}
+    """
+    corpus = {}
+    for kind in ('vacancy', 'serp'):
+        corpus[kind] = {}
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, kind, '*.html'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                corpus[kind][os.path.basename(path)[:-len('.html')]] = f.read()
+    return corpus
+
+
+def _pass_seconds(func: Callable, inputs: List, loops: int) -> float:
+    """Время loops проходов по inputs; сборщик мусора на время замера отключается, как в timeit"""
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(loops):
+            for item in inputs:
+                func(item)
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def measure(func: Callable, inputs: List, repeat: int = 3, min_time: float = 0.05) -> Dict:
+    """
+    Скорость и память одного этапа
+
+    Число проходов по корпусу подбирается так, чтобы замер длился не меньше
+    min_time секунд; берется лучший из repeat замеров. Память измеряется
+    отдельным проходом: трассировка tracemalloc замедляет код.
+
+    Returns:
+        Dict: {'pages_per_sec': ..., 'ms_per_page': ..., 'peak_kb': пик памяти на одну страницу}
+    """
+    loops = 1
+    while _pass_seconds(func, inputs, loops) < min_time and loops < 1 << 20:
+        loops *= 2
+
+    best = min(_pass_seconds(func, inputs, loops) for _ in range(repeat))
+    per_page = best / (loops * len(inputs))
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for item in inputs:
+            tracemalloc.clear_traces()
+            func(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'pages_per_sec': round(1 / per_page, 1),
+        'ms_per_page': round(per_page * 1000, 4),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def benchmark_cases(parser: VacancyParser, processor: DataProcessor,
+                    corpus: Dict[str, Dict[str, str]]) -> Dict[str, Tuple[Callable, List]]:
+    """Этапы для замера: {название: (функция, входные данные)}"""
+    vacancy_pages = list(corpus['vacancy'].values())
+    vacancy_soups = [BeautifulSoup(content, 'lxml') for content in vacancy_pages]
+
+    # Страницы выдачи без результатов _extract_serp_links не разбирает (ошибка) — для ссылок не берем
+    serp_pages = list(corpus['serp'].values())
+    serp_soups = [BeautifulSoup(content, 'lxml') for content in serp_pages]
+    result_soups = [soup for soup in serp_soups
+                    if soup.find('div', {'data-qa': 'vacancy-serp__results'}) is not None]
+
+    cases = {'BeautifulSoup(lxml)': (lambda content: BeautifulSoup(content, 'lxml'), vacancy_pages)}
+    for extractor in parser._field_extractors().values():
+        cases[extractor.__name__] = (extractor, vacancy_soups)
+    cases['_extract_fields'] = (parser._extract_fields, vacancy_soups)
+
+    for name, backend_cls in PARSER_BACKENDS.items():
+        cases[f'vacancy_fields[{name}]'] = (backend_cls(parser).vacancy_fields, vacancy_pages)
+
+    cases['_extract_serp_links'] = (parser._extract_serp_links, result_soups)
+    cases['_extract_pages_count'] = (parser._extract_pages_count, serp_soups)
+    for name, backend_cls in PARSER_BACKENDS.items():
+        backend = backend_cls(parser)
+        cases[f'serp_links[{name}]'] = (
+            lambda content, backend=backend: backend.serp_links(backend.serp_document(content)),
+            [content for content, soup in zip(serp_pages, serp_soups) if soup in result_soups],
+        )
+
+    records = [parser._make_record(parser._extract_fields(soup), f'https://rabota.by/vacancy/{index}')
+               for index, soup in enumerate(vacancy_soups)]
+    links_dict = {record['url']: ['Программист'] for record in records}
+    # process_single_vacancy дополняет запись — каждый раз обрабатывается копия
+    cases['process_single_vacancy'] = (
+        lambda record: processor.process_single_vacancy(dict(record), links_dict), records,
+    )
+    return cases
+
+
+def run_benchmarks(repeat: int = 3, min_time: float = 0.05, fixtures_dir: str = FIXTURES_DIR,
+                   names: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """Замеряет этапы на корпусе (все или только names): {название: результат measure}"""
+    config = Config()
+    parser = VacancyParser(config, use_cache=False)
+    processor = DataProcessor(config)
+    cases = benchmark_cases(parser, processor, load_corpus(fixtures_dir))
+    if names is not None:
+        cases = {name: cases[name] for name in names if name in cases}
+    return {name: measure(func, inputs, repeat, min_time) for name, (func, inputs) in cases.items()}
+
+
+def load_thresholds(path: str = THRESHOLDS_FILE) -> Dict[str, Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)['cases']
+
+
+def check_thresholds(results: Dict[str, Dict], thresholds: Dict[str, Dict]) -> List[str]:
+    """Этапы, которые медленнее или расходуют больше памяти, чем допускает порог"""
+    regressions = []
+    for name, limits in thresholds.items():
+        result = results.get(name)
+        if result is None:
+            regressions.append(f"{name}: этап не замерялся")
+            continue
+        if result['pages_per_sec'] < limits['min_pages_per_sec']:
+            regressions.append(f"{name}: {result['pages_per_sec']} стр/с < порога {limits['min_pages_per_sec']}")
+        if result['peak_kb'] > limits['max_peak_kb']:
+            regressions.append(f"{name}: {result['peak_kb']} КБ > порога {limits['max_peak_kb']}")
+    return regressions
+
+
+def save_thresholds(results: Dict[str, Dict], path: str = THRESHOLDS_FILE):
+    """Записывает пороги по текущим замерам с запасом SPEED_MARGIN / MEMORY_MARGIN"""
+    data = {
+        'speed_margin': SPEED_MARGIN,
+        'memory_margin': MEMORY_MARGIN,
+        'cases': {
+            name: {
+                'min_pages_per_sec': float(f"{result['pages_per_sec'] / SPEED_MARGIN:.2g}"),
+                'max_peak_kb': max(math.ceil(result['peak_kb'] * MEMORY_MARGIN), MIN_PEAK_KB),
+            }
+            for name, result in results.items()
+        },
+    }
+    tmp_file = path + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_file, path)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Бенчмарк разбора на офлайн-корпусе страниц')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Повторов замера')
+    arg_parser.add_argument('--min-time', type=float, default=0.05, help='Минимальная длительность одного замера, с')
+    arg_parser.add_argument('--check', action='store_true', help='Сравнить с порогами benchmarks/thresholds.json')
+    arg_parser.add_argument('--save-thresholds', action='store_true', help='Записать пороги по текущим замерам')
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"[+] Корпус: {len(corpus['vacancy'])} страниц вакансий, {len(corpus['serp'])} страниц выдачи")
+    results = run_benchmarks(args.repeat, args.min_time)
+
+    thresholds = load_thresholds() if os.path.exists(THRESHOLDS_FILE) else {}
+    print()
+    print(f"{'Этап':<32}{'стр/с':>12}{'мс/стр':>10}{'пик КБ':>10}{'порог стр/с':>14}")
+    for name, result in results.items():
+        limit = thresholds.get(name, {}).get('min_pages_per_sec', '')
+        print(f"{name:<32}{result['pages_per_sec']:>12.1f}{result['ms_per_page']:>10.3f}"
+              f"{result['peak_kb']:>10.1f}{limit:>14}")
+    print()
+
+    if args.save_thresholds:
+        save_thresholds(results)
+        print(f"[OK] Пороги сохранены: {THRESHOLDS_FILE}")
+
+    if args.check:
+        regressions = check_thresholds(results, thresholds)
+        if regressions:
+            for line in regressions:
+                print(f"[!] Регрессия: {line}")
+            sys.exit(1)
+        print("[OK] Все этапы в пределах порогов")
+
+
+if __name__ == '__main__':
+    main()
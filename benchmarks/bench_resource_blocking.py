@@ -0,0 +1,100 @@
+"""
+Бенчмарк блокировки ресурсов в Chrome
+
+Загружает одни и те же страницы вакансий с блокировкой ресурсов
+(RESOURCE_BLOCKING_CONFIG) и без неё и сравнивает время загрузки
+и объем переданных данных (по Performance API браузера).
+
+Запуск:
+    python benchmarks/bench_resource_blocking.py
+    python benchmarks/bench_resource_blocking.py --urls-file data/url_list_01.2026_RabotaBy.txt --limit 30
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import VacancyParser
+from src.config import Config
+from src.fetchers import VACANCY_MARKERS
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    os.system('chcp 65001 > nul')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+        sys.stderr.reconfigure(encoding='utf-8')
+
+
+DEFAULT_URLS = [
+    'https://rabota.by/vacancy/129935107',
+    'https://rabota.by/vacancy/129656778',
+]
+
+# Сколько байт передано по сети для документа и всех ресурсов страницы
+TRANSFER_SIZE_JS = """
+return performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+
+def measure(config, urls, blocking: bool):
+    """Загружает страницы в отдельном браузере и возвращает (время на страницу, байт на страницу)"""
+    config.RESOURCE_BLOCKING_CONFIG['enabled'] = blocking
+    parser = VacancyParser(config, use_cache=False)
+    timings, transferred = [], []
+
+    try:
+        parser._init_driver()
+        for url in urls:
+            started = time.perf_counter()
+            parser.fetcher.fetch(url, VACANCY_MARKERS)
+            timings.append(time.perf_counter() - started)
+            transferred.append(parser.driver.execute_script(TRANSFER_SIZE_JS))
+    finally:
+        parser._close_driver()
+
+    return timings, transferred
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Бенчмарк блокировки ресурсов в Chrome')
+    arg_parser.add_argument('--urls-file', default=None, help='Файл со ссылками на вакансии (по одной на строку)')
+    arg_parser.add_argument('--limit', type=int, default=20, help='Сколько страниц загрузить в каждом режиме')
+    args = arg_parser.parse_args()
+
+    urls = DEFAULT_URLS
+    if args.urls_file:
+        with open(args.urls_file, encoding='utf-8') as f:
+            urls = [line.strip() for line in f if line.strip()]
+    urls = urls[:args.limit]
+
+    config = Config()
+    config.CACHE_CONFIG['enabled'] = False
+    config.PARSER_CONFIG['adaptive_pacing'] = False
+
+    print(f"[+] Страниц в каждом режиме: {len(urls)}")
+    results = {}
+    for blocking in (False, True):
+        results[blocking] = measure(config, urls, blocking)
+
+    print()
+    print(f"{'Режим':<20}{'Медиана, с':>12}{'Среднее, с':>12}{'КБ/страница':>14}")
+    for blocking, (timings, transferred) in results.items():
+        label = 'с блокировкой' if blocking else 'без блокировки'
+        print(f"{label:<20}{statistics.median(timings):>12.2f}{statistics.mean(timings):>12.2f}"
+              f"{statistics.mean(transferred) / 1024:>14.1f}")
+
+    base, blocked = results[False], results[True]
+    speedup = statistics.median(base[0]) / max(statistics.median(blocked[0]), 1e-9)
+    saved = 1 - statistics.mean(blocked[1]) / max(statistics.mean(base[1]), 1)
+    print(f"\n[OK] Ускорение загрузки: x{speedup:.2f}, трафика меньше на {saved:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,9 +7,8 @@
 
 import sys
 import os
-import json
-import shutil
 import time
+import argparse
 from datetime import datetime
 
 # Добавляем src в путь
@@ -18,6 +17,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.parser import VacancyParser
 from src.processor import DataProcessor
 from src.config import Config
+from src.storage import open_vacancy_store
+from src.reader import iter_vacancies
+from src.link_registry import LinkRegistry, link_specializations
+from src.retry_queue import RetryQueue
+from src.async_fetch import fetch_concurrently
+from src.browser_pool import BrowserPool
+from src.pipeline import VacancyPipeline, use_pipeline
 
 # Установка кодировки UTF-8 для Windows
 if sys.platform == 'win32':
@@ -27,28 +33,104 @@ if sys.platform == 'win32':
         sys.stderr.reconfigure(encoding='utf-8')
 
 
-def load_existing_data(output_file: str) -> list:
-    """Загружает уже собранные вакансии из файла (или возвращает пустой список)"""
-    if os.path.exists(output_file):
+def open_store(config, date_str: str):
+    """
+    Открывает хранилище вакансий за месяц (журнал JSONL или SQLite).
+    Если хранилище пустое, а старый data_finally_*.json есть — переносит его в хранилище.
+    """
+    store = open_vacancy_store(config, date_str)
+    output_file = config.get_output_file(date_str)
+
+    if not len(store) and os.path.exists(output_file):
         try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            print(f"   [!] Не удалось прочитать существующий файл, начинаем заново")
-            return []
-    return []
+            store.import_records(iter_vacancies(output_file))
+        except ValueError:
+            print(f"   [!] Существующий файл поврежден, перенесены только прочитанные вакансии")
+        store.flush()
+        if len(store):
+            print(f"   [INFO] Перенесено в хранилище из data_finally: {len(store)} вакансий")
+
+    return store
 
 
-def save_data(data: list, output_file: str):
-    """Атомарно сохраняет данные: сначала во временный файл, потом переименовывает"""
-    tmp_file = output_file + '.tmp'
-    with open(tmp_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-    shutil.move(tmp_file, output_file)
+def compact(config, date_str: str):
+    """Собирает data_finally_*.json из хранилища и links_and_names_*.json из реестра ссылок за месяц"""
+    output_file = config.get_output_file(date_str)
+    store = open_store(config, date_str)
+    try:
+        written = store.compact(output_file)
+    finally:
+        store.close()
+    print(f"[OK] Компактизация: {written} вакансий -> {output_file}")
 
+    registry = LinkRegistry.for_month(config, date_str)
+    links_written = registry.export_json()
+    print(f"[OK] Компактизация: {links_written} ссылок -> {registry.json_file}")
 
-def main():
-    """Основная функция запуска парсинга"""
+
+def iter_parsed_vacancies(parser, links: list):
+    """Последовательно загружает вакансии: (ссылка, данные или None, класс ошибки или None)"""
+    for link_info in links:
+        vacancy_data = parser.parse_vacancy_page(link_info['url'])
+        yield link_info, vacancy_data, parser.last_error
+
+
+def parse_vacancies(config, parser, links: list):
+    """
+    Загружает вакансии последовательно или параллельно: PARSER_CONFIG['concurrency'] > 1
+    в режиме 'http' или пул браузеров при 'browser_workers' > 1 в режиме 'browser'.
+    Результаты отдаются в порядке готовности.
+    """
+    parser_config = config.PARSER_CONFIG
+    if parser_config['fetch_mode'] == 'browser' and parser_config['browser_workers'] > 1:
+        return BrowserPool(config, parser_config['browser_workers']).run(links, parser=parser)
+    if parser_config['fetch_mode'] == 'http' and parser_config['concurrency'] > 1:
+        return fetch_concurrently(
+            parser, links,
+            concurrency=parser_config['concurrency'],
+            rate=parser_config['requests_per_second'],
+            burst=parser_config['burst'],
+        )
+    return iter_parsed_vacancies(parser, links)
+
+
+def drain_retry_queue(parser, processor, store, retry_queue, max_wait: float = 0) -> int:
+    """
+    Повторяет ссылки из очереди повторов, для которых наступило время попытки.
+    Если ближайшая попытка наступит не позже чем через max_wait секунд — дожидается её.
+
+    Returns:
+        int: Количество вакансий, собранных при повторе
+    """
+    recovered = 0
+
+    while True:
+        for entry in retry_queue.due():
+            url = entry['url']
+            if url in store:
+                retry_queue.record_success(url, save=False)
+                continue
+
+            vacancy_data = parser.parse_vacancy_page(url)
+            if vacancy_data:
+                processed = processor.process_single_vacancy(vacancy_data, {url: link_specializations(entry)})
+                store.append(processed)
+                retry_queue.record_success(url, save=False)
+                recovered += 1
+            else:
+                retry_queue.record_failure(url, link_specializations(entry), parser.last_error, save=False)
+
+        # Очередь сохраняется один раз за проход, а не после каждой ссылки
+        retry_queue.flush()
+
+        wait = retry_queue.next_due_in()
+        if wait is None or wait > max_wait:
+            return recovered
+        time.sleep(wait)
+
+
+def run(config, cur_date: str):
+    """Сбор, обработка и сохранение вакансий за текущий месяц"""
     start_time = time.time()
 
     print("=" * 60)
@@ -56,19 +138,25 @@ def main():
     print("=" * 60)
     print()
 
+    store = None
     try:
-        config = Config()
-        cur_date = datetime.now().strftime("%m.%Y")
-        output_file = config.get_data_file(f'data_finally_{cur_date}_Rabota_by.json')
-
         parser = VacancyParser(config)
         processor = DataProcessor(config)
 
+        store = open_store(config, cur_date)
+        retry_queue = RetryQueue.for_month(config, cur_date)
+
         parser._init_driver()
         try:
+            # Повтор ссылок, не собранных в прошлый раз
+            if retry_queue.pending():
+                print(f"[+] Повтор ссылок из очереди: {len(retry_queue.pending())}")
+                recovered = drain_retry_queue(parser, processor, store, retry_queue)
+                print(f"[OK] Восстановлено при повторе: {recovered}\n")
+
             # Этап 1: Сбор ссылок на вакансии
             print("[+] Этап 1: Сбор ссылок на вакансии...")
-            links_data = parser.collect_vacancy_links()
+            links_data = parser.collect_vacancy_links(cur_date)
 
             if not links_data:
                 print("[ERROR] Не удалось собрать ссылки на вакансии")
@@ -77,12 +165,15 @@ def main():
             print(f"[OK] Собрано {len(links_data)} ссылок на вакансии\n")
             parser.save_links(links_data, cur_date)
 
-            # Загружаем уже собранные вакансии и определяем, что ещё нужно собрать
-            existing_data = load_existing_data(output_file)
-            collected_urls = {v['url'] for v in existing_data}
-            new_links = [l for l in links_data if l['url'] not in collected_urls]
+            # Определяем по хранилищу, что ещё нужно собрать; ссылки из очереди повторов
+            # загружаются только в свое время попытки, закрытые вакансии — не загружаются
+            new_links = [l for l in links_data if l['url'] not in store]
+            held = [l for l in new_links if retry_queue.is_held(l['url'])]
+            if held:
+                new_links = [l for l in new_links if not retry_queue.is_held(l['url'])]
+                print(f"[INFO] Ждут своей попытки в очереди повторов или закрыты: {len(held)} вакансий")
 
-            print(f"[INFO] Уже собрано: {len(existing_data)} вакансий")
+            print(f"[INFO] Уже собрано: {len(store)} вакансий")
             print(f"[INFO] Осталось собрать: {len(new_links)} вакансий\n")
 
             if not new_links:
@@ -91,34 +182,66 @@ def main():
                 # Этап 2+3: Парсинг и обработка с немедленным сохранением
                 print("[+] Этап 2-3: Парсинг, обработка и сохранение вакансий...")
 
-                links_dict = {item['url']: item['specialization'] for item in links_data}
+                # Все специализации вакансии, включая найденные в прошлых запусках этого месяца
+                links_dict = {
+                    item['url']: parser.link_registry.specializations_of(item['url']) or link_specializations(item)
+                    for item in links_data
+                }
                 total = len(new_links)
-                failed = 0
 
-                for idx, link_info in enumerate(new_links, 1):
-                    url = link_info['url']
+                if use_pipeline(config):
+                    pipeline = VacancyPipeline.from_config(config, parser, processor, store, retry_queue, links_dict)
+                    _, failed = pipeline.run(new_links)
+                else:
+                    failed = 0
+                    save_every = config.STORAGE_CONFIG['fsync_every']
+                    for idx, (link_info, vacancy_data, error) in enumerate(parse_vacancies(config, parser, new_links), 1):
+                        url = link_info['url']
 
-                    if idx % 10 == 0 or idx == total:
-                        print(f"   [+] {idx}/{total} | В файле: {len(existing_data)} вакансий")
+                        if idx % 10 == 0 or idx == total:
+                            print(f"   [+] {idx}/{total} | В хранилище: {len(store)} вакансий")
 
-                    vacancy_data = parser.parse_vacancy_page(url)
+                        if vacancy_data:
+                            processed = processor.process_single_vacancy(vacancy_data, links_dict)
+                            store.append(processed)
+                            retry_queue.record_success(url, save=False)
+                        else:
+                            failed += 1
+                            retry_queue.record_failure(url, links_dict[url], error, save=False)
 
-                    if vacancy_data:
-                        processed = processor.process_single_vacancy(vacancy_data, links_dict)
-                        existing_data.append(processed)
-                        save_data(existing_data, output_file)
-                    else:
-                        failed += 1
+                        # Очередь повторов сохраняется пачками, с той же частотой, что и хранилище
+                        if idx % save_every == 0:
+                            retry_queue.flush()
 
                 print(f"\n[OK] Готово. Успешно: {total - failed}, не удалось: {failed}\n")
 
+            # Повтор неудачных ссылок в конце запуска
+            if retry_queue.pending():
+                print(f"[+] Повтор неудачных ссылок: {len(retry_queue.pending())}")
+                recovered = drain_retry_queue(
+                    parser, processor, store, retry_queue,
+                    max_wait=config.PARSER_CONFIG['retry_drain_max_wait']
+                )
+                print(f"[OK] Восстановлено при повторе: {recovered}\n")
+
         finally:
             parser._close_driver()
+            store.flush()
+            retry_queue.flush()
+
+        if config.STORAGE_CONFIG['compact_on_finish']:
+            store.compact(config.get_output_file(cur_date))
+            if parser.link_registry is not None:
+                parser.link_registry.export_json()
 
         # Итоговая статистика
         print("=" * 60)
         print("[STAT] СТАТИСТИКА:")
-        print(f"   Всего вакансий в файле: {len(existing_data)}")
+        print(f"   Всего вакансий в хранилище: {len(store)}")
+        print(f"   Ожидают повтора: {len(retry_queue.pending())} | Не удалось собрать: {len(retry_queue.failed())} "
+              f"| Закрыты: {len(retry_queue.gone())}")
+        if retry_queue.entries:
+            print(f"   Очередь повторов: {retry_queue.queue_file}")
         print(f"   Файл: data_finally_{cur_date}_Rabota_by.json")
         elapsed_time = round(time.time() - start_time, 2)
         print(f"   Время выполнения: {elapsed_time} секунд")
@@ -132,6 +255,55 @@ def main():
         print(f"\n\n[ERROR] Критическая ошибка: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if store is not None:
+            store.close()
+
+
+def main():
+    """Точка входа: разбор аргументов командной строки"""
+    arg_parser = argparse.ArgumentParser(description='Парсер вакансий rabota.by')
+    subparsers = arg_parser.add_subparsers(dest='command')
+
+    compact_parser = subparsers.add_parser('compact', help='Собрать data_finally_*.json и links_and_names_*.json')
+    compact_parser.add_argument('--month', default=None, help='Месяц в формате MM.YYYY (по умолчанию текущий)')
+
+    reprocess_parser = subparsers.add_parser(
+        'reprocess', help='Пересобрать вакансии за месяц из кэша HTML без браузера'
+    )
+    reprocess_parser.add_argument('--month', default=None, help='Месяц в формате MM.YYYY (по умолчанию текущий)')
+    reprocess_parser.add_argument('--workers', type=int, default=None, help='Количество процессов')
+    reprocess_parser.add_argument('--chunk-size', type=int, default=None, help='Вакансий в одной задаче')
+
+    delta_parser = subparsers.add_parser(
+        'delta', help='Новые, измененные и закрытые вакансии между двумя месяцами'
+    )
+    delta_parser.add_argument('--from', dest='from_month', required=True, help='Предыдущий месяц (MM.YYYY)')
+    delta_parser.add_argument('--to', dest='to_month', default=None, help='Текущий месяц (по умолчанию текущий)')
+
+    export_parser = subparsers.add_parser('export', help='Колоночная выгрузка (NumPy .npy) для аналитики')
+    export_parser.add_argument('--month', default=None, help='Месяц в формате MM.YYYY (по умолчанию текущий)')
+
+    args = arg_parser.parse_args()
+
+    config = Config()
+    cur_date = datetime.now().strftime("%m.%Y")
+
+    if args.command == 'compact':
+        compact(config, args.month or cur_date)
+    elif args.command == 'reprocess':
+        from src.reprocess import reprocess_month
+        reprocess_month(config, args.month or cur_date, workers=args.workers, chunk_size=args.chunk_size)
+    elif args.command == 'delta':
+        from src.delta import month_delta
+        summary = month_delta(config, args.from_month, args.to_month or cur_date)
+        print(f"[OK] Новых: {summary['new']}, измененных: {summary['updated']}, закрытых: {summary['closed']}")
+    elif args.command == 'export':
+        from src.columnar import export_month
+        rows = export_month(config, args.month or cur_date)
+        print(f"[OK] Колоночная выгрузка: {rows} строк")
+    else:
+        run(config, cur_date)
 
 
 if __name__ == '__main__':
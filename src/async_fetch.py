@@ -0,0 +1,185 @@
+"""
+Параллельная загрузка страниц вакансий на asyncio
+
+Вакансии загружаются одновременно (не более PARSER_CONFIG['concurrency']
+запросов), частота запросов к каждому хосту ограничивается token bucket.
+Готовые вакансии отдаются вызывающему коду в порядке завершения загрузки,
+поэтому сохранение в хранилище и возобновление после прерывания работают
+так же, как при последовательном сборе.
+"""
+
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+# (ссылка, данные вакансии или None, класс ошибки или None)
+FetchResult = Tuple[Dict, Optional[Dict], Optional[str]]
+
+_DONE = object()
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты: rate запросов в секунду, всплеск до capacity запросов.
+    Токены берут сопрограммы (acquire) или потоки (acquire_blocking).
+    clock, sleep и blocking_sleep можно подменить (например, в тестах — на виртуальное время).
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable] = asyncio.sleep,
+                 blocking_sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.blocking_sleep = blocking_sleep
+        self.tokens = self.capacity
+        self.updated_at = clock()
+        self._lock = asyncio.Lock()
+        self._thread_lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Забирает токен (в долг, если свободного нет) и возвращает, сколько ждать, пока он накопится"""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    async def acquire(self):
+        """Забирает токен; если свободного нет — берет в долг и ждет, пока он накопится"""
+        async with self._lock:
+            wait = self._take()
+            if wait:
+                await self.sleep(wait)
+
+    def acquire_blocking(self):
+        """То же, что acquire, для обычных потоков"""
+        with self._thread_lock:
+            wait = self._take()
+            if wait:
+                self.blocking_sleep(wait)
+
+
+class HostRateLimiter:
+    """Отдельный token bucket для каждого хоста"""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable] = asyncio.sleep,
+                 blocking_sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.blocking_sleep = blocking_sleep
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._buckets_lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.capacity, self.clock, self.sleep,
+                                                          self.blocking_sleep)
+            return bucket
+
+    async def acquire(self, url: str):
+        await self._bucket(url).acquire()
+
+    def acquire_blocking(self, url: str):
+        self._bucket(url).acquire_blocking()
+
+
+def _load_vacancy(parser, link_info: Dict, parse: bool = True) -> FetchResult:
+    """Загружает и разбирает одну вакансию (выполняется в пуле потоков)"""
+    url = link_info['url']
+    try:
+        if not parse:
+            return link_info, parser.fetch_vacancy_source(url), None
+        data, _ = parser.fetch_vacancy(url)
+        return link_info, data, None
+    except Exception as e:
+        print(f"      [!] Ошибка парсинга {url[:50]}...: {str(e)[:50]}")
+        return link_info, None, type(e).__name__
+
+
+def _put(results: queue.Queue, item, stop: threading.Event):
+    """Кладет результат в очередь, ожидая свободного места, пока загрузка не остановлена"""
+    while not stop.is_set():
+        try:
+            results.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+
+
+async def _run(parser, links: Iterable[Dict], results: queue.Queue, stop: threading.Event,
+               concurrency: int, limiter: HostRateLimiter, parse: bool):
+    """Запускает concurrency сопрограмм, которые по очереди разбирают ссылки"""
+    loop = asyncio.get_running_loop()
+    links_iter = iter(links)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def worker():
+            for link_info in links_iter:
+                if stop.is_set():
+                    return
+                await limiter.acquire(link_info['url'])
+                result = await loop.run_in_executor(executor, _load_vacancy, parser, link_info, parse)
+                await loop.run_in_executor(None, _put, results, result, stop)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def fetch_concurrently(parser, links: Iterable[Dict], concurrency: int,
+                       rate: float, burst: float, parse: bool = True) -> Iterator[FetchResult]:
+    """
+    Загружает вакансии параллельно и отдает результаты по мере готовности
+
+    Args:
+        parser: VacancyParser
+        links: Ссылки на вакансии ({'url': ..., 'specialization': ...})
+        concurrency: Максимум одновременных загрузок
+        rate: Запросов в секунду к одному хосту
+        burst: Допустимый всплеск запросов
+        parse: False — страницы не разбираются, вместо данных отдается
+               результат VacancyParser.fetch_vacancy_source (для конвейера)
+
+    Yields:
+        FetchResult: (ссылка, данные вакансии или None, класс ошибки или None)
+    """
+    results = queue.Queue(maxsize=concurrency * 2)
+    stop = threading.Event()
+    errors = []
+
+    def run_loop():
+        try:
+            asyncio.run(_run(parser, links, results, stop, concurrency, HostRateLimiter(rate, burst), parse))
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            _put(results, _DONE, stop)
+
+    thread = threading.Thread(target=run_loop, name='vacancy-fetch', daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        # При прерывании останавливаем загрузку новых страниц
+        stop.set()
+        thread.join(timeout=30)
+
+    if errors:
+        raise errors[0]
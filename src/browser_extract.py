@@ -0,0 +1,105 @@
+"""
+Извлечение полей вакансии прямо в браузере
+
+Один вызов execute_script выполняет в странице те же выборки, что и
+VacancyParser._extract_* (те же селекторы из config/selectors.json), и возвращает
+компактный словарь полей. Весь page_source через WebDriver не передается,
+и дерево BeautifulSoup не строится. Разбор BeautifulSoup остается запасным
+вариантом и периодически используется для сверки.
+"""
+
+from typing import Dict, List
+
+from src.extraction_plan import FIELD_VALUES, Selector, css_selector
+
+
+# Поля, которые заполняет _extract_* и значения по умолчанию, если элемент не найден
+FIELD_DEFAULTS = {field: default for field, (_, default, _) in FIELD_VALUES.items()}
+
+# Повторяет логику _extract_*: селекторы поля перебираются по порядку до первого найденного
+# элемента (для зарплаты — с непустым текстом), склейка текстовых узлов через разделитель —
+# это get_text(separator=...), текст внутри script/style/template BeautifulSoup не учитывает.
+# arguments[0] — CSS селекторы полей из config/selectors.json (css_selectors)
+EXTRACT_JS = """
+const selectors = arguments[0];
+const SKIPPED = new Set(['SCRIPT', 'STYLE', 'TEMPLATE', 'RT', 'RP']);
+const text = (el, separator = '') => {
+    if (!el) return null;
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT, {
+        acceptNode: (node) => SKIPPED.has(node.parentNode.nodeName)
+            ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT,
+    });
+    const parts = [];
+    while (walker.nextNode()) parts.push(walker.currentNode.nodeValue);
+    return parts.join(separator);
+};
+const squash = (value) => value.split(/\\s+/).filter(Boolean).join(' ');
+const skills = (items) => {
+    const divs = items.map((li) => li.querySelector('div'));
+    return divs.every(Boolean) ? divs.map((div) => text(div)).join('; ') : null;
+};
+
+const VALUES = {
+    title: (el) => text(el).trim(),
+    salary_raw: (el) => squash(text(el, ' ')),
+    experience: (el) => text(el),
+    work_schedule: (el) => text(el),
+    work_format: (el) => text(el, ', ').trim(),
+    company: (el) => text(el),
+    address: (el) => text(el),
+    description: (el) => text(el).trim(),
+};
+
+const values = {};
+const matched = {};
+for (const [field, cssList] of Object.entries(selectors)) {
+    values[field] = null;
+    matched[field] = null;
+    for (let index = 0; index < cssList.length; index++) {
+        let value = null;
+        if (field === 'skills') {
+            const items = Array.from(document.querySelectorAll(cssList[index]));
+            if (!items.length) continue;
+            value = skills(items);
+        } else {
+            const el = document.querySelector(cssList[index]);
+            if (!el) continue;
+            value = VALUES[field](el);
+            if (field === 'salary_raw' && !value) continue;
+        }
+        if (value !== null) {
+            values[field] = value;
+            matched[field] = index;
+        }
+        break;
+    }
+}
+return {values: values, matched: matched};
+"""
+
+
+def css_selectors(field_selectors: Dict[str, List[Selector]]) -> Dict[str, List[str]]:
+    """Селекторы полей в виде CSS для EXTRACT_JS"""
+    return {field: [css_selector(selector) for selector in selectors] for field, selectors in field_selectors.items()}
+
+
+def extract_fields(driver, selectors) -> Dict[str, str]:
+    """
+    Извлекает поля вакансии в открытой странице; не найденные поля заполняются значениями по умолчанию
+
+    Args:
+        driver: Драйвер Chrome с открытой страницей вакансии
+        selectors: Текущие селекторы (SelectorRegistry.current), срабатывания учитываются в их статистике
+    """
+    raw = driver.execute_script(EXTRACT_JS, selectors.compiled('css', css_selectors)) or {}
+    values, matched = raw.get('values') or {}, raw.get('matched') or {}
+    selectors.stats.record_page({field: (matched.get(field), []) for field in FIELD_DEFAULTS})
+    return {
+        field: default if values.get(field) is None else values[field]
+        for field, default in FIELD_DEFAULTS.items()
+    }
+
+
+def compare_fields(browser_fields: Dict, soup_fields: Dict) -> List[str]:
+    """Поля, в которых извлечение в браузере разошлось с разбором BeautifulSoup"""
+    return [field for field in FIELD_DEFAULTS if browser_fields.get(field) != soup_fields.get(field)]
@@ -0,0 +1,70 @@
+"""
+Настройки запуска Chrome и блокировка лишних ресурсов
+
+Страницам вакансий и выдачи для разбора нужен только HTML с data-qa
+разметкой. Картинки, шрифты, видео и сторонние скрипты (аналитика,
+реклама) блокируются через CDP Network.setBlockedURLs, чтобы не тратить
+на них трафик и время отрисовки.
+"""
+
+import os
+import re
+from typing import List
+
+import undetected_chromedriver as uc
+
+
+def build_chrome_options(config) -> 'uc.ChromeOptions':
+    """
+    Собирает опции Chrome из Config.CHROME_OPTIONS.
+    undetected-chromedriver изменяет переданные опции, поэтому для каждого
+    запуска браузера нужен новый объект.
+    """
+    options = uc.ChromeOptions()
+    for argument in config.CHROME_OPTIONS:
+        options.add_argument(argument)
+    return options
+
+
+def url_matches(url: str, pattern: str) -> bool:
+    """Совпадение адреса с шаблоном по правилам Network.setBlockedURLs: '*' — любые символы, остальное буквально"""
+    regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    return re.fullmatch(regex, url) is not None
+
+
+def protected_urls(config) -> List[str]:
+    """Адреса, которые нельзя блокировать: 'allowed_urls' и ссылки на поиск из LINKS_FILE"""
+    urls = list(config.RESOURCE_BLOCKING_CONFIG['allowed_urls'])
+    if os.path.exists(config.LINKS_FILE):
+        with open(config.LINKS_FILE, encoding='utf-8') as f:
+            urls.extend(line.strip() for line in f if line.strip() and not line.strip().startswith('#'))
+    return urls
+
+
+def blocked_url_patterns(config) -> List[str]:
+    """
+    Шаблоны блокируемых URL из RESOURCE_BLOCKING_CONFIG.
+    Шаблоны, под которые попадает хоть один адрес из protected_urls, отбрасываются —
+    так слишком широкое правило не сломает загрузку того, что нужно для разбора.
+    """
+    blocking = config.RESOURCE_BLOCKING_CONFIG
+    if not blocking['enabled']:
+        return []
+
+    allowed = protected_urls(config)
+    patterns = []
+    for pattern in blocking['blocked_urls']:
+        conflicts = [url for url in allowed if url_matches(url, pattern)]
+        if conflicts:
+            print(f"   [!] Шаблон блокировки {pattern} пропущен: под него попадает {conflicts[0]}")
+            continue
+        patterns.append(pattern)
+    return patterns
+
+
+def apply_resource_blocking(driver, patterns: List[str]):
+    """Включает блокировку ресурсов в открытом браузере"""
+    if not patterns:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
@@ -0,0 +1,229 @@
+"""
+Пул браузеров для страниц, которым действительно нужен Chrome
+
+Запускает N процессов, в каждом — свой Chrome со своим профилем.
+Ссылки раздаются через общую очередь задач, результаты возвращаются
+в главный процесс, который остается единственным писателем
+(хранилище, очередь повторов, кэш HTML). Страницы, свежая копия которых
+уже есть в кэше HTML, разбираются в главном процессе и в очередь задач
+не попадают. Сбой драйвера перезапускает браузер внутри процесса,
+падение процесса — перезапускает процесс. Процесс, который падает снова
+и снова, не успев вернуть ни одного результата, больше не перезапускается;
+когда живых процессов не остается, оставшиеся ссылки отдаются как неудачные.
+"""
+
+import os
+import time
+import queue
+import multiprocessing as mp
+from typing import Dict, Iterator, List, Tuple
+
+from src.async_fetch import FetchResult
+from src.urls import extract_vacancy_id
+
+
+# Ошибки, после которых браузер в процессе перезапускается
+DRIVER_ERRORS = ('WebDriverException', 'InvalidSessionIdException', 'NoSuchWindowException',
+                 'SessionNotCreatedException', 'MaxRetryError', 'ProtocolError')
+
+
+def _browser_worker(worker_id: int, config, profile_dir: str, tasks, results, stop):
+    """Рабочий процесс: берет ссылки из очереди задач и парсит их в своем браузере"""
+    from src.parser import VacancyParser
+
+    parser = VacancyParser(config, use_cache=False, profile_dir=profile_dir)
+    restarts = 0
+
+    try:
+        while not stop.is_set():
+            link_info = tasks.get()
+            if link_info is None:
+                break
+
+            url = link_info['url']
+            try:
+                if parser.driver is None:
+                    parser._init_driver()
+                data, content = parser.fetch_vacancy(url)
+                results.put(('result', worker_id, (link_info, data, None), content))
+            except Exception as e:
+                error = type(e).__name__
+                results.put(('result', worker_id, (link_info, None, error), None))
+
+                # Драйвер упал — перезапускаем браузер, чтобы следующие ссылки не терялись
+                if error in DRIVER_ERRORS:
+                    restarts += 1
+                    parser._close_driver()
+    finally:
+        parser._close_driver()
+        results.put(('exit', worker_id, restarts + parser.lifecycle.total_restarts))
+
+
+class BrowserPool:
+    """Пул процессов с отдельным Chrome в каждом"""
+
+    # Функция рабочего процесса (процессы запускаются через spawn — она должна импортироваться по имени)
+    worker_target = staticmethod(_browser_worker)
+
+    def __init__(self, config, workers: int):
+        self.config = config
+        self.workers = workers
+        self.max_restarts = config.PARSER_CONFIG.get('browser_worker_max_restarts', 3)
+        self.profiles_dir = config.get_data_file('chrome_profiles')
+        self.ctx = mp.get_context('spawn')
+        self.processes: Dict[int, mp.Process] = {}
+        self.driver_restarts = 0
+        self.process_restarts = 0
+        self.cache_hits = 0
+        # Падений процесса подряд, без единого результата между ними
+        self.crashes_in_row: Dict[int, int] = {}
+
+    def _start_worker(self, worker_id: int, tasks, results, stop):
+        profile_dir = os.path.join(self.profiles_dir, f'worker_{worker_id}')
+        os.makedirs(profile_dir, exist_ok=True)
+        process = self.ctx.Process(
+            target=self.worker_target,
+            args=(worker_id, self.config, profile_dir, tasks, results, stop),
+            name=f'browser-worker-{worker_id}',
+            daemon=True,
+        )
+        process.start()
+        self.processes[worker_id] = process
+
+    def run(self, links: List[Dict], parser=None) -> Iterator[FetchResult]:
+        """
+        Раздает ссылки процессам и отдает результаты по мере готовности
+
+        Args:
+            links: Ссылки на вакансии
+            parser: VacancyParser главного процесса: страницы из его кэша HTML разбираются
+                    сразу, без браузера, а загруженные процессами страницы сохраняются в этот кэш
+
+        Yields:
+            FetchResult: (ссылка, данные вакансии или None, класс ошибки или None)
+        """
+        html_cache = parser.html_cache if parser is not None else None
+        cached, links = self._split_cached(links, html_cache)
+
+        tasks = self.ctx.Queue()
+        results = self.ctx.Queue()
+        stop = self.ctx.Event()
+
+        for link_info in links:
+            tasks.put(link_info)
+        for _ in range(self.workers):
+            tasks.put(None)
+
+        # Браузеры запускаются, пока главный процесс разбирает страницы из кэша
+        if links:
+            for worker_id in range(self.workers):
+                self._start_worker(worker_id, tasks, results, stop)
+
+        pending = {link_info['url']: link_info for link_info in links}
+
+        try:
+            for link_info in cached:
+                yield self._parse_cached(parser, link_info)
+
+            while pending:
+                try:
+                    message = results.get(timeout=1)
+                except queue.Empty:
+                    # Очередь результатов пуста — проверяем, не упали ли процессы
+                    self._restart_dead_workers(tasks, results, stop)
+                    if not any(p.is_alive() for p in self.processes.values()):
+                        break
+                    continue
+
+                if message[0] == 'result':
+                    self.crashes_in_row[message[1]] = 0
+                    result, content = message[2], message[3]
+                    pending.pop(result[0]['url'], None)
+                    if content is not None and html_cache is not None:
+                        self._cache_page(html_cache, result[0]['url'], content)
+                    yield result
+                elif message[0] == 'exit':
+                    self.driver_restarts += message[2]
+
+            # Ссылки, которые обрабатывали упавшие процессы, отдаем как неудачные
+            for link_info in list(pending.values()):
+                yield link_info, None, 'WorkerCrashed'
+        finally:
+            self._shutdown(stop, tasks, results)
+
+    @staticmethod
+    def _split_cached(links: List[Dict], html_cache) -> Tuple[List[Dict], List[Dict]]:
+        """Делит ссылки на те, у которых есть свежая копия в кэше HTML, и остальные"""
+        if html_cache is None:
+            return [], list(links)
+
+        cached, to_fetch = [], []
+        for link_info in links:
+            vacancy_id = extract_vacancy_id(link_info['url'])
+            if vacancy_id is not None and html_cache.has_fresh(vacancy_id):
+                cached.append(link_info)
+            else:
+                to_fetch.append(link_info)
+        return cached, to_fetch
+
+    def _parse_cached(self, parser, link_info: Dict) -> FetchResult:
+        """Разбирает страницу из кэша HTML в главном процессе"""
+        self.cache_hits += 1
+        try:
+            data, _ = parser.fetch_vacancy(link_info['url'])
+            return link_info, data, None
+        except Exception as e:
+            print(f"      [!] Ошибка парсинга {link_info['url'][:50]}...: {str(e)[:50]}")
+            return link_info, None, type(e).__name__
+
+    def _restart_dead_workers(self, tasks, results, stop):
+        """Перезапускает процессы, завершившиеся с ошибкой, пока не исчерпан лимит падений подряд"""
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive() or process.exitcode in (0, None):
+                continue
+
+            crashes = self.crashes_in_row.get(worker_id, 0) + 1
+            self.crashes_in_row[worker_id] = crashes
+            if crashes > self.max_restarts:
+                print(f"   [!] Процесс браузера {worker_id} упал (код {process.exitcode}) {crashes} раз подряд, "
+                      f"больше не перезапускается")
+                del self.processes[worker_id]
+                continue
+
+            print(f"   [!] Процесс браузера {worker_id} упал (код {process.exitcode}), перезапуск")
+            self.process_restarts += 1
+            self._start_worker(worker_id, tasks, results, stop)
+
+    @staticmethod
+    def _cache_page(html_cache, url: str, content: str):
+        vacancy_id = extract_vacancy_id(url)
+        if vacancy_id is not None:
+            html_cache.put(vacancy_id, content)
+
+    def _shutdown(self, stop, tasks, results, timeout: float = 15):
+        """Останавливает процессы: сначала штатно, затем принудительно"""
+        stop.set()
+        for _ in self.processes:
+            tasks.put(None)
+
+        # Пока процессы завершаются, вычитываем очередь результатов, иначе они не смогут выйти
+        deadline = time.time() + timeout
+        while any(p.is_alive() for p in self.processes.values()) and time.time() < deadline:
+            try:
+                while True:
+                    message = results.get_nowait()
+                    if message[0] == 'exit':
+                        self.driver_restarts += message[2]
+            except queue.Empty:
+                time.sleep(0.2)
+
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        # Невзятые задачи остаются в очереди: не ждем их отправки при выходе из главного процесса
+        tasks.cancel_join_thread()
+        tasks.close()
+        results.close()
+        print(f"   [INFO] Пул браузеров: из кэша HTML {self.cache_hits}, перезапусков браузера "
+              f"{self.driver_restarts}, перезапусков процессов {self.process_restarts}")
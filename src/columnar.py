@@ -0,0 +1,144 @@
+"""
+Колоночная выгрузка обработанных вакансий для аналитики
+
+Каждое поле сохраняется отдельным массивом NumPy (.npy) с типизированными
+значениями: зарплаты — целые числа, город/категория/разряд/валюта — коды
+словаря, флаги — bool. Рядом пишется schema.json со словарями и описанием
+колонок. Файлы .npy открываются через np.load(..., mmap_mode='r'), поэтому
+фильтры по сотням тысяч строк не требуют разбора JSON и загрузки всего файла.
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.reader import iter_vacancies
+from src.urls import extract_vacancy_id
+
+
+SCHEMA_FILE = 'schema.json'
+SCHEMA_VERSION = 1
+
+# Значение, которым кодируется отсутствующее целое (например, зарплата не указана)
+INT_NULL = -1
+
+# Колонки выгрузки: имя -> (вид, тип NumPy)
+COLUMNS = {
+    'vacancy_id': ('int', 'int64'),
+    'salary_min': ('int', 'int32'),
+    'salary_max': ('int', 'int32'),
+    'salary_avg': ('int', 'int32'),
+    'description_length': ('int', 'int32'),
+    'skills_count': ('int', 'int16'),
+    'has_salary': ('bool', 'bool'),
+    'remote_work': ('bool', 'bool'),
+    'monitoring_date': ('date', 'datetime64[D]'),
+    'city': ('dict', 'int16'),
+    'specialization': ('dict', 'int16'),
+    'specialization_category': ('dict', 'int16'),
+    'specialist_level': ('dict', 'int16'),
+    'experience_harmonized': ('dict', 'int16'),
+    'employment_type': ('dict', 'int16'),
+    'currency': ('dict', 'int16'),
+    'salary_type': ('dict', 'int16'),
+    'company': ('dict', 'int32'),
+}
+
+# Поля, которые читаются из data_finally (vacancy_id вычисляется из url)
+SOURCE_FIELDS = tuple(name for name in COLUMNS if name != 'vacancy_id') + ('url',)
+
+
+def _parse_date(value: Optional[str]) -> str:
+    """Переводит дату 'ДД.ММ.ГГГГ' в ISO-формат для datetime64 ('NaT', если даты нет)"""
+    try:
+        return datetime.strptime(value, '%d.%m.%Y').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return 'NaT'
+
+
+def export_columns(data_file: str, output_dir: str) -> int:
+    """
+    Сохраняет вакансии из data_finally_*.json в колоночном виде
+
+    Args:
+        data_file: Путь к data_finally_*.json (или журналу JSONL)
+        output_dir: Папка выгрузки (перезаписывается целиком)
+
+    Returns:
+        int: Количество строк
+    """
+    values: Dict[str, List] = {name: [] for name in COLUMNS}
+    dictionaries: Dict[str, Dict[str, int]] = {
+        name: {} for name, (kind, _) in COLUMNS.items() if kind == 'dict'
+    }
+
+    for vacancy in iter_vacancies(data_file, fields=SOURCE_FIELDS):
+        for name, (kind, _) in COLUMNS.items():
+            if name == 'vacancy_id':
+                vacancy_id = extract_vacancy_id(vacancy.get('url', ''))
+                values[name].append(INT_NULL if vacancy_id is None else vacancy_id)
+            elif kind == 'int':
+                value = vacancy.get(name)
+                values[name].append(INT_NULL if value is None else value)
+            elif kind == 'bool':
+                values[name].append(bool(vacancy.get(name)))
+            elif kind == 'date':
+                values[name].append(_parse_date(vacancy.get(name)))
+            else:
+                codes = dictionaries[name]
+                value = vacancy.get(name) or 'Не указано'
+                values[name].append(codes.setdefault(value, len(codes)))
+
+    rows = len(values['vacancy_id'])
+    tmp_dir = output_dir + '.tmp'
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    schema = {'version': SCHEMA_VERSION, 'rows': rows, 'source': os.path.basename(data_file), 'columns': {}}
+    for name, (kind, dtype) in COLUMNS.items():
+        np.save(os.path.join(tmp_dir, f'{name}.npy'), np.array(values[name], dtype=dtype))
+
+        column = {'kind': kind, 'dtype': dtype}
+        if kind == 'int':
+            column['null_value'] = INT_NULL
+        elif kind == 'dict':
+            column['dictionary'] = list(dictionaries[name])
+        schema['columns'][name] = column
+
+    with open(os.path.join(tmp_dir, SCHEMA_FILE), 'w', encoding='utf-8') as f:
+        json.dump(schema, f, indent=4, ensure_ascii=False)
+
+    if os.path.exists(output_dir):
+        shutil.rmtree(output_dir)
+    os.replace(tmp_dir, output_dir)
+    return rows
+
+
+def load_schema(columns_dir: str) -> Dict:
+    """Читает schema.json колоночной выгрузки"""
+    with open(os.path.join(columns_dir, SCHEMA_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_column(columns_dir: str, name: str, mmap: bool = True) -> np.ndarray:
+    """Открывает колонку (по умолчанию — отображением в память, без чтения файла целиком)"""
+    return np.load(os.path.join(columns_dir, f'{name}.npy'), mmap_mode='r' if mmap else None)
+
+
+def decode_column(columns_dir: str, name: str) -> np.ndarray:
+    """Возвращает колонку-словарь в виде строк (коды заменяются значениями из schema.json)"""
+    dictionary = np.array(load_schema(columns_dir)['columns'][name]['dictionary'], dtype=object)
+    return dictionary[load_column(columns_dir, name)]
+
+
+def export_month(config, date_str: str) -> int:
+    """Колоночная выгрузка data_finally за месяц в data/columns_MM.YYYY_Rabota_by/"""
+    return export_columns(
+        config.get_output_file(date_str),
+        config.get_data_file(f'columns_{date_str}_Rabota_by')
+    )
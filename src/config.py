@@ -22,16 +22,71 @@ class Config:
         self.LINKS_FILE = os.path.join(self.CONFIG_DIR, 'search_links.txt')
         self.NAMES_FILE = os.path.join(self.CONFIG_DIR, 'specializations.txt')
 
+        # Селекторы полей вакансии (запасные варианты по порядку)
+        self.SELECTORS_FILE = os.path.join(self.CONFIG_DIR, 'selectors.json')
+
         # Настройки парсера
         self.PARSER_CONFIG = {
-            'delay_between_requests': 0.1,  # Задержка между запросами (секунды)
+            'delay_between_requests': 0.1,  # Задержка между запросами (секунды), при адаптивном темпе — начальная
             'delay_between_pages': 0.2,  # Задержка между страницами
-            'max_retries': 3,  # Максимальное количество попыток
+            'adaptive_pacing': True,  # Подбирать задержку между запросами автоматически (AIMD)
+            'pacing_min_delay': 0.0,  # Минимальная задержка при адаптивном темпе (секунды)
+            'pacing_max_delay': 30.0,  # Максимальная задержка при адаптивном темпе (секунды)
+            'page_ready_timeout': 15,  # Сколько ждать появления data-qa маркеров на странице (секунды)
+            'extraction_mode': 'html',  # 'html' — BeautifulSoup; 'browser' — поля извлекаются в странице (режим загрузки 'browser'); 'state' — из JSON состояния страницы
+            'extraction_cross_check_every': 50,  # В режимах 'browser' и 'state' сверять каждую N-ю страницу с BeautifulSoup (0 — не сверять)
+            'selectors_reload_every': 50,  # Проверять изменение config/selectors.json каждые N страниц (0 — не перечитывать)
+            'selectors_check_after': 200,  # После стольких страниц проверить, что поля находятся (признак смены разметки)
+            'selectors_alert_default_rate': 0.99,  # Предупреждать, если поле осталось без значения на такой доле страниц
+            'parser_backend': 'bs4',  # Разбор HTML: 'bs4' — полное дерево BeautifulSoup; 'bs4_strainer' — только нужные блоки (SoupStrainer); 'lxml' — lxml.html и XPath
+            'max_retries': 3,  # Максимальное количество попыток для вакансии (очередь повторов)
+            'retry_backoff_base': 30,  # Задержка перед первым повтором (секунды), далее удваивается
+            'retry_backoff_max': 3600,  # Максимальная задержка между повторами (секунды)
+            'retry_drain_max_wait': 120,  # Сколько ждать ближайшего повтора в конце запуска (секунды)
             'timeout': 30,  # Таймаут для загрузки страницы
             'headless': False,  # Headless режим браузера
+            'fetch_mode': 'browser',  # 'browser' — только Chrome; 'http' — HTTP с откатом на Chrome
+            'http_pool_size': 10,  # Размер пула keep-alive соединений в режиме 'http'
+            'concurrency': 1,  # Одновременных загрузок вакансий (больше 1 — только в режиме 'http')
+            'requests_per_second': 5.0,  # Лимит запросов в секунду к одному хосту при параллельной загрузке вакансий и сборе ссылок
+            'burst': 5,  # Допустимый всплеск запросов сверх лимита
+            'serp_incremental': False,  # Инкрементальный сбор ссылок: только новые вакансии по дате публикации
+            'serp_stop_after_known': 20,  # Остановить обход специализации после стольких известных вакансий подряд
+            'serp_full_sweep_days': 7,  # Раз в сколько дней проходить выдачу полностью (закрытые вакансии)
+            'serp_concurrency': 1,  # Специализаций, собираемых одновременно на этапе ссылок (больше 1 — только в режиме 'http')
+            'driver_max_pages': 500,  # Перезапускать браузер после стольких страниц (0 — не перезапускать)
+            'driver_max_rss_mb': 2048,  # Перезапускать браузер, если его процессы заняли больше (МБ, 0 — не следить)
+            'driver_rss_check_every': 20,  # Проверять память браузера каждые N страниц (0 — не проверять)
+            'driver_max_failures': 5,  # Перезапускать браузер после стольких ошибок подряд
+            'pipeline': False,  # Конвейер: загрузка, разбор, гармонизация и запись — отдельными этапами с очередями
+            'pipeline_parse_workers': None,  # Процессов разбора HTML в конвейере (None — все ядра, 0 — разбор в потоке)
+            'pipeline_queue_size': 100,  # Емкость очереди между этапами конвейера (страниц)
+            'pipeline_batch_size': 50,  # Записывать вакансии в хранилище пачками по N
+            'browser_workers': 1,  # Процессов с отдельным Chrome в режиме 'browser' (больше 1 — пул браузеров)
+            'browser_worker_max_restarts': 3,  # Перезапусков процесса пула, упавшего без единого результата, подряд
             'chrome_version': 144,  # Версия Chrome (None = автоопределение)
         }
 
+        # Настройки хранения результатов
+        self.STORAGE_CONFIG = {
+            'backend': 'journal',  # 'journal' (JSONL) или 'sqlite'
+            'fsync_every': 50,  # Сбрасывать на диск каждые N вакансий
+            'compact_on_finish': True,  # Собирать data_finally_*.json в конце запуска
+        }
+
+        # Кэш исходного HTML страниц вакансий (data/html_cache)
+        self.CACHE_CONFIG = {
+            'enabled': True,  # Сохранять страницы вакансий в кэш
+            'max_size_mb': 2048,  # Лимит размера кэша, при превышении старые страницы вытесняются
+            'max_age_hours': 24,  # Страницы моложе этого возраста берутся из кэша вместо браузера
+        }
+
+        # Офлайн-перепроцессинг (python main.py reprocess)
+        self.REPROCESS_CONFIG = {
+            'workers': None,  # Количество процессов (None = все ядра)
+            'chunk_size': 200,  # Вакансий в одной задаче для процесса
+        }
+
         # Настройки Chrome
         self.CHROME_OPTIONS = [
             '--disable-blink-features=AutomationControlled',
@@ -41,10 +96,41 @@ class Config:
             '--window-size=1920,1080',
         ]
 
-        # Если нужен headless режим
-        if self.PARSER_CONFIG['headless']:
-            self.CHROME_OPTIONS.append('--headless=new')
+        # Блокировка ресурсов, не нужных для разбора страниц (CDP Network.setBlockedURLs)
+        self.RESOURCE_BLOCKING_CONFIG = {
+            'enabled': True,
+            'blocked_urls': [
+                # Картинки, шрифты, видео: расширение в конце пути или перед строкой запроса
+                *(pattern
+                  for extension in ('png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico',
+                                    'woff', 'woff2', 'ttf', 'otf', 'eot', 'mp4', 'webm', 'mp3')
+                  for pattern in (f'*.{extension}', f'*.{extension}?*')),
+                # Аналитика и реклама: только сами хосты, а не любой адрес с их именем
+                '*://*.google-analytics.com/*', '*://*.googletagmanager.com/*', '*://*.doubleclick.net/*',
+                '*://mc.yandex.ru/*', '*://yandex.ru/ads/*', '*://an.yandex.ru/*',
+                '*://top-fwz1.mail.ru/*', '*://connect.facebook.net/*', '*://vk.com/rtrg*',
+            ],
+            # Адреса, которые нельзя блокировать (вместе со ссылками на поиск из LINKS_FILE):
+            # главная страница (cookies сессии), выдача и страницы вакансий
+            'allowed_urls': [
+                'https://rabota.by/',
+                'https://rabota.by/search/vacancy',
+                'https://rabota.by/vacancy/',
+            ],
+        }
 
     def get_data_file(self, filename: str) -> str:
         """Возвращает полный путь к файлу данных"""
         return os.path.join(self.DATA_DIR, filename)
+
+    def get_output_file(self, date_str: str) -> str:
+        """Возвращает путь к итоговому файлу вакансий за месяц (MM.YYYY)"""
+        return self.get_data_file(f'data_finally_{date_str}_Rabota_by.json')
+
+    def get_journal_file(self, date_str: str) -> str:
+        """Возвращает путь к журналу вакансий за месяц (MM.YYYY)"""
+        return self.get_data_file(f'data_journal_{date_str}_Rabota_by.jsonl')
+
+    def get_store_file(self, date_str: str) -> str:
+        """Возвращает путь к базе SQLite с вакансиями за месяц (MM.YYYY)"""
+        return self.get_data_file(f'data_store_{date_str}_Rabota_by.sqlite')
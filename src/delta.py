@@ -0,0 +1,116 @@
+"""
+Сравнение двух выгрузок вакансий (месяцев или запусков)
+
+Вакансии сопоставляются по ID, изменения определяются по отпечатку содержимого
+(хеш title/salary_raw/company/description). Обе выгрузки читаются потоково,
+в память попадают только пары (ID, отпечаток), которые сортируются
+и сливаются за один проход.
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+from src.reader import iter_vacancies
+from src.storage import write_json_array
+from src.urls import extract_vacancy_id
+
+
+# Поля, изменение которых считается изменением вакансии
+FINGERPRINT_FIELDS = ('title', 'salary_raw', 'company', 'description')
+
+
+def fingerprint(vacancy: Dict) -> str:
+    """Отпечаток содержимого вакансии по FINGERPRINT_FIELDS"""
+    content = '\x1f'.join(str(vacancy.get(field, '')) for field in FINGERPRINT_FIELDS)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+
+def build_index(data_file: str) -> List[Tuple[int, str, str]]:
+    """
+    Строит отсортированный по ID список (ID, отпечаток, URL) для выгрузки.
+    Вакансии без ID в URL пропускаются, при повторах ID учитывается первая запись.
+    """
+    index = {}
+    for vacancy in iter_vacancies(data_file, fields=FINGERPRINT_FIELDS + ('url',)):
+        vacancy_id = extract_vacancy_id(vacancy.get('url', ''))
+        if vacancy_id is not None and vacancy_id not in index:
+            index[vacancy_id] = (fingerprint(vacancy), vacancy['url'])
+
+    return [(vacancy_id, fp, url) for vacancy_id, (fp, url) in sorted(index.items())]
+
+
+def merge_indexes(old_index: List[Tuple[int, str, str]],
+                  new_index: List[Tuple[int, str, str]]) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    Слияние двух отсортированных индексов
+
+    Returns:
+        Dict: {'new': [...], 'updated': [...], 'closed': [...]} — списки пар (ID, URL)
+    """
+    delta = {'new': [], 'updated': [], 'closed': []}
+    i = j = 0
+
+    while i < len(old_index) and j < len(new_index):
+        old_id, old_fp, old_url = old_index[i]
+        new_id, new_fp, new_url = new_index[j]
+
+        if old_id == new_id:
+            if old_fp != new_fp:
+                delta['updated'].append((new_id, new_url))
+            i += 1
+            j += 1
+        elif old_id < new_id:
+            delta['closed'].append((old_id, old_url))
+            i += 1
+        else:
+            delta['new'].append((new_id, new_url))
+            j += 1
+
+    delta['closed'].extend((vacancy_id, url) for vacancy_id, _, url in old_index[i:])
+    delta['new'].extend((vacancy_id, url) for vacancy_id, _, url in new_index[j:])
+    return delta
+
+
+def compute_delta(old_file: str, new_file: str) -> Dict[str, List[Tuple[int, str]]]:
+    """Возвращает новые, измененные и исчезнувшие вакансии между двумя выгрузками"""
+    return merge_indexes(build_index(old_file), build_index(new_file))
+
+
+def write_delta(old_file: str, new_file: str, output_prefix: str) -> Dict[str, int]:
+    """
+    Сохраняет дельту между выгрузками:
+    - <prefix>_new.json и <prefix>_updated.json — полные записи из новой выгрузки;
+    - <prefix>_closed.json — ID и URL исчезнувших вакансий;
+    - <prefix>_summary.json — количество вакансий в каждой группе.
+
+    Returns:
+        Dict: Количество вакансий по группам
+    """
+    delta = compute_delta(old_file, new_file)
+    new_ids = {vacancy_id for vacancy_id, _ in delta['new']}
+    updated_ids = {vacancy_id for vacancy_id, _ in delta['updated']}
+
+    def select(ids):
+        for vacancy in iter_vacancies(new_file):
+            if extract_vacancy_id(vacancy.get('url', '')) in ids:
+                yield vacancy
+
+    write_json_array(select(new_ids), f'{output_prefix}_new.json')
+    write_json_array(select(updated_ids), f'{output_prefix}_updated.json')
+    write_json_array(
+        ({'vacancy_id': vacancy_id, 'url': url} for vacancy_id, url in delta['closed']),
+        f'{output_prefix}_closed.json'
+    )
+
+    summary = {group: len(items) for group, items in delta.items()}
+    with open(f'{output_prefix}_summary.json', 'w', encoding='utf-8') as f:
+        json.dump({'old_file': old_file, 'new_file': new_file, **summary}, f, indent=4, ensure_ascii=False)
+
+    return summary
+
+
+def month_delta(config, old_date: str, new_date: str, output_prefix: Optional[str] = None) -> Dict[str, int]:
+    """Сохраняет дельту между двумя месяцами (MM.YYYY) в папку data/"""
+    output_prefix = output_prefix or config.get_data_file(f'delta_{old_date}_to_{new_date}_Rabota_by')
+    return write_delta(config.get_output_file(old_date), config.get_output_file(new_date), output_prefix)
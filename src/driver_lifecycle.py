@@ -0,0 +1,129 @@
+"""
+Перезапуск Chrome во время долгого сбора
+
+Один браузер на весь многочасовой запуск постепенно съедает память.
+Драйвер перезапускается после PARSER_CONFIG['driver_max_pages'] страниц,
+когда память процессов браузера превышает 'driver_max_rss_mb' или после
+'driver_max_failures' ошибок подряд. Cookies переносятся в новый браузер,
+поэтому пройденная проверка на бота не теряется.
+"""
+
+from typing import Dict, List
+
+import psutil
+
+from src.fetchers import BASE_URL
+
+# Причины перезапуска
+REASON_PAGES = 'pages'
+REASON_MEMORY = 'memory'
+REASON_FAILURES = 'failures'
+
+
+def browser_rss_mb(driver) -> float:
+    """Память (RSS) процесса Chrome и всех его дочерних процессов, МБ"""
+    pid = getattr(driver, 'browser_pid', None) or driver.service.process.pid
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return 0.0
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+class DriverLifecycle:
+    """Следит за драйвером парсера и перезапускает его по числу страниц, памяти и ошибкам"""
+
+    def __init__(self, parser, max_pages: int, max_rss_mb: float, max_failures: int, rss_check_every: int):
+        self.parser = parser
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.max_failures = max_failures
+        self.rss_check_every = rss_check_every
+
+        self.pages = 0  # Страниц с последнего запуска браузера
+        self.failures = 0  # Ошибок подряд
+        self.restarts: Dict[str, int] = {REASON_PAGES: 0, REASON_MEMORY: 0, REASON_FAILURES: 0}
+
+    @classmethod
+    def from_config(cls, parser) -> 'DriverLifecycle':
+        parser_config = parser.config.PARSER_CONFIG
+        return cls(
+            parser,
+            max_pages=parser_config['driver_max_pages'],
+            max_rss_mb=parser_config['driver_max_rss_mb'],
+            max_failures=parser_config['driver_max_failures'],
+            rss_check_every=parser_config['driver_rss_check_every'],
+        )
+
+    @property
+    def total_restarts(self) -> int:
+        return sum(self.restarts.values())
+
+    def before_fetch(self):
+        """Перезапускает браузер перед загрузкой страницы, если пора"""
+        if self.parser.driver is None:
+            self.parser._init_driver()
+            self.pages = 0
+            return
+
+        reason = None
+        if self.max_pages and self.pages >= self.max_pages:
+            reason = REASON_PAGES
+        elif self.max_failures and self.failures >= self.max_failures:
+            reason = REASON_FAILURES
+        elif (self.max_rss_mb and self.rss_check_every and self.pages and self.pages % self.rss_check_every == 0
+              and browser_rss_mb(self.parser.driver) > self.max_rss_mb):
+            reason = REASON_MEMORY
+
+        if reason is not None:
+            self.restart(reason)
+
+    def record(self, ok: bool):
+        """Учитывает результат загрузки страницы"""
+        self.pages += 1
+        self.failures = 0 if ok else self.failures + 1
+
+    def restart(self, reason: str):
+        """Перезапускает браузер с переносом cookies"""
+        cookies = self._save_cookies()
+
+        driver, self.parser.driver = self.parser.driver, None
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"   [!] Предупреждение при закрытии драйвера: {str(e)[:50]}")
+
+        self.parser._init_driver()
+        self._restore_cookies(cookies)
+
+        self.restarts[reason] += 1
+        self.pages = 0
+        self.failures = 0
+        print(f"   [INFO] Браузер перезапущен ({reason}), всего перезапусков: {self.total_restarts}")
+
+    def _save_cookies(self) -> List[Dict]:
+        try:
+            return self.parser.driver.get_cookies()
+        except Exception:
+            # Браузер уже не отвечает — начинаем с чистой сессии
+            return []
+
+    def _restore_cookies(self, cookies: List[Dict]):
+        if not cookies:
+            return
+
+        # Cookies можно добавить только на открытой странице их домена
+        self.parser.driver.get(BASE_URL)
+        for cookie in cookies:
+            try:
+                self.parser.driver.add_cookie(cookie)
+            except Exception:
+                continue
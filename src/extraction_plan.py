@@ -0,0 +1,220 @@
+"""
+Извлечение полей вакансии по селекторам
+
+Селекторы полей (цепочки запасных вариантов по порядку) задаются в
+config/selectors.json (src/selector_registry.py). Каждый _extract_* ищет
+элементы своего поля отдельными soup.find / find_all (find_elements).
+ExtractionPlan собирает селекторы всех полей в индексы по имени тега,
+data-qa и классу и за один обход дерева находит первые подходящие элементы
+для всех селекторов сразу. Значения полей в обоих случаях вычисляются
+одинаково (resolve_fields).
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from bs4 import Tag
+
+
+# Селектор: (тег или None, атрибут или None, значение атрибута).
+# Для 'class' значение сравнивается с каждым классом элемента, как class_ в BeautifulSoup
+Selector = Tuple[Optional[str], Optional[str], Optional[str]]
+
+# Поля, для которых нужны все подходящие элементы, а не первый
+MULTI_FIELDS = ('skills',)
+
+
+def _text(elem: Tag) -> str:
+    return elem.text
+
+
+def _stripped_text(elem: Tag) -> str:
+    return elem.text.strip()
+
+
+def _salary_text(elem: Tag) -> str:
+    return ' '.join(elem.get_text(separator=' ').split())
+
+
+def _work_format_text(elem: Tag) -> str:
+    return elem.get_text(separator=', ').strip()
+
+
+def _skills_text(elems: List[Tag]) -> str:
+    skills = [elem.find('div').text for elem in elems]
+    return '; '.join(skills) if skills else 'Не указано'
+
+
+# Как из найденного элемента получить значение поля, значение по умолчанию
+# и переходить ли к следующему селектору, если текст пустой.
+# Условие `if elem:` в _extract_* всегда истинно для найденного тега (Tag.__bool__)
+FIELD_VALUES: Dict[str, Tuple[Callable, str, bool]] = {
+    'title': (_stripped_text, 'Не указано', False),
+    'salary_raw': (_salary_text, 'Уровень дохода не указан', True),
+    'experience': (_text, 'Не указано', False),
+    'work_schedule': (_text, 'Не указано', False),
+    'work_format': (_work_format_text, 'Не указано', False),
+    'company': (_text, 'Не указано', False),
+    'address': (_text, 'Не указано', False),
+    'description': (_stripped_text, 'Не указано', False),
+    'skills': (_skills_text, 'Не указано', False),
+}
+
+# Значения полей из элементов BeautifulSoup
+SOUP_VALUES = {field: value_of for field, (value_of, _, _) in FIELD_VALUES.items()}
+
+
+def css_selector(selector: Selector) -> str:
+    """Селектор в виде CSS (для браузера и логов)"""
+    tag, attr, value = selector
+    if attr is None:
+        return tag
+    if attr == 'class':
+        return f"{tag or ''}.{value}"
+    return f'{tag or ""}[{attr}="{value}"]'
+
+
+def find_elements(soup, selector: Selector, multi: bool = False) -> List[Tag]:
+    """Элементы по одному селектору: первый найденный или все (multi)"""
+    tag, attr, value = selector
+    if attr is None:
+        kwargs = {}
+    elif attr == 'class':
+        kwargs = {'class_': value}
+    else:
+        kwargs = {'attrs': {attr: value}}
+
+    if multi:
+        return soup.find_all(tag, **kwargs)
+    elem = soup.find(tag, **kwargs)
+    return [elem] if elem is not None else []
+
+
+def resolve_fields(found: Dict[str, Iterable[List]], value_of: Dict[str, Callable],
+                   trace: Optional[Dict] = None) -> Dict[str, str]:
+    """
+    Значения полей по найденным элементам
+
+    Селекторы поля перебираются по порядку до первого, который нашел элемент
+    (для зарплаты — элемент с непустым текстом); если ни один не подошел,
+    поле получает значение по умолчанию.
+
+    Args:
+        found: Для каждого поля — найденные элементы каждого его селектора по порядку
+               (может быть генератором: следующие селекторы тогда не вычисляются)
+        value_of: Для каждого поля — функция значения (для MULTI_FIELDS принимает список элементов)
+        trace: Если передан — для каждого поля записывается (номер сработавшего селектора
+               или None, время на каждый проверенный селектор в секундах)
+    """
+    fields = {}
+
+    for field, candidates in found.items():
+        _, default, skip_blank = FIELD_VALUES[field]
+        value, matched, timings = default, None, []
+        started = time.perf_counter()
+        try:
+            for index, elems in enumerate(candidates):
+                if elems:
+                    text = value_of[field](elems if field in MULTI_FIELDS else elems[0])
+                    if not (skip_blank and not text):
+                        value, matched = text, index
+                now = time.perf_counter()
+                timings.append(now - started)
+                started = now
+                if matched is not None:
+                    break
+        except Exception:
+            value, matched = default, None
+        fields[field] = value
+        if trace is not None:
+            trace[field] = (matched, timings)
+
+    return fields
+
+
+class ExtractionPlan:
+    """Селекторы всех полей, собранные в индексы для поиска за один проход"""
+
+    def __init__(self, field_selectors: Dict[str, List[Selector]]):
+        self.field_selectors = field_selectors
+        self.selectors: List[Selector] = []
+        self.by_tag: Dict[str, List[int]] = {}
+        self.by_attr: Dict[Tuple[str, str], List[int]] = {}
+        self.by_class: Dict[str, List[int]] = {}
+        self.attr_names = set()
+
+        for selectors in field_selectors.values():
+            for selector in selectors:
+                if selector in self.selectors:
+                    continue
+                index = len(self.selectors)
+                self.selectors.append(selector)
+
+                tag, attr, value = selector
+                if attr is None:
+                    self.by_tag.setdefault(tag, []).append(index)
+                elif attr == 'class':
+                    self.by_class.setdefault(value, []).append(index)
+                else:
+                    self.by_attr.setdefault((attr, value), []).append(index)
+                    self.attr_names.add(attr)
+
+        # Номера селекторов каждого поля в порядке запасных вариантов
+        self.field_indexes = {
+            field: [self.selectors.index(selector) for selector in selectors]
+            for field, selectors in field_selectors.items()
+        }
+        self.multi = {index for field in MULTI_FIELDS for index in self.field_indexes.get(field, ())}
+
+    def match(self, soup) -> List[List[Tag]]:
+        """
+        Один обход документа
+
+        Returns:
+            List: Для каждого селектора — найденные элементы (первый или все для MULTI_FIELDS)
+        """
+        found: List[List[Tag]] = [[] for _ in self.selectors]
+        selectors = self.selectors
+
+        def take(candidates, elem):
+            for index in candidates:
+                tag = selectors[index][0]
+                if tag is not None and tag != elem.name:
+                    continue
+                if found[index] and index not in self.multi:
+                    continue
+                found[index].append(elem)
+
+        for elem in soup.find_all(True):
+            candidates = self.by_tag.get(elem.name)
+            if candidates:
+                take(candidates, elem)
+
+            attrs = elem.attrs
+            if not attrs:
+                continue
+
+            for attr in self.attr_names:
+                value = attrs.get(attr)
+                if value is not None:
+                    candidates = self.by_attr.get((attr, value))
+                    if candidates:
+                        take(candidates, elem)
+
+            classes = attrs.get('class')
+            if classes:
+                for cls in classes:
+                    candidates = self.by_class.get(cls)
+                    if candidates:
+                        take(candidates, elem)
+
+        return found
+
+    def extract(self, soup, trace: Optional[Dict] = None) -> Dict[str, str]:
+        """Значения всех полей — те же, что вернули бы _extract_*"""
+        found = self.match(soup)
+        return resolve_fields(
+            {field: [found[index] for index in indexes] for field, indexes in self.field_indexes.items()},
+            SOUP_VALUES,
+            trace,
+        )
@@ -0,0 +1,312 @@
+"""
+Загрузка страниц rabota.by
+
+Два способа получить HTML страницы:
+- BrowserFetcher — через Chrome (undetected-chromedriver); страница считается
+  загруженной, когда на ней появились нужные data-qa маркеры;
+- HttpFetcher — обычным HTTP-запросом через пул keep-alive соединений
+  с cookies и User-Agent, полученными из браузерной сессии.
+
+FallbackFetcher сначала пробует HTTP и обращается к браузеру, только если
+ответ похож на проверку на бота или в нем нет нужных data-qa маркеров.
+Конечные страницы (выдача без результатов, закрытая или удаленная вакансия)
+считаются полученными: браузер для них не нужен.
+"""
+
+import time
+import threading
+from typing import NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.pacing import AdaptivePacer
+
+
+BASE_URL = 'https://rabota.by/'
+
+
+class PageMarkers(NamedTuple):
+    """data-qa маркеры, по которым видно, что страница загрузилась"""
+    ready: Tuple[str, ...]  # Есть все — страница загрузилась полностью
+    empty: Tuple[str, ...] = ()  # Есть любой — страница загрузилась, но результатов на ней нет
+    gone: Tuple[str, ...] = ()  # Есть любой — вакансия закрыта или удалена
+
+
+# Состояния загруженной страницы (page_state)
+PAGE_READY = 'ready'
+PAGE_EMPTY = 'empty'
+PAGE_GONE = 'gone'
+
+NO_MARKERS = PageMarkers(ready=())
+VACANCY_MARKERS = PageMarkers(
+    ready=('data-qa="vacancy-title"',),
+    gone=('data-qa="vacancy-removed"', 'data-qa="error-page-404"'),
+)
+SERP_MARKERS = PageMarkers(
+    ready=('data-qa="vacancy-serp__results"',),
+    empty=('data-qa="vacancies-search-no-results"',),
+)
+
+# HTTP-статусы удаленной вакансии
+GONE_STATUSES = (404, 410)
+
+# Признаки страницы проверки на бота
+CHALLENGE_SIGNS = ('captcha', 'ddos-guard', 'cf-challenge', 'challenge-platform')
+
+# Начало HTML открытой страницы (для поиска признаков проверки на бота)
+PAGE_HEAD_JS = 'return document.documentElement.outerHTML.slice(0, 5000)'
+
+
+class FetchError(Exception):
+    """Страница не получена или получена не та страница"""
+
+
+class ChallengeError(FetchError):
+    """Ответ похож на проверку на бота"""
+
+
+class PageGoneError(FetchError):
+    """Вакансия закрыта или удалена: страница загрузилась, но данных вакансии на ней нет"""
+
+
+def page_state(content: str, markers: PageMarkers) -> Optional[str]:
+    """
+    Определяет по HTML, загрузилась ли страница
+
+    Returns:
+        str: PAGE_READY, PAGE_EMPTY, PAGE_GONE или None, если маркеров нет
+    """
+    if all(marker in content for marker in markers.ready):
+        return PAGE_READY
+    if any(marker in content for marker in markers.empty):
+        return PAGE_EMPTY
+    if any(marker in content for marker in markers.gone):
+        return PAGE_GONE
+    return None
+
+
+def is_challenge(url: str, content: str) -> bool:
+    """Признаки проверки на бота в адресе или в начале HTML"""
+    return any(sign in url.lower() or sign in content[:5000].lower() for sign in CHALLENGE_SIGNS)
+
+
+def wait_for_markers(driver, markers: PageMarkers, timeout: float) -> Optional[str]:
+    """
+    Ждет, пока на странице появятся все маркеры ready или любой маркер
+    пустой или закрытой страницы (не дольше timeout)
+
+    Returns:
+        str: PAGE_READY, PAGE_EMPTY, PAGE_GONE или None, если истек таймаут
+    """
+    if not markers.ready:
+        return PAGE_READY
+
+    def found(d, marker: str) -> bool:
+        return bool(d.find_elements(By.CSS_SELECTOR, f'[{marker}]'))
+
+    def loaded(d):
+        if all(found(d, marker) for marker in markers.ready):
+            return PAGE_READY
+        if any(found(d, marker) for marker in markers.empty):
+            return PAGE_EMPTY
+        if any(found(d, marker) for marker in markers.gone):
+            return PAGE_GONE
+        return False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(loaded)
+    except TimeoutException:
+        return None
+
+
+class BrowserFetcher:
+    """Загрузка страниц через Chrome драйвер парсера"""
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.pages = 0
+
+    def open(self, url: str, markers: PageMarkers = NO_MARKERS, delay: Optional[float] = None):
+        """
+        Открывает страницу в браузере и ждет появления маркеров.
+        Выдача без результатов и закрытая вакансия тоже считаются загруженными.
+        Пауза между запросами задается адаптивной задержкой парсера (delay — её нижняя граница),
+        перед загрузкой браузер при необходимости перезапускается (DriverLifecycle).
+
+        Raises:
+            ChallengeError: Маркеры не появились, а страница похожа на проверку на бота
+            PageGoneError: Вакансия закрыта или удалена
+            FetchError: Маркеры не появились за page_ready_timeout (страница загрузилась не полностью)
+        """
+        lifecycle = self.parser.lifecycle
+        lifecycle.before_fetch()
+
+        pacer = self.parser.pacer
+        pacer.wait(delay)
+
+        started = time.monotonic()
+        try:
+            self.parser.driver.get(url)
+            state = wait_for_markers(
+                self.parser.driver, markers, self.parser.config.PARSER_CONFIG['page_ready_timeout']
+            )
+            head = '' if state else self.parser.driver.execute_script(PAGE_HEAD_JS)
+        except Exception:
+            lifecycle.record(ok=False)
+            raise
+
+        loaded = state is not None
+        pacer.record(time.monotonic() - started, ok=loaded, source='browser')
+        lifecycle.record(ok=loaded)
+
+        if not loaded:
+            if any(sign in (head or '').lower() for sign in CHALLENGE_SIGNS):
+                raise ChallengeError(f"Проверка на бота: {url[:80]}")
+            raise FetchError(f"Нет маркеров {markers.ready}: {url[:80]}")
+
+        self.pages += 1
+        if state == PAGE_GONE:
+            raise PageGoneError(f"Вакансия закрыта или удалена: {url[:80]}")
+
+    def fetch(self, url: str, markers: PageMarkers = NO_MARKERS, delay: Optional[float] = None) -> str:
+        """Открывает страницу в браузере (см. open) и возвращает page_source"""
+        self.open(url, markers, delay)
+        return self.parser.driver.page_source
+
+
+class HttpFetcher:
+    """Загрузка страниц HTTP-запросами через пул keep-alive соединений"""
+
+    def __init__(self, timeout: float, pool_size: int = 10, pacer: Optional[AdaptivePacer] = None):
+        self.timeout = timeout
+        # Пауза перед каждым запросом (общая с браузером задержка парсера; без нее — только delay)
+        self.pacer = pacer if pacer is not None else AdaptivePacer(0.0, min_delay=0.0, max_delay=0.0)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pages = 0
+        # fetch вызывается из нескольких потоков
+        self._pages_lock = threading.Lock()
+
+    def load_browser_session(self, driver):
+        """Переносит cookies и User-Agent из браузерной сессии"""
+        if driver.current_url.startswith('data:') or 'rabota.by' not in driver.current_url:
+            driver.get(BASE_URL)
+
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        self.session.headers['User-Agent'] = driver.execute_script('return navigator.userAgent')
+
+    def fetch(self, url: str, markers: PageMarkers = NO_MARKERS, delay: Optional[float] = None) -> str:
+        """
+        Загружает страницу HTTP-запросом.
+        Выдача без результатов возвращается как обычная страница.
+        Перед запросом выдерживается задержка pacer (delay — её нижняя граница).
+
+        Raises:
+            ChallengeError: Статус 403/429 или признаки проверки на бота
+            PageGoneError: Вакансия закрыта или удалена
+            FetchError: Ошибка сети, другой неуспешный статус или в ответе нет маркеров
+        """
+        self.pacer.wait(delay)
+
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.pacer.record(time.monotonic() - started, ok=False, source='http')
+            raise FetchError(f"{type(e).__name__}: {e}") from e
+        latency = time.monotonic() - started
+
+        error = self._response_error(url, response, markers)
+        # Закрытая вакансия — обычный ответ сайта; проверка на бота, ошибка сервера
+        # и страница без маркеров замедляют темп так же, как таймаут в браузере
+        self.pacer.record(latency, ok=error is None or isinstance(error, PageGoneError), source='http')
+        if error is not None:
+            raise error
+
+        with self._pages_lock:
+            self.pages += 1
+        return response.text
+
+    @staticmethod
+    def _response_error(url: str, response, markers: PageMarkers) -> Optional[FetchError]:
+        """Ошибка, которую нужно выбросить для этого ответа, или None, если страница получена"""
+        content = response.text
+        state = page_state(content, markers)
+
+        if response.status_code in (403, 429) or (state is None and is_challenge(response.url, content)):
+            return ChallengeError(f"HTTP {response.status_code} {response.url[:80]}")
+        if state == PAGE_GONE or (response.status_code in GONE_STATUSES and markers.gone):
+            return PageGoneError(f"Вакансия закрыта или удалена: {url[:80]}")
+        if response.status_code != 200:
+            return FetchError(f"HTTP {response.status_code}: {url[:80]}")
+        if state is None:
+            return FetchError(f"Нет маркеров {markers.ready}: {url[:80]}")
+        return None
+
+
+class FallbackFetcher:
+    """HTTP в первую очередь, браузер — только для страниц, которые HTTP получить не смог"""
+
+    def __init__(self, http: HttpFetcher, browser: BrowserFetcher):
+        self.http = http
+        self.browser = browser
+        self.fallbacks = 0
+        self._session_loaded = False
+        # Браузер один, а HTTP-запросы могут идти из нескольких потоков
+        self._browser_lock = threading.Lock()
+
+    def fetch(self, url: str, markers: PageMarkers = NO_MARKERS, delay: Optional[float] = None) -> str:
+        """
+        Загружает страницу по HTTP, при проверке на бота или ошибке — через браузер.
+        Закрытая вакансия (PageGoneError) через браузер не перезагружается.
+        """
+        if not self._session_loaded:
+            self.refresh_session()
+
+        try:
+            return self.http.fetch(url, markers, delay)
+        except PageGoneError:
+            raise
+        except FetchError:
+            with self._browser_lock:
+                self.fallbacks += 1
+                content = self.browser.fetch(url, markers, delay)
+                # Браузер прошел проверку — обновляем cookies для следующих HTTP-запросов
+                self._load_session()
+            return content
+
+    def refresh_session(self):
+        """Берет cookies и User-Agent из браузера"""
+        with self._browser_lock:
+            self._load_session()
+
+    def _load_session(self):
+        if self.browser.parser.driver is None:
+            self.browser.parser._init_driver()
+        self.http.load_browser_session(self.browser.parser.driver)
+        self._session_loaded = True
+
+
+def create_fetcher(parser):
+    """Создает загрузчик страниц по PARSER_CONFIG['fetch_mode']: 'browser' или 'http'"""
+    parser_config = parser.config.PARSER_CONFIG
+    browser = BrowserFetcher(parser)
+
+    if parser_config['fetch_mode'] == 'browser':
+        return browser
+    if parser_config['fetch_mode'] == 'http':
+        http = HttpFetcher(timeout=parser_config['timeout'], pool_size=parser_config['http_pool_size'],
+                           pacer=parser.pacer)
+        return FallbackFetcher(http, browser)
+
+    raise ValueError(f"Неизвестный режим загрузки: {parser_config['fetch_mode']}")
@@ -190,7 +190,8 @@ def extract_salary_range(salary_str: str) -> dict:
     # Извлечение чисел
     import re
     numbers = re.findall(r'\d+(?:\s?\d+)*', salary_str)
-    numbers = [int(n.replace(' ', '')) for n in numbers]
+    # \s находит и неразрывные пробелы между разрядами (\xa0, \u202f), убираем их все
+    numbers = [int(re.sub(r'\s', '', n)) for n in numbers]
 
     salary_lower = salary_str.lower()
 
@@ -0,0 +1,211 @@
+"""
+Кэш исходного HTML страниц вакансий
+
+Страницы хранятся на диске в сжатом виде (gzip), разложенные по подкаталогам
+по ID вакансии. Индекс (manifest.sqlite) хранит хеш содержимого, размер и время
+последнего обращения — по нему выполняется вытеснение при превышении лимита размера.
+Кэш позволяет повторно обработать страницы после исправления селекторов
+или правил гармонизации без повторного обхода сайта.
+"""
+
+import os
+import gzip
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+
+
+class HtmlCache:
+    """Сжатый кэш HTML страниц вакансий с индексом и вытеснением по размеру"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pages (
+            vacancy_id INTEGER PRIMARY KEY,
+            sha1 TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            stored_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_pages_accessed_at ON pages (accessed_at);
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, max_age_hours: Optional[float] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_hours = max_age_hours
+
+        os.makedirs(cache_dir, exist_ok=True)
+        # Кэш используется и из потоков параллельной загрузки — доступ к индексу под блокировкой
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'manifest.sqlite'), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+
+        self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config) -> Optional['HtmlCache']:
+        """Создает кэш по настройкам CACHE_CONFIG (или None, если кэш выключен)"""
+        cache_config = config.CACHE_CONFIG
+        if not cache_config['enabled']:
+            return None
+        return cls(
+            config.get_data_file('html_cache'),
+            max_bytes=int(cache_config['max_size_mb'] * 1024 * 1024),
+            max_age_hours=cache_config['max_age_hours'],
+        )
+
+    @staticmethod
+    def page_path(cache_dir: str, vacancy_id: int) -> str:
+        """Путь к файлу страницы: подкаталог по младшему байту ID"""
+        return os.path.join(cache_dir, f'{vacancy_id % 256:02x}', f'{vacancy_id}.html.gz')
+
+    @staticmethod
+    def read_page(cache_dir: str, vacancy_id: int) -> Optional[str]:
+        """
+        Читает страницу напрямую с диска, не обращаясь к индексу.
+        Используется рабочими процессами при офлайн-обработке.
+        """
+        try:
+            with gzip.open(HtmlCache.page_path(cache_dir, vacancy_id), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+
+    def _path(self, vacancy_id: int) -> str:
+        return self.page_path(self.cache_dir, vacancy_id)
+
+    def __contains__(self, vacancy_id: int) -> bool:
+        with self._lock:
+            row = self.conn.execute('SELECT 1 FROM pages WHERE vacancy_id = ?', (vacancy_id,)).fetchone()
+        return row is not None
+
+    def has_fresh(self, vacancy_id: int) -> bool:
+        """Есть ли страница не старше CACHE_CONFIG['max_age_hours'] (без чтения самой страницы)"""
+        with self._lock:
+            row = self.conn.execute('SELECT stored_at FROM pages WHERE vacancy_id = ?', (vacancy_id,)).fetchone()
+        if row is None:
+            return False
+        if self.max_age_hours is not None and time.time() - row[0] > self.max_age_hours * 3600:
+            return False
+        return os.path.exists(self._path(vacancy_id))
+
+    def get(self, vacancy_id: int, max_age_hours: Optional[float] = None) -> Optional[str]:
+        """
+        Возвращает HTML страницы из кэша
+
+        Args:
+            vacancy_id: ID вакансии
+            max_age_hours: Максимальный возраст записи (None — без ограничения)
+
+        Returns:
+            str: HTML или None, если страницы нет в кэше или она устарела
+        """
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT stored_at FROM pages WHERE vacancy_id = ?', (vacancy_id,)
+            ).fetchone()
+
+            if row is None or (max_age_hours is not None and time.time() - row[0] > max_age_hours * 3600):
+                self.misses += 1
+                return None
+
+            html = self.read_page(self.cache_dir, vacancy_id)
+            if html is None:
+                # Файл удален или поврежден — убираем запись из индекса
+                self._remove(vacancy_id)
+                self.misses += 1
+                return None
+
+            with self.conn:
+                self.conn.execute(
+                    'UPDATE pages SET accessed_at = ? WHERE vacancy_id = ?', (time.time(), vacancy_id)
+                )
+            self.hits += 1
+            return html
+
+    def get_fresh(self, vacancy_id: int) -> Optional[str]:
+        """Возвращает HTML, только если запись не старше CACHE_CONFIG['max_age_hours']"""
+        return self.get(vacancy_id, self.max_age_hours)
+
+    def put(self, vacancy_id: int, html: str):
+        """Сохраняет HTML страницы (одинаковое содержимое повторно не записывается)"""
+        with self._lock:
+            data = html.encode('utf-8')
+            sha1 = hashlib.sha1(data).hexdigest()
+            now = time.time()
+
+            row = self.conn.execute(
+                'SELECT sha1, size FROM pages WHERE vacancy_id = ?', (vacancy_id,)
+            ).fetchone()
+
+            if row is not None and row[0] == sha1 and os.path.exists(self._path(vacancy_id)):
+                with self.conn:
+                    self.conn.execute(
+                        'UPDATE pages SET stored_at = ?, accessed_at = ? WHERE vacancy_id = ?',
+                        (now, now, vacancy_id)
+                    )
+                return
+
+            path = self._path(vacancy_id)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp'
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            size = os.path.getsize(path)
+            with self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO pages (vacancy_id, sha1, size, stored_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (vacancy_id, sha1, size, now, now)
+                )
+            self.total_bytes += size - (row[1] if row is not None else 0)
+
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def _remove(self, vacancy_id: int):
+        """Удаляет страницу из кэша и индекса"""
+        row = self.conn.execute('SELECT size FROM pages WHERE vacancy_id = ?', (vacancy_id,)).fetchone()
+        if row is None:
+            return
+
+        try:
+            os.remove(self._path(vacancy_id))
+        except OSError:
+            pass
+
+        with self.conn:
+            self.conn.execute('DELETE FROM pages WHERE vacancy_id = ?', (vacancy_id,))
+        self.total_bytes -= row[0]
+
+    def evict(self):
+        """Вытесняет давно не используемые страницы, пока размер кэша не опустится до 90% лимита"""
+        target = self.max_bytes * 0.9
+        cursor = self.conn.execute('SELECT vacancy_id, size FROM pages ORDER BY accessed_at')
+        victims = []
+        freed = 0
+        for vacancy_id, size in cursor:
+            if self.total_bytes - freed <= target:
+                break
+            victims.append(vacancy_id)
+            freed += size
+
+        for vacancy_id in victims:
+            self._remove(vacancy_id)
+
+        if victims:
+            print(f"   [INFO] Кэш HTML: вытеснено {len(victims)} страниц")
+
+    def close(self):
+        """Закрывает индекс кэша"""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
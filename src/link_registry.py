@@ -0,0 +1,201 @@
+"""
+Реестр собранных ссылок на вакансии
+
+Новые ссылки дописываются в журнал JSONL и в url_list_*.txt одной пачкой,
+индекс уже известных вакансий строится в памяти один раз при открытии.
+Поэтому сохранение ссылок стоит пропорционально числу новых ссылок,
+а не всей истории за месяц. Полный links_and_names_*.json собирается
+отдельно при компактизации.
+
+Вакансия может встретиться в выдаче нескольких специализаций: новые
+специализации уже известной вакансии дописываются в журнал отдельной
+строкой и объединяются при чтении.
+"""
+
+import os
+import json
+from typing import Dict, Iterable, List, Set, Tuple
+
+from src.reader import iter_vacancies
+from src.storage import write_json_array
+from src.urls import vacancy_key
+
+
+def link_specializations(item: Dict) -> List[str]:
+    """Все специализации ссылки (у записей старого формата есть только 'specialization')"""
+    specializations = item.get('specializations')
+    if specializations:
+        return list(specializations)
+    specialization = item.get('specialization')
+    return [specialization] if specialization else []
+
+
+def _merge_specializations(known: List[str], specializations: Iterable[str]) -> bool:
+    """Дописывает в known недостающие специализации; True, если что-то добавилось"""
+    added = False
+    for specialization in specializations:
+        if specialization not in known:
+            known.append(specialization)
+            added = True
+    return added
+
+
+class LinkRegistry:
+    """Журнал ссылок на вакансии с индексом по ID вакансии"""
+
+    def __init__(self, log_file: str, txt_file: str, json_file: str):
+        self.log_file = log_file
+        self.txt_file = txt_file
+        self.json_file = json_file
+        self.known_keys: Set = set()
+        # Специализации известных вакансий с учетом дописанных позже: {ключ: [специализации]}
+        self.specializations: Dict = {}
+
+        self._replay()
+
+        # Первый запуск после перехода на журнал — переносим старый links_and_names_*.json
+        if not self.known_keys and os.path.exists(self.json_file):
+            try:
+                self._append_batch(*self._split_links(iter_vacancies(self.json_file)), write_txt=False)
+            except ValueError:
+                print(f"   [!] Не удалось прочитать {self.json_file}, начинаем журнал ссылок заново")
+
+    @classmethod
+    def for_month(cls, config, date_str: str) -> 'LinkRegistry':
+        """Открывает реестр ссылок за месяц (MM.YYYY)"""
+        return cls(
+            config.get_data_file(f'links_log_{date_str}_rabota_by.jsonl'),
+            config.get_data_file(f'url_list_{date_str}_RabotaBy.txt'),
+            config.get_data_file(f'links_and_names_{date_str}_rabota_by.json'),
+        )
+
+    def _replay(self):
+        """Строит индекс известных вакансий и их специализаций по журналу"""
+        for item in self.iter_links():
+            key = vacancy_key(item['url'])
+            self.known_keys.add(key)
+            _merge_specializations(self.specializations.setdefault(key, []), link_specializations(item))
+
+    def __contains__(self, url: str) -> bool:
+        return vacancy_key(url) in self.known_keys
+
+    def __len__(self) -> int:
+        return len(self.known_keys)
+
+    def specializations_of(self, url: str) -> List[str]:
+        """Все известные специализации вакансии (пустой список, если ее нет в реестре)"""
+        return list(self.specializations.get(vacancy_key(url), []))
+
+    def _split_links(self, links: Iterable[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Делит ссылки на новые и уже известные, у которых появились новые специализации
+        (с дедупликацией и объединением специализаций внутри пачки)
+
+        Returns:
+            Tuple: (новые ссылки, строки дополнения для известных вакансий)
+        """
+        new_links = []
+        batch = {}
+        updates = {}
+        for item in links:
+            key = vacancy_key(item['url'])
+            specializations = link_specializations(item)
+
+            if key in batch:
+                merged = batch[key]['specializations']
+                if _merge_specializations(merged, specializations):
+                    batch[key]['specialization'] = merged[0]
+                continue
+
+            if key in self.known_keys:
+                known = list(self.specializations.get(key, []))
+                if key in updates:
+                    known = updates[key]['specializations']
+                if _merge_specializations(known, specializations):
+                    updates[key] = {'specialization': known[0], 'specializations': known, 'url': item['url']}
+                continue
+
+            item = dict(item, specializations=specializations)
+            if specializations:
+                item['specialization'] = specializations[0]
+            batch[key] = item
+            new_links.append(item)
+        return new_links, list(updates.values())
+
+    @staticmethod
+    def _append_lines(file_path: str, lines: List[str]):
+        """Дописывает строки в файл одной операцией записи с fsync"""
+        needs_newline = False
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            with open(file_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b'\n'
+
+        with open(file_path, 'a', encoding='utf-8') as f:
+            f.write(('\n' if needs_newline else '') + ''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _append_batch(self, new_links: List[Dict], updates: List[Dict] = (), write_txt: bool = True):
+        """
+        Записывает пачку новых ссылок в журнал и url_list_*.txt, а дополнения
+        специализаций известных вакансий — только в журнал.
+        Оборванная при сбое строка журнала при следующем открытии пропускается,
+        а сама ссылка будет заново найдена при следующем сборе.
+        """
+        if not new_links and not updates:
+            return
+
+        self._append_lines(self.log_file, [json.dumps(item, ensure_ascii=False) + '\n'
+                                           for item in list(new_links) + list(updates)])
+        if write_txt and new_links:
+            self._append_lines(self.txt_file, [f"{item['url']}\n" for item in new_links])
+
+        for item in list(new_links) + list(updates):
+            key = vacancy_key(item['url'])
+            self.known_keys.add(key)
+            self.specializations[key] = list(item['specializations'])
+
+    def add_links(self, links: Iterable[Dict]) -> List[Dict]:
+        """
+        Добавляет в реестр новые ссылки, а известным вакансиям — новые специализации
+
+        Returns:
+            List[Dict]: Ссылки, которых раньше не было в реестре
+        """
+        new_links, updates = self._split_links(links)
+        self._append_batch(new_links, updates)
+        return new_links
+
+    def iter_links(self) -> Iterable[Dict]:
+        """Последовательно возвращает ссылки из журнала"""
+        if not os.path.exists(self.log_file):
+            return
+
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def iter_merged_links(self) -> Iterable[Dict]:
+        """Ссылки из журнала по одной на вакансию, со всеми ее специализациями"""
+        seen = set()
+        for item in self.iter_links():
+            key = vacancy_key(item['url'])
+            if key in seen:
+                continue
+            seen.add(key)
+
+            specializations = self.specializations.get(key) or link_specializations(item)
+            if specializations:
+                item = dict(item, specialization=specializations[0], specializations=list(specializations))
+            yield item
+
+    def export_json(self) -> int:
+        """Атомарно собирает links_and_names_*.json из журнала"""
+        return write_json_array(self.iter_merged_links(), self.json_file)
@@ -0,0 +1,77 @@
+"""
+Адаптивная задержка между запросами (AIMD)
+
+Задержка уменьшается на небольшой шаг после каждой быстрой успешной
+загрузки и умножается, если страница не загрузилась, похожа на проверку
+на бота или загружалась заметно дольше обычного. Так парсер сам
+находит самый быстрый темп, который сайт выдерживает.
+
+Задержка общая для браузера и HTTP-запросов, а обычное время загрузки
+считается отдельно для каждого источника: страница в Chrome всегда
+грузится дольше HTTP-ответа, и это не признак замедления сайта.
+"""
+
+import time
+import threading
+from typing import Dict, Optional
+
+
+class AdaptivePacer:
+    """Задержка между запросами: аддитивное уменьшение, мультипликативное увеличение"""
+
+    def __init__(self, initial_delay: float, min_delay: float, max_delay: float,
+                 backoff_factor: float = 2.0, backoff_floor: float = 1.0,
+                 recovery_step: float = 0.05, slow_factor: float = 3.0):
+        self.delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff_factor = backoff_factor
+        self.backoff_floor = backoff_floor  # Задержка после первого замедления, даже если была нулевой
+        self.recovery_step = recovery_step
+        self.slow_factor = slow_factor
+
+        self.avg_latency: Dict[str, float] = {}  # Источник загрузки -> среднее время загрузки
+        self.slowdowns = 0
+        self._last_request_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> 'AdaptivePacer':
+        """Создает задержку по PARSER_CONFIG; без 'adaptive_pacing' задержка постоянная"""
+        parser_config = config.PARSER_CONFIG
+        delay = parser_config['delay_between_requests']
+        if not parser_config['adaptive_pacing']:
+            return cls(delay, min_delay=delay, max_delay=delay)
+        return cls(delay, min_delay=parser_config['pacing_min_delay'], max_delay=parser_config['pacing_max_delay'])
+
+    def wait(self, min_delay: Optional[float] = None):
+        """Ждет, пока с прошлого запроса не пройдет текущая задержка (но не меньше min_delay)"""
+        with self._lock:
+            gap = max(self.delay, min_delay or 0.0)
+            pause = self._last_request_at + gap - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            self._last_request_at = time.monotonic()
+
+    def record(self, latency: float, ok: bool, source: str = 'browser'):
+        """
+        Учитывает результат загрузки
+
+        Args:
+            latency: Время загрузки страницы (секунды)
+            ok: Страница загрузилась полностью (без проверки на бота и таймаута)
+            source: Источник загрузки ('browser' или 'http') — среднее время у каждого свое
+        """
+        with self._lock:
+            avg_latency = self.avg_latency.get(source)
+            slow = avg_latency is not None and latency > avg_latency * self.slow_factor
+
+            if not ok or slow:
+                self.slowdowns += 1
+                self.delay = min(self.max_delay, max(self.delay * self.backoff_factor, self.backoff_floor))
+            else:
+                self.delay = max(self.min_delay, self.delay - self.recovery_step)
+
+            # Среднее время загрузки считаем только по нормальным страницам
+            if ok:
+                self.avg_latency[source] = latency if avg_latency is None else 0.8 * avg_latency + 0.2 * latency
@@ -2,21 +2,71 @@
 Модуль для парсинга вакансий с сайта rabota.by
 """
 
-import os
 import time
+import threading
 import undetected_chromedriver as uc
 from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import List, Dict, Optional
-import json
+from typing import List, Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+from src.urls import canonical_vacancy_url, extract_vacancy_id, vacancy_key
+from src.html_cache import HtmlCache
+from src.link_registry import LinkRegistry
+from src.serp_state import SerpState
+from src.fetchers import PAGE_EMPTY, SERP_MARKERS, VACANCY_MARKERS, BrowserFetcher, create_fetcher, page_state
+from src.browser_extract import compare_fields, extract_fields
+from src.extraction_plan import MULTI_FIELDS, SOUP_VALUES, find_elements, resolve_fields
+from src.selector_registry import SelectorRegistry
+from src.parser_backends import create_backend
+from src.state_extract import compare_with_dom, element_fragment, fields_from_state, find_initial_state
+from src.pacing import AdaptivePacer
+from src.async_fetch import HostRateLimiter
+from src.driver_lifecycle import DriverLifecycle
+from src.browser_options import apply_resource_blocking, blocked_url_patterns, build_chrome_options
+
+
+# Поля, которые в режиме 'state' извлекаются из фрагмента разметки вокруг элемента
+STATE_FRAGMENT_FIELDS = ('work_schedule', 'work_format')
 
 
 class VacancyParser:
     """Класс для парсинга вакансий с rabota.by"""
 
-    def __init__(self, config):
+    def __init__(self, config, use_cache: bool = True, profile_dir: Optional[str] = None):
         self.config = config
         self.driver = None
+        self.profile_dir = profile_dir  # Отдельный профиль Chrome (для пула браузеров)
+        self.html_cache = HtmlCache.from_config(config) if use_cache else None
+        self.link_registry = None
+        self._link_registry_date = None
+        # Страницы разбираются и из потоков параллельной загрузки: last_error у каждого потока свой,
+        # счетчики extraction_stats меняются под блокировкой
+        self._thread_state = threading.local()
+        self._stats_lock = threading.Lock()
+        self.pacer = AdaptivePacer.from_config(config)
+        # Лимит запросов к хосту для страниц выдачи: общий для всех потоков сбора ссылок
+        self.serp_limiter = HostRateLimiter(config.PARSER_CONFIG['requests_per_second'], config.PARSER_CONFIG['burst'])
+        self.lifecycle = DriverLifecycle.from_config(self)
+        self.extraction_stats = {'browser': 0, 'state': 0, 'cross_checked': 0, 'mismatches': 0}
+        self.fetcher = create_fetcher(self)
+        self.selectors = SelectorRegistry.from_config(config)
+        self.backend = create_backend(self)
+
+    @property
+    def last_error(self) -> Optional[str]:
+        """Класс последней ошибки parse_vacancy_page в текущем потоке"""
+        return getattr(self._thread_state, 'last_error', None)
+
+    @last_error.setter
+    def last_error(self, value: Optional[str]):
+        self._thread_state.last_error = value
+
+    def _count(self, key: str) -> int:
+        """Увеличивает счетчик extraction_stats и возвращает новое значение"""
+        with self._stats_lock:
+            self.extraction_stats[key] += 1
+            return self.extraction_stats[key]
 
     def _init_driver(self):
         """Инициализация Chrome драйвера"""
@@ -27,18 +77,28 @@ class VacancyParser:
             # Получаем версию Chrome из конфига
             chrome_version = self.config.PARSER_CONFIG.get('chrome_version', None)
 
+            driver_kwargs = {'headless': self.config.PARSER_CONFIG['headless']}
+            if chrome_version:
+                driver_kwargs['version_main'] = chrome_version
+            if self.profile_dir:
+                driver_kwargs['user_data_dir'] = self.profile_dir
+
             for attempt in range(1, max_attempts + 1):
                 try:
-                    
-                    # Инициализируем драйвер БЕЗ опций (undetected-chromedriver сам все настроит)
-                    if chrome_version:
-                        self.driver = uc.Chrome(version_main=chrome_version)
-                    else:
-                        self.driver = uc.Chrome()
+                    # Опции создаются заново на каждую попытку: undetected-chromedriver их изменяет
+                    self.driver = uc.Chrome(options=build_chrome_options(self.config), **driver_kwargs)
+                    apply_resource_blocking(self.driver, blocked_url_patterns(self.config))
                     return
 
                 except Exception as e:
                     last_error = e
+                    # Chrome запустился, но не настроился — закрываем его, иначе процесс останется висеть
+                    if self.driver is not None:
+                        try:
+                            self.driver.quit()
+                        except Exception:
+                            pass
+                        self.driver = None
                     if attempt < max_attempts:
                         time.sleep(3)
 
@@ -57,16 +117,94 @@ class VacancyParser:
                 self.driver = None
                 time.sleep(0.5)  # Даем время на очистку процессов
 
-    def collect_vacancy_links(self) -> List[Dict[str, str]]:
+        if self.html_cache is not None and self.html_cache.hits + self.html_cache.misses:
+            print(f"   [INFO] Кэш HTML: попаданий {self.html_cache.hits}, промахов {self.html_cache.misses}")
+        if self.lifecycle.total_restarts:
+            restarts = self.lifecycle.restarts
+            print(f"   [INFO] Перезапусков браузера: по числу страниц {restarts['pages']}, "
+                  f"по памяти {restarts['memory']}, после ошибок {restarts['failures']}")
+        if self.extraction_stats['browser'] or self.extraction_stats['state']:
+            stats = self.extraction_stats
+            print(f"   [INFO] Извлечение без BeautifulSoup: в браузере {stats['browser']}, из состояния страницы "
+                  f"{stats['state']}, сверено с разметкой {stats['cross_checked']}, расхождений {stats['mismatches']}")
+        if self.pacer.slowdowns:
+            print(f"   [INFO] Темп: задержка {self.pacer.delay:.2f} с, замедлений {self.pacer.slowdowns}")
+        selector_stats = self.selectors.current.stats
+        if selector_stats.pages:
+            self.selectors.save_stats()
+            defaults = ', '.join(
+                f"{field} {selector_stats.default_rate(field):.0%}"
+                for field, count in selector_stats.defaults.items() if count
+            )
+            print(f"   [INFO] Селекторы: страниц {selector_stats.pages}, поля без значения: {defaults or 'нет'} "
+                  f"(подробно: {self.selectors.stats_file})")
+
+    def collect_vacancy_links(self, date_str: Optional[str] = None) -> List[Dict[str, str]]:
         """
-        Собирает ссылки на все вакансии по заданным специализациям
+        Собирает ссылки на все вакансии по заданным специализациям.
+        Ссылки приводятся к каноническому виду, дубликаты отсеиваются по ID вакансии:
+        вакансия, найденная в нескольких специализациях, попадает в список один раз.
+
+        В режиме 'http' при PARSER_CONFIG['serp_concurrency'] > 1 специализации
+        обрабатываются параллельно; результаты объединяются в порядке специализаций,
+        поэтому итоговый список не зависит от порядка завершения загрузок. Все потоки
+        делят один лимит запросов к хосту ('requests_per_second', 'burst').
+
+        При PARSER_CONFIG['serp_incremental'] выдача сортируется по дате публикации,
+        и обход специализации останавливается после 'serp_stop_after_known' подряд
+        вакансий, уже известных реестру ссылок за месяц date_str. Раз в
+        'serp_full_sweep_days' дней специализация проходится полностью.
+
+        Аргументы:
+            date_str: Месяц (MM.YYYY), реестр ссылок которого используется в инкрементальном режиме
 
         Возвращает:
-            List[Dict]: Список словарей {'Специализация': str, 'Ссылка': str}
+            List[Dict]: Список словарей {'specialization': str, 'specializations': List[str], 'url': str}
         """
         links_data = []
+        links_by_key = {}  # ID вакансии -> запись из links_data
+
+        searches = self._load_searches()
+        total_specs = len(searches)
+
+        parser_config = self.config.PARSER_CONFIG
+        workers = parser_config['serp_concurrency'] if parser_config['fetch_mode'] == 'http' else 1
+
+        # Инкрементальный режим: известные вакансии и состояние по специализациям
+        known_keys = None
+        serp_state = None
+        if parser_config['serp_incremental'] and date_str:
+            known_keys = self._get_link_registry(date_str).known_keys
+            serp_state = SerpState.from_config(self.config)
+
+        def collect(search):
+            search_link, spec_name = search
+            if serp_state is None or not known_keys or serp_state.needs_full_sweep(spec_name):
+                return True, self._collect_spec_links(search_link, spec_name)
+            return False, self._collect_spec_links(search_link, spec_name, known_keys)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            # map отдает результаты в порядке специализаций
+            spec_results = executor.map(collect, searches)
+
+            for idx, ((_, spec_name), (full_sweep, spec_urls)) in enumerate(zip(searches, spec_results), 1):
+                spec_count = 0
+                for vacancy_url in spec_urls:
+                    spec_count += self._add_link(links_data, links_by_key, vacancy_url, spec_name)
 
-        # Загружаем ссылки на поиск и названия специализаций
+                mode = ''
+                if serp_state is not None:
+                    above = serp_state.update(spec_name, spec_urls, full_sweep)
+                    mode = f" ({'полный обход' if full_sweep else 'инкрементально'}, выше отметки: {above})"
+                print(f"   [+] Специализация {idx}/{total_specs}: {spec_name} — собрано ссылок: {spec_count}{mode}")
+
+        if serp_state is not None:
+            serp_state.save()
+
+        return links_data
+
+    def _load_searches(self) -> List[Tuple[str, str]]:
+        """Загружает пары (ссылка на поиск, название специализации)"""
         with open(self.config.LINKS_FILE, encoding='utf-8') as f:
             search_links = [
                 line.strip() for line in f.readlines()
@@ -79,52 +217,108 @@ class VacancyParser:
                 if line.strip() and not line.strip().startswith('#')
             ]
 
-        total_specs = len(specializations)
+        return list(zip(search_links, specializations))
 
-        for idx, (search_link, spec_name) in enumerate(zip(search_links, specializations), 1):
-            print(f"   [+] Обработка специализации {idx}/{total_specs}: {spec_name}")
+    def _collect_spec_links(self, search_link: str, spec_name: str,
+                            known_keys: Optional[Set] = None) -> List[str]:
+        """
+        Собирает ссылки на вакансии одной специализации со всех страниц поиска.
+        Первая загрузка страницы поиска и есть страница 0 — повторно она не загружается.
 
-            # Открываем страницу поиска
-            self.driver.get(search_link)
-            time.sleep(self.config.PARSER_CONFIG['delay_between_pages'])
+        Если передан known_keys, выдача сортируется по дате публикации и обход
+        останавливается после PARSER_CONFIG['serp_stop_after_known'] известных вакансий подряд.
 
-            content = self.driver.page_source
-            soup = BeautifulSoup(content, 'lxml')
+        Returns:
+            List[str]: Ссылки на вакансии в порядке выдачи
+        """
+        vacancy_urls = []
+        stop_after = self.config.PARSER_CONFIG['serp_stop_after_known']
+        known_in_row = 0
 
-            # Определяем количество страниц
+        if known_keys is not None and 'order_by=' not in search_link:
+            search_link = f'{search_link}&order_by=publication_time'
+
+        # Открываем страницу поиска (она же первая страница выдачи)
+        content = self._fetch_serp(search_link, delay=self.config.PARSER_CONFIG['delay_between_pages'])
+        if page_state(content, SERP_MARKERS) == PAGE_EMPTY:
+            return vacancy_urls
+
+        doc = self.backend.serp_document(content)
+        pages_count = self.backend.pages_count(doc)
+
+        # Собираем ссылки со всех страниц
+        for page_num in range(pages_count):
+            if page_num > 0:
+                content = self._fetch_serp(f'{search_link}&page={page_num}')
+                doc = self.backend.serp_document(content)
+
+            # Извлекаем ссылки на вакансии
             try:
-                pager_links = soup.find_all('a', {'data-qa': 'pager-page'})
-                pages_count = int(pager_links[-1].text) if pager_links else 1
-            except:
-                pages_count = 1
+                page_urls = self.backend.serp_links(doc)
+            except Exception as e:
+                print(f"      [!] {spec_name}: ошибка на странице {page_num + 1}: {str(e)[:50]}")
+                continue
 
-            # Собираем ссылки со всех страниц
-            for page_num in range(pages_count):
-                page_url = f'{search_link}&page={page_num}'
-                self.driver.get(page_url)
-                time.sleep(self.config.PARSER_CONFIG['delay_between_requests'])
+            if known_keys is None:
+                vacancy_urls.extend(page_urls)
+                continue
 
-                content = self.driver.page_source
-                soup = BeautifulSoup(content, 'lxml')
+            for vacancy_url in page_urls:
+                vacancy_urls.append(vacancy_url)
+                known_in_row = known_in_row + 1 if vacancy_key(canonical_vacancy_url(vacancy_url)) in known_keys else 0
+                if known_in_row >= stop_after:
+                    return vacancy_urls
 
-                # Извлекаем ссылки на вакансии
-                try:
-                    results_div = soup.find('div', {'data-qa': 'vacancy-serp__results'})
-                    vacancy_links = results_div.find_all('a', {'data-qa': 'serp-item__title'})
-
-                    for link in vacancy_links:
-                        vacancy_url = link.get('href')
-                        if vacancy_url:
-                            links_data.append({
-                                'specialization': spec_name,
-                                'url': vacancy_url
-                            })
-                except Exception as e:
-                    print(f"      [!] Ошибка на странице {page_num + 1}: {str(e)[:50]}")
+        return vacancy_urls
 
-            print(f"      [OK] Собрано ссылок: {sum(1 for x in links_data if x['specialization'] == spec_name)}")
+    def _fetch_serp(self, url: str, delay: Optional[float] = None) -> str:
+        """Загружает страницу выдачи, соблюдая общий для потоков сбора ссылок лимит запросов к хосту"""
+        self.serp_limiter.acquire_blocking(url)
+        return self.fetcher.fetch(url, SERP_MARKERS, delay=delay)
 
-        return links_data
+    @staticmethod
+    def _extract_pages_count(soup) -> int:
+        """Определяет количество страниц выдачи по пейджеру"""
+        try:
+            pager_links = soup.find_all('a', {'data-qa': 'pager-page'})
+            return int(pager_links[-1].text) if pager_links else 1
+        except:
+            return 1
+
+    @staticmethod
+    def _extract_serp_links(soup) -> List[str]:
+        """Извлекает ссылки на вакансии со страницы выдачи"""
+        results_div = soup.find('div', {'data-qa': 'vacancy-serp__results'})
+        vacancy_links = results_div.find_all('a', {'data-qa': 'serp-item__title'})
+        return [link.get('href') for link in vacancy_links if link.get('href')]
+
+    @staticmethod
+    def _add_link(links_data: List[Dict], links_by_key: Dict, vacancy_url: str, spec_name: str) -> int:
+        """
+        Добавляет ссылку в список с дедупликацией по ID вакансии.
+        Если вакансия уже встречалась — дописывает специализацию к существующей записи.
+
+        Returns:
+            int: 1, если вакансия впервые встретилась в этой специализации, иначе 0
+        """
+        url = canonical_vacancy_url(vacancy_url)
+        key = vacancy_key(url)
+
+        item = links_by_key.get(key)
+        if item is None:
+            item = {
+                'specialization': spec_name,
+                'specializations': [spec_name],
+                'url': url
+            }
+            links_by_key[key] = item
+            links_data.append(item)
+            return 1
+
+        if spec_name not in item['specializations']:
+            item['specializations'].append(spec_name)
+            return 1
+        return 0
 
     def parse_vacancy_page(self, url: str) -> Optional[Dict]:
         """
@@ -137,136 +331,270 @@ class VacancyParser:
             Dict: Данные о вакансии или None при ошибке
         """
         try:
-            self.driver.get(url)
-            time.sleep(self.config.PARSER_CONFIG['delay_between_requests'])
-
-            content = self.driver.page_source
-            soup = BeautifulSoup(content, 'lxml')
-
-            cur_date = datetime.now().strftime("%d.%m.%Y")
-            cur_time = datetime.now().strftime("%H:%M")
-
-            # Извлечение данных
-            data = {
-                "title": self._extract_title(soup),
-                "salary_raw": self._extract_salary(soup),
-                "experience": self._extract_experience(soup),
-                "work_schedule": self._extract_employment(soup),
-                "work_format": self._extract_work_format(soup),
-                "company": self._extract_company(soup),
-                "address": self._extract_address(soup),
-                "description": self._extract_description(soup),
-                "skills": self._extract_skills(soup),
-                "url": url,
-                "monitoring_date": cur_date,
-                "monitoring_time": cur_time
-            }
-
+            data, _ = self.fetch_vacancy(url)
+            self.last_error = None
             return data
 
         except Exception as e:
+            self.last_error = type(e).__name__
             print(f"      [!] Ошибка парсинга {url[:50]}...: {str(e)[:50]}")
             return None
 
+    def fetch_vacancy(self, url: str) -> Tuple[Dict, Optional[str]]:
+        """
+        Загружает и разбирает страницу вакансии.
+        При PARSER_CONFIG['extraction_mode'] == 'browser' (только в режиме загрузки 'browser')
+        поля извлекаются прямо в странице, без передачи page_source и BeautifulSoup;
+        страница из кэша HTML по-прежнему разбирается BeautifulSoup.
+
+        Returns:
+            Tuple: (данные вакансии, HTML страницы или None, если HTML не загружался)
+        """
+        data, content = self.fetch_vacancy_source(url)
+        if data is None:
+            data = self.parse_vacancy_html(content, url)
+        return data, content
+
+    def fetch_vacancy_source(self, url: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Загружает страницу вакансии (из кэша HTML или из сети), не разбирая её.
+        Исключение — извлечение в браузере: там поля извлекаются сразу при загрузке.
+
+        Returns:
+            Tuple: (None, HTML страницы) или (данные вакансии, HTML или None) при извлечении в браузере
+        """
+        content = self._get_cached_html(url)
+        if content is None and self._extracts_in_browser():
+            return self._parse_in_browser(url)
+
+        if content is None:
+            content = self._download_vacancy_html(url)
+        return None, content
+
+    def _extracts_in_browser(self) -> bool:
+        return self.config.PARSER_CONFIG['extraction_mode'] == 'browser' and isinstance(self.fetcher, BrowserFetcher)
+
+    def _parse_in_browser(self, url: str) -> Tuple[Dict, Optional[str]]:
+        """
+        Открывает вакансию и извлекает поля одним execute_script.
+        Каждая 'extraction_cross_check_every'-я страница дополнительно разбирается
+        BeautifulSoup: расхождения выводятся в лог, в запись идет результат BeautifulSoup.
+        """
+        self.fetcher.open(url, VACANCY_MARKERS)
+        self.selectors.maybe_reload()
+        fields = extract_fields(self.driver, self.selectors.current)
+        pages = self._count('browser')
+
+        check_every = self.config.PARSER_CONFIG['extraction_cross_check_every']
+        if not check_every or pages % check_every:
+            return self._make_record(fields, url), None
+
+        content = self.driver.page_source
+        self._put_cached_html(url, content)
+        data = self.parse_vacancy_html(content, url)
+
+        self._count('cross_checked')
+        mismatched = compare_fields(fields, data)
+        if mismatched:
+            self._count('mismatches')
+            print(f"      [!] Извлечение в браузере расходится с BeautifulSoup ({', '.join(mismatched)}): {url[:60]}")
+        return data, content
+
+    def _get_cached_html(self, url: str) -> Optional[str]:
+        """Свежая копия страницы из кэша HTML или None"""
+        vacancy_id = extract_vacancy_id(url)
+        if self.html_cache is None or vacancy_id is None:
+            return None
+        return self.html_cache.get_fresh(vacancy_id)
+
+    def _put_cached_html(self, url: str, content: str):
+        vacancy_id = extract_vacancy_id(url)
+        if self.html_cache is not None and vacancy_id is not None:
+            self.html_cache.put(vacancy_id, content)
+
+    def _download_vacancy_html(self, url: str) -> str:
+        """Загружает страницу вакансии и сохраняет её в кэш"""
+        content = self.fetcher.fetch(url, VACANCY_MARKERS)
+        self._put_cached_html(url, content)
+        return content
+
+    def parse_vacancy_html(self, content: str, url: str,
+                           monitoring_date: Optional[str] = None,
+                           monitoring_time: Optional[str] = None) -> Dict:
+        """
+        Извлекает данные вакансии из HTML страницы (без обращения к браузеру).
+        Разметка разбирается бэкендом PARSER_CONFIG['parser_backend'].
+
+        Args:
+            content: HTML страницы вакансии
+            url: URL вакансии
+            monitoring_date: Дата сбора (по умолчанию — текущая)
+            monitoring_time: Время сбора (по умолчанию — текущее)
+
+        Returns:
+            Dict: Данные о вакансии
+        """
+        self.selectors.maybe_reload()
+        if self.config.PARSER_CONFIG['extraction_mode'] == 'state':
+            fields = self._extract_fields_from_state(content)
+            if fields is not None:
+                return self._make_record(fields, url, monitoring_date, monitoring_time)
+
+        fields = self.backend.vacancy_fields(content)
+        return self._make_record(fields, url, monitoring_date, monitoring_time)
+
+    def _field_extractors(self) -> Dict:
+        """Поля записи и методы, которые извлекают их из разметки"""
+        return {
+            "title": self._extract_title,
+            "salary_raw": self._extract_salary,
+            "experience": self._extract_experience,
+            "work_schedule": self._extract_employment,
+            "work_format": self._extract_work_format,
+            "company": self._extract_company,
+            "address": self._extract_address,
+            "description": self._extract_description,
+            "skills": self._extract_skills,
+        }
+
+    def _extract_fields(self, soup, trace: Optional[Dict] = None) -> Dict:
+        """
+        Извлекает все поля вакансии из разметки за один обход документа (ExtractionPlan).
+        Результат тот же, что у вызова всех _extract_* по очереди.
+        """
+        return self.selectors.current.plan.extract(soup, trace)
+
+    def _extract_field(self, field: str, soup) -> str:
+        """
+        Значение одного поля: селекторы поля из config/selectors.json перебираются по порядку,
+        каждый — отдельным поиском по дереву. Если ни один не сработал — значение по умолчанию.
+        """
+        multi = field in MULTI_FIELDS
+        selectors = self.selectors.current.field_selectors[field]
+        found = {field: (find_elements(soup, selector, multi) for selector in selectors)}
+        return resolve_fields(found, SOUP_VALUES)[field]
+
+    def _extract_fields_from_state(self, content: str) -> Optional[Dict]:
+        """
+        Извлекает поля из JSON состояния страницы (PARSER_CONFIG['extraction_mode'] == 'state').
+        Поля, которых в состоянии нет, извлекаются из разметки: из фрагмента вокруг элемента
+        (STATE_FRAGMENT_FIELDS), а если не вышло — из полного дерева. Каждая
+        'extraction_cross_check_every'-я страница сверяется с полным разбором разметки.
+
+        Returns:
+            Dict: Поля вакансии или None, если состояния на странице нет
+        """
+        state = find_initial_state(content)
+        state_fields = fields_from_state(state) if state is not None else {}
+        if not state_fields:
+            return None
+
+        soup = None
+        fields = {}
+        for field, extractor in self._field_extractors().items():
+            value = state_fields.get(field)
+            if value is None and field in STATE_FRAGMENT_FIELDS:
+                value = self._extract_from_fragment(content, field, extractor)
+            if value is None:
+                if soup is None:
+                    soup = BeautifulSoup(content, 'lxml')
+                value = extractor(soup)
+            fields[field] = value
+
+        pages = self._count('state')
+        check_every = self.config.PARSER_CONFIG['extraction_cross_check_every']
+        if check_every and pages % check_every == 0:
+            dom_fields = self._extract_fields(soup if soup is not None else BeautifulSoup(content, 'lxml'))
+            taken = {field: fields[field] for field, value in state_fields.items() if value is not None}
+            self._count('cross_checked')
+            mismatched = compare_with_dom(taken, dom_fields)
+            if mismatched:
+                self._count('mismatches')
+                print(f"      [!] Состояние страницы расходится с разметкой ({', '.join(mismatched)})")
+
+        return fields
+
+    def _extract_from_fragment(self, content: str, field: str, extractor) -> Optional[str]:
+        """
+        Извлекает поле из фрагмента разметки вокруг элемента первого селектора поля,
+        чей атрибут встречается в сыром HTML
+
+        Returns:
+            str: Значение поля или None, если фрагмент не помог и нужен разбор всей страницы
+        """
+        default = extractor(BeautifulSoup('', 'lxml'))
+
+        for tag, attr, value in self.selectors.current.field_selectors[field]:
+            if tag is None or attr is None:
+                return None
+            marker = value if attr == 'class' else f'{attr}="{value}"'
+            if marker not in content:
+                continue
+
+            fragment = element_fragment(content, marker, tag)
+            if fragment is None:
+                return None
+            value = extractor(BeautifulSoup(fragment, 'lxml'))
+            return None if value == default else value
+
+        # Элементов поля на странице нет — полный разбор вернул бы значение по умолчанию
+        return default
+
+    @staticmethod
+    def _make_record(fields: Dict, url: str,
+                     monitoring_date: Optional[str] = None,
+                     monitoring_time: Optional[str] = None) -> Dict:
+        """Дополняет извлеченные поля ссылкой и временем сбора"""
+        cur_date = monitoring_date or datetime.now().strftime("%d.%m.%Y")
+        cur_time = monitoring_time or datetime.now().strftime("%H:%M")
+
+        return {
+            **fields,
+            "url": url,
+            "monitoring_date": cur_date,
+            "monitoring_time": cur_time
+        }
+
     def _extract_title(self, soup) -> str:
         """Извлекает название вакансии"""
-        try:
-            return soup.find("h1").text.strip()
-        except:
-            return "Не указано"
+        return self._extract_field('title', soup)
 
     def _extract_salary(self, soup) -> str:
         """
         Извлекает зарплату.
         Поддерживает BYN (Br), USD ($), EUR (€), RUB (₽).
         Обрабатывает случаи: диапазон, только от, только до, не указано.
+        Пустой блок зарплаты пропускается — берется следующий селектор (тип выплаты).
         """
-        try:
-            # Ищем основной блок зарплаты (любой тег: div, p, span и т.д.)
-            salary_elem = soup.find(attrs={'data-qa': 'vacancy-salary'})
-            if salary_elem:
-                text = salary_elem.get_text(separator=' ')
-                text = ' '.join(text.split())  # нормализуем пробелы
-                if text:
-                    return text
-
-            # Запасной вариант — только спан с типом выплаты
-            salary_elem = soup.find(attrs={'data-qa': 'vacancy-salary-compensation-type-net'})
-            if salary_elem:
-                text = salary_elem.get_text(separator=' ')
-                text = ' '.join(text.split())
-                if text:
-                    return text
-
-            return "Уровень дохода не указан"
-        except:
-            return "Уровень дохода не указан"
+        return self._extract_field('salary_raw', soup)
 
     def _extract_experience(self, soup) -> str:
         """Извлекает требуемый опыт работы"""
-        try:
-            return soup.find("span", {"data-qa": 'vacancy-experience'}).text
-        except:
-            return "Не указано"
+        return self._extract_field('experience', soup)
 
     def _extract_employment(self, soup) -> str:
         """Извлекает тип занятости"""
-        try:
-            return soup.find("div", class_='dotted-wrapper--xVk7Cm8wgsAU4cbP').text
-        except:
-            return "Не указано"
+        return self._extract_field('work_schedule', soup)
 
     def _extract_company(self, soup) -> str:
         """Извлекает название компании"""
-        try:
-            return soup.find("span", class_='vacancy-company-name').text
-        except:
-            return "Не указано"
+        return self._extract_field('company', soup)
 
     def _extract_address(self, soup) -> str:
         """Извлекает адрес"""
-        try:
-            return soup.find("span", {"data-qa": "vacancy-view-raw-address"}).text
-        except:
-            return "Не указано"
+        return self._extract_field('address', soup)
 
     def _extract_description(self, soup) -> str:
         """Извлекает описание вакансии"""
-        try:
-            desc = soup.find("div", class_='tmpl_hh_wrapper')
-            if desc:
-                return desc.text.strip()
-
-            desc = soup.find("div", class_='g-user-content')
-            if desc:
-                return desc.text.strip()
-
-            return "Не указано"
-        except:
-            return "Не указано"
+        return self._extract_field('description', soup)
 
     def _extract_work_format(self, soup) -> str:
         """Извлекает формат работы (офис, гибрид, удалённая и т.д.)"""
-        try:
-            elem = soup.find("p", {"data-qa": "work-formats-text"})
-            if elem:
-                return elem.get_text(separator=', ').strip()
-            return "Не указано"
-        except:
-            return "Не указано"
+        return self._extract_field('work_format', soup)
 
     def _extract_skills(self, soup) -> str:
         """Извлекает навыки"""
-        try:
-            skills_elements = soup.find_all('li', {'data-qa': 'skills-element'})
-            skills = []
-            for skill_elem in skills_elements:
-                skill = skill_elem.find('div').text
-                skills.append(skill)
-
-            return '; '.join(skills) if skills else "Не указано"
-        except:
-            return "Не указано"
+        return self._extract_field('skills', soup)
 
     def parse_vacancies(self, links_data: List[Dict[str, str]]) -> List[Dict]:
         """
@@ -306,33 +634,16 @@ class VacancyParser:
 
         return vacancies
 
+    def _get_link_registry(self, date_str: str) -> LinkRegistry:
+        """Открывает реестр ссылок за месяц (один раз на месяц)"""
+        if self.link_registry is None or self._link_registry_date != date_str:
+            self.link_registry = LinkRegistry.for_month(self.config, date_str)
+            self._link_registry_date = date_str
+        return self.link_registry
+
     def save_links(self, links_data: List[Dict[str, str]], date_str: str):
-        """Сохраняет ссылки в файлы, добавляя только новые (дедупликация по URL)"""
-        json_file = self.config.get_data_file(f'links_and_names_{date_str}_rabota_by.json')
-        txt_file = self.config.get_data_file(f'url_list_{date_str}_RabotaBy.txt')
+        """Сохраняет в реестр ссылок только новые ссылки (дедупликация по ID вакансии)"""
+        new_links = self._get_link_registry(date_str).add_links(links_data)
 
-        # Загружаем уже существующие ссылки из JSON (если файл есть)
-        existing_links = []
-        if os.path.exists(json_file):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    existing_links = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                existing_links = []
-
-        # Определяем новые ссылки (которых ещё нет в файле)
-        existing_urls = {item['url'] for item in existing_links}
-        new_links = [item for item in links_data if item['url'] not in existing_urls]
-        combined = existing_links + new_links
-
-        # Сохранение в JSON
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(combined, f, indent=4, ensure_ascii=False)
-
-        # Сохранение списка URL
-        with open(txt_file, 'w', encoding='utf-8') as f:
-            for link in combined:
-                f.write(f"{link['url']}\n")
-
-        print(f"   [OK] Ссылки сохранены в: {json_file}")
-        print(f"   [INFO] Новых ссылок добавлено: {len(new_links)} | Всего в файле: {len(combined)}")
+        print(f"   [OK] Ссылки сохранены в: {self.link_registry.log_file}")
+        print(f"   [INFO] Новых ссылок добавлено: {len(new_links)} | Всего в реестре: {len(self.link_registry)}")
@@ -0,0 +1,280 @@
+"""
+Сменные бэкенды разбора HTML страниц выдачи и вакансий
+
+PARSER_CONFIG['parser_backend']:
+    'bs4'          — полное дерево BeautifulSoup (эталон, прежнее поведение);
+    'bs4_strainer' — BeautifulSoup строит только нужные блоки (SoupStrainer):
+                     контейнер выдачи и пейджер, заголовок, зарплату, описание и т.д.;
+    'lxml'         — lxml.html и заранее скомпилированные XPath, без объектов BeautifulSoup.
+
+Селекторы полей берутся из реестра parser.selectors (config/selectors.json),
+срабатывания селекторов учитываются в его статистике.
+Все бэкенды возвращают одинаковый результат (tests/test_parser_backends.py).
+"""
+
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.extraction_plan import MULTI_FIELDS, Selector, resolve_fields
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:  # beautifulsoup4 < 4.13
+    ElementFilter = None
+
+
+# Элементы страницы выдачи: (тег, атрибут, значение)
+SERP_RESULTS: Selector = ('div', 'data-qa', 'vacancy-serp__results')
+SERP_ITEM_TITLE: Selector = ('a', 'data-qa', 'serp-item__title')
+PAGER_PAGE: Selector = ('a', 'data-qa', 'pager-page')
+
+# Строки внутри этих тегов BeautifulSoup хранит отдельными типами и в .text/get_text не включает
+SKIPPED_TEXT_TAGS = frozenset(('script', 'style', 'template', 'rt', 'rp'))
+
+
+class SoupBackend:
+    """Эталон: полное дерево BeautifulSoup и методы VacancyParser"""
+
+    name = 'bs4'
+
+    def __init__(self, parser):
+        self.parser = parser
+
+    def _soup(self, content: str, parse_only=None) -> BeautifulSoup:
+        return BeautifulSoup(content, 'lxml', parse_only=parse_only)
+
+    def serp_document(self, content: str):
+        return self._soup(content)
+
+    def pages_count(self, doc) -> int:
+        return self.parser._extract_pages_count(doc)
+
+    def serp_links(self, doc) -> List[str]:
+        return self.parser._extract_serp_links(doc)
+
+    def vacancy_fields(self, content: str) -> Dict[str, str]:
+        return self._fields_from_soup(self._soup(content))
+
+    def _fields_from_soup(self, soup) -> Dict[str, str]:
+        selectors = self.parser.selectors.current
+        trace = {}
+        fields = selectors.plan.extract(soup, trace)
+        selectors.stats.record_page(trace)
+        return fields
+
+
+def _tag_matcher(tags: Set[str], attrs: Set[Tuple[str, str]], classes: Set[str]) -> Callable:
+    """Проверка открывающего тега по имени, значению атрибута или одному из классов"""
+    attr_names = {attr for attr, _ in attrs}
+
+    def matches(name: str, tag_attrs) -> bool:
+        if name in tags:
+            return True
+        if not tag_attrs:
+            return False
+        for attr in attr_names:
+            if (attr, tag_attrs.get(attr)) in attrs:
+                return True
+        tag_classes = tag_attrs.get('class')
+        if not tag_classes:
+            return False
+        if isinstance(tag_classes, str):
+            tag_classes = tag_classes.split()
+        return any(cls in classes for cls in tag_classes)
+
+    return matches
+
+
+if ElementFilter is not None:
+    class _TagFilter(ElementFilter):
+        """Фильтр разбора: создаются только подходящие теги верхнего уровня и их поддеревья"""
+
+        def __init__(self, matches: Callable):
+            super().__init__()
+            self.matches = matches
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return self.matches(name, attrs)
+
+        def allow_string_creation(self, string) -> bool:
+            return False
+
+
+def build_strainer(selectors: Iterable[Selector]):
+    """
+    Фильтр для BeautifulSoup(parse_only=...), оставляющий элементы, подходящие хотя бы под один селектор.
+    Элемент остается вместе со всем поддеревом, порядок элементов в документе сохраняется,
+    поэтому find/find_all по отфильтрованному дереву находят то же, что и по полному.
+    """
+    tags, attrs, classes = set(), set(), set()
+    for tag, attr, value in selectors:
+        if attr is None:
+            tags.add(tag)
+        elif attr == 'class':
+            classes.add(value)
+        else:
+            attrs.add((attr, value))
+
+    matches = _tag_matcher(tags, attrs, classes)
+    if ElementFilter is not None:
+        return _TagFilter(matches)
+    # До 4.13 SoupStrainer вызывает функцию-имя с именем и атрибутами тега
+    return SoupStrainer(matches)
+
+
+class StrainedSoupBackend(SoupBackend):
+    """BeautifulSoup, который строит только блоки, нужные для извлечения"""
+
+    name = 'bs4_strainer'
+
+    def __init__(self, parser):
+        super().__init__(parser)
+        self.serp_strainer = build_strainer([SERP_RESULTS, PAGER_PAGE])
+
+    def serp_document(self, content: str):
+        return self._soup(content, self.serp_strainer)
+
+    def vacancy_fields(self, content: str) -> Dict[str, str]:
+        strainer = self.parser.selectors.current.compiled('strainer', _field_strainer)
+        return self._fields_from_soup(self._soup(content, strainer))
+
+
+def _field_strainer(field_selectors: Dict[str, List[Selector]]):
+    return build_strainer(selector for selectors in field_selectors.values() for selector in selectors)
+
+
+def _xpath_of(selector: Selector) -> str:
+    tag, attr, value = selector
+    if attr is None:
+        return f'//{tag}'
+    if attr == 'class':
+        condition = f"contains(concat(' ', normalize-space(@class), ' '), ' {value} ')"
+    else:
+        condition = f'@{attr}="{value}"'
+    return f'//{tag or "*"}[{condition}]'
+
+
+def _compile(selector: Selector, first_only: bool = True) -> etree.XPath:
+    path = _xpath_of(selector)
+    return etree.XPath(f'({path})[1]' if first_only else path)
+
+
+def _field_xpaths(field_selectors: Dict[str, List[Selector]]) -> Dict[str, List[etree.XPath]]:
+    return {
+        field: [_compile(selector, first_only=field not in MULTI_FIELDS) for selector in selectors]
+        for field, selectors in field_selectors.items()
+    }
+
+
+def _collect_text(elem, parts: List[str]):
+    if elem.text:
+        parts.append(elem.text)
+    for child in elem:
+        # Комментарии и инструкции: их tag — не строка, в текст попадает только tail
+        if isinstance(child.tag, str) and child.tag not in SKIPPED_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def element_text(elem, separator: str = '') -> str:
+    """Текст элемента так же, как get_text(separator) в BeautifulSoup"""
+    parts = []
+    _collect_text(elem, parts)
+    return separator.join(parts)
+
+
+def _skills_text(elems) -> str:
+    skills = []
+    for elem in elems:
+        div = elem.find('.//div')
+        if div is None:
+            raise AttributeError('Нет div в элементе навыка')
+        skills.append(element_text(div))
+    return '; '.join(skills) if skills else 'Не указано'
+
+
+# Значения полей из элементов lxml — те же функции, что в FIELD_VALUES для BeautifulSoup
+LXML_VALUES = {
+    'title': lambda elem: element_text(elem).strip(),
+    'salary_raw': lambda elem: ' '.join(element_text(elem, ' ').split()),
+    'experience': element_text,
+    'work_schedule': element_text,
+    'work_format': lambda elem: element_text(elem, ', ').strip(),
+    'company': element_text,
+    'address': element_text,
+    'description': lambda elem: element_text(elem).strip(),
+    'skills': _skills_text,
+}
+
+
+class LxmlBackend:
+    """lxml.html и заранее скомпилированные XPath"""
+
+    name = 'lxml'
+
+    _utf8_parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    def __init__(self, parser):
+        self.parser = parser
+        self.results_xpath = _compile(SERP_RESULTS)
+        self.item_xpath = etree.XPath(f'.{_xpath_of(SERP_ITEM_TITLE)}')
+        self.pager_xpath = etree.XPath(_xpath_of(PAGER_PAGE))
+
+    def document(self, content: str):
+        try:
+            return lxml.html.document_fromstring(content)
+        except ValueError:
+            # Строка с XML-объявлением кодировки разбирается только как байты
+            return lxml.html.document_fromstring(content.encode('utf-8'), parser=self._utf8_parser)
+        except etree.ParserError:
+            # Пустой документ: все поля получат значения по умолчанию, как у BeautifulSoup
+            return lxml.html.document_fromstring('<html></html>')
+
+    def serp_document(self, content: str):
+        return self.document(content)
+
+    def pages_count(self, doc) -> int:
+        """Определяет количество страниц выдачи по пейджеру"""
+        try:
+            pager_links = self.pager_xpath(doc)
+            return int(element_text(pager_links[-1])) if pager_links else 1
+        except Exception:
+            return 1
+
+    def serp_links(self, doc) -> List[str]:
+        """Извлекает ссылки на вакансии со страницы выдачи"""
+        results = self.results_xpath(doc)
+        if not results:
+            raise ValueError('Нет контейнера результатов выдачи')
+        return [link.get('href') for link in self.item_xpath(results[0]) if link.get('href')]
+
+    def vacancy_fields(self, content: str) -> Dict[str, str]:
+        doc = self.document(content)
+        selectors = self.parser.selectors.current
+        field_xpaths = selectors.compiled('xpath', _field_xpaths)
+
+        # Генераторы: XPath запасного селектора вычисляется, только если предыдущие не сработали
+        found = {field: (xpath(doc) for xpath in xpaths) for field, xpaths in field_xpaths.items()}
+        trace = {}
+        fields = resolve_fields(found, LXML_VALUES, trace)
+        selectors.stats.record_page(trace)
+        return fields
+
+
+PARSER_BACKENDS = {
+    SoupBackend.name: SoupBackend,
+    StrainedSoupBackend.name: StrainedSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+def create_backend(parser):
+    """Создает бэкенд разбора по PARSER_CONFIG['parser_backend']"""
+    name = parser.config.PARSER_CONFIG['parser_backend']
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд разбора: {name}")
+    return PARSER_BACKENDS[name](parser)
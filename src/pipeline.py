@@ -0,0 +1,363 @@
+"""
+Конвейер сбора вакансий: загрузка → разбор → гармонизация → запись
+
+Без конвейера один поток по очереди загружает страницу, разбирает её,
+гармонизирует запись и сохраняет, и каждый этап ждет остальные. В
+конвейере этапы работают одновременно и связаны ограниченными очередями
+(PARSER_CONFIG['pipeline_queue_size']): если следующий этап не успевает,
+предыдущий ждет свободного места, а не накапливает страницы в памяти.
+
+    загрузка    — поток браузера или параллельные HTTP-загрузки (async_fetch);
+    разбор      — пул процессов ('pipeline_parse_workers'), в каждом свой VacancyParser;
+                  в пуле одновременно до двух страниц на процесс, статистика
+                  селекторов процессов собирается в парсер главного процесса;
+    гармонизация — DataProcessor.process_single_vacancy в отдельном потоке;
+    запись      — главный поток: хранилище и очередь повторов пачками ('pipeline_batch_size').
+
+При Ctrl+C загрузка новых страниц прекращается, уже загруженные проходят
+оставшиеся этапы и записываются, после чего KeyboardInterrupt передается
+дальше. Повторный Ctrl+C записывает текущую пачку и прерывает сразу.
+Если процесс разбора упал (BrokenProcessPool), конвейер записывает уже
+обработанное и прерывается: необработанные ссылки не попадают в очередь
+повторов как неудачные.
+"""
+
+import os
+import queue
+import signal
+import threading
+import multiprocessing as mp
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.parser import VacancyParser
+from src.async_fetch import fetch_concurrently
+from src.link_registry import link_specializations
+
+
+# (ссылка, данные / запись / (данные, HTML) в зависимости от этапа, класс ошибки или None)
+Item = Tuple[Dict, Optional[object], Optional[str]]
+
+# Конец потока элементов между этапами
+_STOP = object()
+
+# Парсер рабочего процесса (создается один раз в _init_parse_worker)
+_worker = {}
+
+
+def _init_parse_worker(config):
+    """Инициализация процесса разбора: парсер без браузера и кэша; Ctrl+C обрабатывает главный процесс"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker['parser'] = VacancyParser(config, use_cache=False)
+
+
+def _parse_in_worker(content: str, url: str) -> Tuple[Dict, object, Dict]:
+    """
+    Returns:
+        Tuple: (данные вакансии, версия селекторов, счетчики селекторов с прошлого вызова)
+    """
+    parser = _worker['parser']
+    data = parser.parse_vacancy_html(content, url)
+    selectors = parser.selectors.current
+    return data, selectors.version, selectors.stats.drain()
+
+
+def iter_vacancy_sources(parser, links: Iterable[Dict]) -> Iterator[Item]:
+    """Последовательно загружает страницы вакансий без разбора: (ссылка, (данные или None, HTML), ошибка)"""
+    for link_info in links:
+        url = link_info['url']
+        try:
+            yield link_info, parser.fetch_vacancy_source(url), None
+        except Exception as e:
+            print(f"      [!] Ошибка загрузки {url[:50]}...: {str(e)[:50]}")
+            yield link_info, None, type(e).__name__
+
+
+def use_pipeline(config) -> bool:
+    """Включен ли конвейер (с пулом браузеров не используется — там разбор уже идет в процессах пула)"""
+    parser_config = config.PARSER_CONFIG
+    if parser_config['fetch_mode'] == 'browser' and parser_config['browser_workers'] > 1:
+        return False
+    return parser_config['pipeline']
+
+
+class VacancyPipeline:
+    """Загрузка, разбор, гармонизация и запись вакансий отдельными этапами с ограниченными очередями"""
+
+    def __init__(self, config, parser, processor, store, retry_queue, links_dict: Dict[str, List[str]],
+                 parse_workers: int, queue_size: int, batch_size: int):
+        self.config = config
+        self.parser = parser
+        self.processor = processor
+        self.store = store
+        self.retry_queue = retry_queue
+        self.links_dict = links_dict
+        self.parse_workers = parse_workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+
+        self.stop = threading.Event()
+        self.errors: List[BaseException] = []
+        self.written = 0
+        self.failed = 0
+        self.total = 0
+
+    @classmethod
+    def from_config(cls, config, parser, processor, store, retry_queue,
+                    links_dict: Dict[str, List[str]]) -> 'VacancyPipeline':
+        parser_config = config.PARSER_CONFIG
+        parse_workers = parser_config['pipeline_parse_workers']
+        if parse_workers is None:
+            parse_workers = os.cpu_count() or 1
+        return cls(
+            config, parser, processor, store, retry_queue, links_dict,
+            parse_workers=parse_workers,
+            queue_size=parser_config['pipeline_queue_size'],
+            batch_size=parser_config['pipeline_batch_size'],
+        )
+
+    def run(self, links: List[Dict]) -> Tuple[int, int]:
+        """
+        Собирает вакансии по ссылкам
+
+        Returns:
+            Tuple: (записано вакансий, не удалось собрать)
+        """
+        self.total = len(links)
+        to_parse = queue.Queue(maxsize=self.queue_size)
+        to_harmonize = queue.Queue(maxsize=self.queue_size)
+        to_write = queue.Queue(maxsize=self.queue_size)
+
+        pool = None
+        if self.parse_workers > 0:
+            pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=mp.get_context('spawn'),
+                initializer=_init_parse_worker, initargs=(self.config,),
+            )
+        print(f"   [INFO] Конвейер: процессов разбора {self.parse_workers or 'нет (разбор в потоке)'}, "
+              f"очереди по {self.queue_size}, запись пачками по {self.batch_size}")
+
+        self._start('fetch', 1, lambda: self._feed(self._sources(links), to_parse), to_parse)
+        self._start('parse', 1, lambda: self._parse_stage(pool, to_parse, to_harmonize), to_harmonize)
+        self._start_stage('harmonize', 1, self._harmonize, to_harmonize, to_write)
+
+        try:
+            try:
+                self._write(to_write)
+            except KeyboardInterrupt:
+                self.stop.set()
+                print("\n[!] Остановка: новые страницы не загружаются, уже загруженные дописываются...")
+                self._write(to_write)
+                raise
+        finally:
+            self.stop.set()
+            if pool is not None:
+                pool.shutdown()
+
+        if self.errors:
+            raise self.errors[0]
+        return self.written, self.failed
+
+    def _sources(self, links: List[Dict]) -> Iterator[Item]:
+        """Загрузка: параллельная в режиме 'http' при 'concurrency' > 1, иначе последовательная"""
+        parser_config = self.config.PARSER_CONFIG
+        if parser_config['fetch_mode'] == 'http' and parser_config['concurrency'] > 1:
+            return fetch_concurrently(
+                self.parser, links,
+                concurrency=parser_config['concurrency'],
+                rate=parser_config['requests_per_second'],
+                burst=parser_config['burst'],
+                parse=False,
+            )
+        return iter_vacancy_sources(self.parser, links)
+
+    def _start(self, name: str, workers: int, target: Callable, outbox: queue.Queue):
+        """
+        Запускает workers потоков этапа. Когда все они завершились, в outbox
+        кладется _STOP; ошибка потока сохраняется и передается из run().
+        """
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def work():
+            try:
+                target()
+            except BaseException as e:
+                self.errors.append(e)
+                self.stop.set()
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    outbox.put(_STOP)
+
+        for index in range(workers):
+            threading.Thread(target=work, name=f'pipeline-{name}-{index}', daemon=True).start()
+
+    def _start_stage(self, name: str, workers: int, handle: Callable[[Item], Item],
+                     inbox: queue.Queue, outbox: queue.Queue):
+        """Этап: каждый поток берет элемент из inbox, обрабатывает и кладет результат в outbox"""
+        def loop():
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    # Сигнал конца нужен и остальным потокам этапа
+                    inbox.put(_STOP)
+                    return
+                outbox.put(handle(item))
+
+        self._start(name, workers, loop, outbox)
+
+    def _feed(self, sources: Iterator[Item], outbox: queue.Queue):
+        """Передает загруженные страницы на разбор, пока не запрошена остановка"""
+        try:
+            for item in sources:
+                # Если следующий этап прервался с ошибкой или запрошена остановка,
+                # очередь может уже никто не разбирать
+                while True:
+                    try:
+                        outbox.put(item, timeout=0.5)
+                        break
+                    except queue.Full:
+                        if self.errors or self.stop.is_set():
+                            return
+                if self.stop.is_set():
+                    break
+        finally:
+            # Для fetch_concurrently — остановка параллельной загрузки
+            close = getattr(sources, 'close', None)
+            if close is not None:
+                close()
+
+    def _parse_stage(self, pool: Optional[ProcessPoolExecutor], inbox: queue.Queue, outbox: queue.Queue):
+        """
+        Разбор HTML. В пуле одновременно до двух страниц на процесс: пока процесс разбирает одну,
+        следующая уже передана ему. Результаты отдаются дальше в порядке поступления страниц.
+        """
+        in_flight = deque()  # (ссылка, Future разбора или None, класс ошибки загрузки или None)
+        limit = 2 * max(1, self.parse_workers)
+        finished = False
+
+        def ready() -> bool:
+            future = in_flight[0][1]
+            return future is None or future.done()
+
+        try:
+            while True:
+                # Готовые результаты — сразу дальше; при полном окне и в конце ждем самый старый
+                while in_flight and (finished or len(in_flight) >= limit or ready()):
+                    outbox.put(self._parse_result(*in_flight.popleft()))
+                if finished:
+                    return
+
+                try:
+                    item = inbox.get(timeout=0.05 if in_flight else None)
+                except queue.Empty:
+                    continue
+                if item is _STOP:
+                    finished = True
+                    continue
+
+                link_info, source, error = item
+                future = self._submit_parse(pool, link_info, source) if error is None else None
+                in_flight.append((link_info, future, error))
+        except BrokenProcessPool:
+            print("   [!] Процесс разбора аварийно завершился — конвейер остановлен, "
+                  "необработанные ссылки будут собраны при следующем запуске")
+            raise
+
+    def _submit_parse(self, pool: Optional[ProcessPoolExecutor], link_info: Dict, source: Tuple) -> Future:
+        """
+        Отправляет страницу на разбор в пул (без пула — разбирает сразу).
+        Страницы, разобранные в браузере, проходят как есть.
+
+        Returns:
+            Future: (данные вакансии, версия селекторов или None, счетчики селекторов или None)
+        """
+        data, content = source
+        if pool is not None and data is None:
+            return pool.submit(_parse_in_worker, content, link_info['url'])
+
+        future = Future()
+        try:
+            if data is None:
+                data = self.parser.parse_vacancy_html(content, link_info['url'])
+            future.set_result((data, None, None))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _parse_result(self, link_info: Dict, future: Optional[Future], error: Optional[str]) -> Item:
+        """Результат разбора; статистика селекторов процесса разбора добавляется к статистике парсера"""
+        if future is None:
+            return link_info, None, error
+
+        try:
+            data, version, counts = future.result()
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            print(f"      [!] Ошибка разбора {link_info['url'][:50]}...: {str(e)[:50]}")
+            return link_info, None, type(e).__name__
+
+        if counts is not None:
+            current = self.parser.selectors.current
+            # После перезагрузки селекторов в главном процессе счетчики старой версии не смешиваем
+            if version == current.version:
+                current.stats.merge(counts)
+        return link_info, data, None
+
+    def _harmonize(self, item: Item) -> Item:
+        link_info, data, error = item
+        if data is None:
+            return item
+        try:
+            return link_info, self.processor.process_single_vacancy(data, self.links_dict), None
+        except Exception as e:
+            print(f"      [!] Ошибка обработки {link_info['url'][:50]}...: {str(e)[:50]}")
+            return link_info, None, type(e).__name__
+
+    def _write(self, to_write: queue.Queue):
+        """Запись пачками: пачка сбрасывается, когда набралась или когда новых записей пока нет"""
+        batch = []
+        try:
+            while True:
+                try:
+                    item = to_write.get(timeout=0.5)
+                except queue.Empty:
+                    self._write_batch(batch)
+                    batch = []
+                    continue
+
+                if item is _STOP:
+                    return
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    self._write_batch(batch)
+                    batch = []
+        finally:
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Item]):
+        if not batch:
+            return
+
+        for link_info, record, error in batch:
+            url = link_info['url']
+            if record is not None:
+                self.store.append(record)
+                self.retry_queue.record_success(url, save=False)
+                self.written += 1
+            else:
+                self.retry_queue.record_failure(url, link_specializations(link_info), error, save=False)
+                self.failed += 1
+
+            done = self.written + self.failed
+            if done % 10 == 0 or done == self.total:
+                print(f"   [+] {done}/{self.total} | В хранилище: {len(self.store)} вакансий")
+
+        self.store.flush()
+        self.retry_queue.flush()
@@ -3,8 +3,14 @@
 """
 
 import json
-from typing import List, Dict
+from typing import Iterable, List, Dict
 from src import harmonization as harm
+from src.link_registry import link_specializations
+from src.reader import iter_vacancies
+from src.urls import canonical_vacancy_url
+
+# Поля, которые нужны generate_statistics (остальные при чтении файла пропускаются)
+STATISTICS_FIELDS = ('has_salary', 'remote_work', 'specialist_level', 'city', 'specialization_category')
 
 
 class DataProcessor:
@@ -13,7 +19,7 @@ class DataProcessor:
     def __init__(self, config):
         self.config = config
 
-    def process_vacancies(self, vacancies: List[Dict], links_data: List[Dict[str, str]]) -> List[Dict]:
+    def process_vacancies(self, vacancies: List[Dict], links_data: List[Dict]) -> List[Dict]:
         """
         Обрабатывает и гармонизирует данные о вакансиях
 
@@ -25,15 +31,13 @@ class DataProcessor:
             List[Dict]: Обработанные и гармонизированные вакансии
         """
         # Создаем словарь для быстрого поиска специализаций
-        links_dict = {item['url']: item['specialization'] for item in links_data}
+        links_dict = {canonical_vacancy_url(item['url']): link_specializations(item) for item in links_data}
 
         processed = []
 
         for vacancy in vacancies:
-            # Добавляем специализацию
-            url = vacancy.get('url', '')
-            specialization = links_dict.get(url, 'Не указано')
-            vacancy['specialization'] = specialization
+            # Добавляем специализации
+            self._set_specializations(vacancy, links_dict)
 
             # Гармонизация данных
             processed_vacancy = self._harmonize_vacancy(vacancy)
@@ -45,6 +49,21 @@ class DataProcessor:
 
         return processed
 
+    @staticmethod
+    def _lookup_specializations(url: str, links_dict: Dict[str, List[str]]) -> List[str]:
+        """Ищет специализации по URL, в том числе по канонической форме ссылки"""
+        specializations = links_dict.get(url) or links_dict.get(canonical_vacancy_url(url))
+        return list(specializations) if specializations else ['Не указано']
+
+    def _set_specializations(self, vacancy: Dict, links_dict: Dict[str, List[str]]):
+        """
+        Записывает в вакансию все ее специализации и основную (первую найденную) —
+        по основной определяется категория
+        """
+        specializations = self._lookup_specializations(vacancy.get('url', ''), links_dict)
+        vacancy['specialization'] = specializations[0]
+        vacancy['specializations'] = specializations
+
     def _harmonize_vacancy(self, vacancy: Dict) -> Dict:
         """
         Применяет гармонизацию к отдельной вакансии
@@ -122,19 +141,18 @@ class DataProcessor:
 
         return vacancy
 
-    def process_single_vacancy(self, vacancy: Dict, links_dict: Dict[str, str]) -> Dict:
+    def process_single_vacancy(self, vacancy: Dict, links_dict: Dict[str, List[str]]) -> Dict:
         """
         Обрабатывает и гармонизирует одну вакансию
 
         Args:
             vacancy: Сырые данные вакансии
-            links_dict: Словарь {url: специализация}
+            links_dict: Словарь {url: [специализации]}
 
         Returns:
             Dict: Обработанная вакансия
         """
-        url = vacancy.get('url', '')
-        vacancy['specialization'] = links_dict.get(url, 'Не указано')
+        self._set_specializations(vacancy, links_dict)
         processed = self._harmonize_vacancy(vacancy)
         return self._enrich_vacancy(processed)
 
@@ -153,27 +171,31 @@ class DataProcessor:
 
         print(f"   💾 Финальные данные сохранены: {output_file}")
 
-    def generate_statistics(self, processed_data: List[Dict]) -> Dict:
+    def generate_statistics(self, processed_data: Iterable[Dict]) -> Dict:
         """
         Генерирует статистику по вакансиям
 
         Args:
-            processed_data: Обработанные вакансии
+            processed_data: Обработанные вакансии (список или поток из iter_vacancies)
 
         Returns:
             Dict: Статистика
         """
         stats = {
-            'total_vacancies': len(processed_data),
-            'with_salary': sum(1 for v in processed_data if v['has_salary']),
-            'remote_work': sum(1 for v in processed_data if v['remote_work']),
+            'total_vacancies': 0,
+            'with_salary': 0,
+            'remote_work': 0,
             'by_level': {},
             'by_city': {},
             'by_category': {},
         }
 
-        # Подсчет по разрядам
+        # Подсчет за один проход, чтобы работать и с потоком вакансий
         for vacancy in processed_data:
+            stats['total_vacancies'] += 1
+            stats['with_salary'] += 1 if vacancy['has_salary'] else 0
+            stats['remote_work'] += 1 if vacancy['remote_work'] else 0
+
             level = vacancy.get('specialist_level', 'Не указано')
             stats['by_level'][level] = stats['by_level'].get(level, 0) + 1
 
@@ -184,3 +206,15 @@ class DataProcessor:
             stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
 
         return stats
+
+    def generate_statistics_from_file(self, data_file: str) -> Dict:
+        """
+        Генерирует статистику по файлу data_finally_*.json, читая его потоково
+
+        Args:
+            data_file: Путь к файлу с обработанными вакансиями
+
+        Returns:
+            Dict: Статистика
+        """
+        return self.generate_statistics(iter_vacancies(data_file, fields=STATISTICS_FIELDS))
@@ -0,0 +1,81 @@
+"""
+Потоковое чтение файлов с вакансиями
+
+Файлы data_finally_*.json содержат один большой JSON-массив, и json.load держит
+в памяти весь месяц целиком. Здесь массив читается кусками и разбирается
+по одной вакансии, поэтому расход памяти не зависит от размера файла.
+Журналы JSONL (data_journal_*.jsonl) читаются тем же интерфейсом.
+"""
+
+import json
+from typing import Dict, Iterable, Iterator, Optional
+
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _projection_hook(fields: Iterable[str]):
+    """Возвращает object_pairs_hook, который оставляет в вакансии только нужные поля"""
+    wanted = frozenset(fields)
+
+    def hook(pairs):
+        return {key: value for key, value in pairs if key in wanted}
+
+    return hook
+
+
+def iter_vacancies(path: str, fields: Optional[Iterable[str]] = None,
+                   chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Последовательно возвращает вакансии из data_finally_*.json (или журнала JSONL)
+
+    Args:
+        path: Путь к файлу
+        fields: Если задано — в вакансии остаются только эти поля
+                (например, без description, который занимает большую часть файла)
+        chunk_size: Размер читаемого блока в символах
+
+    Yields:
+        Dict: Одна вакансия
+
+    Raises:
+        ValueError: Если файл поврежден
+    """
+    hook = _projection_hook(fields) if fields is not None else None
+    decoder = json.JSONDecoder(object_pairs_hook=hook)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        while True:
+            # Пропускаем пробелы, открывающую скобку массива и запятые между элементами
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,[':
+                pos += 1
+
+            if pos >= len(buffer):
+                if eof:
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            if buffer[pos] == ']':
+                return
+
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Вакансия не поместилась в буфер — дочитываем следующий блок
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            yield record
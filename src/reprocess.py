@@ -0,0 +1,155 @@
+"""
+Офлайн-перепроцессинг вакансий за месяц
+
+Повторно извлекает поля из сохраненных страниц (кэш HTML) и заново применяет
+гармонизацию, не запуская браузер. Разбор HTML выполняется параллельно
+в пуле процессов; вакансии без сохраненной страницы гармонизируются
+заново по сырым полям из хранилища.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.parser import VacancyParser
+from src.processor import DataProcessor
+from src.html_cache import HtmlCache
+from src.link_registry import link_specializations
+from src.storage import get_store_path, open_vacancy_store, remove_store_files, replace_store_files
+from src.urls import extract_vacancy_id
+
+
+# Поля, которые возвращает VacancyParser.parse_vacancy_html (до гармонизации)
+RAW_FIELDS = (
+    'title', 'salary_raw', 'experience', 'work_schedule', 'work_format', 'company',
+    'address', 'description', 'skills', 'url', 'monitoring_date', 'monitoring_time',
+)
+
+# Состояние рабочего процесса (создается один раз в _init_worker)
+_worker = {}
+
+
+def _init_worker(config, cache_dir: Optional[str]):
+    """Инициализация рабочего процесса: парсер без браузера и кэша, процессор"""
+    _worker['cache_dir'] = cache_dir
+    _worker['parser'] = VacancyParser(config, use_cache=False)
+    _worker['processor'] = DataProcessor(config)
+
+
+def _reprocess_record(record: Dict) -> Dict:
+    """Пересобирает одну вакансию: из HTML, если страница есть в кэше, иначе по сырым полям"""
+    parser = _worker['parser']
+    processor = _worker['processor']
+
+    url = record.get('url', '')
+    links_dict = {url: link_specializations(record)}
+
+    content = None
+    vacancy_id = extract_vacancy_id(url)
+    if _worker['cache_dir'] and vacancy_id is not None:
+        content = HtmlCache.read_page(_worker['cache_dir'], vacancy_id)
+
+    if content is not None:
+        raw = parser.parse_vacancy_html(
+            content, url,
+            monitoring_date=record.get('monitoring_date'),
+            monitoring_time=record.get('monitoring_time'),
+        )
+    else:
+        raw = {field: record[field] for field in RAW_FIELDS if field in record}
+
+    return processor.process_single_vacancy(raw, links_dict)
+
+
+def _reprocess_chunk(chunk: List[Dict]) -> List[Dict]:
+    """Обрабатывает пачку вакансий в рабочем процессе"""
+    return [_reprocess_record(record) for record in chunk]
+
+
+def _chunked(records: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """Разбивает поток вакансий на пачки"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _ordered_map(executor, func, chunks: Iterator[List[Dict]], window: int) -> Iterator[List[Dict]]:
+    """
+    Аналог executor.map, который держит в работе не более window пачек,
+    чтобы не читать весь месяц в память. Порядок результатов сохраняется.
+    """
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(func, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def reprocess_month(config, date_str: str, workers: Optional[int] = None, chunk_size: Optional[int] = None) -> int:
+    """
+    Пересобирает хранилище вакансий за месяц и итоговый data_finally_*.json
+
+    Args:
+        config: Конфигурация
+        date_str: Месяц в формате MM.YYYY
+        workers: Количество процессов (по умолчанию — все ядра)
+        chunk_size: Размер пачки вакансий на одну задачу
+
+    Returns:
+        int: Количество пересобранных вакансий
+    """
+    workers = workers or config.REPROCESS_CONFIG['workers'] or os.cpu_count() or 1
+    chunk_size = chunk_size or config.REPROCESS_CONFIG['chunk_size']
+
+    store_path = get_store_path(config, date_str)
+    if not os.path.exists(store_path):
+        print(f"[ERROR] Хранилище за {date_str} не найдено: {store_path}")
+        return 0
+
+    cache_dir = config.get_data_file('html_cache')
+    if not os.path.isdir(cache_dir):
+        cache_dir = None
+
+    tmp_path = store_path + '.reprocess'
+    remove_store_files(tmp_path)
+
+    source = open_vacancy_store(config, date_str)
+    target = open_vacancy_store(config, date_str, path=tmp_path)
+    total = len(source)
+    done = 0
+    start_time = time.time()
+
+    print(f"[+] Перепроцессинг {date_str}: {total} вакансий, процессов: {workers}, пачка: {chunk_size}")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config, cache_dir)) as executor:
+            chunks = _chunked(source.iter_records(), chunk_size)
+            for results in _ordered_map(executor, _reprocess_chunk, chunks, window=workers * 2):
+                for record in results:
+                    target.append(record)
+                done += len(results)
+                print(f"   [+] {done}/{total}")
+    finally:
+        source.close()
+        target.close()
+
+    replace_store_files(tmp_path, store_path)
+
+    store = open_vacancy_store(config, date_str)
+    try:
+        written = store.compact(config.get_output_file(date_str))
+    finally:
+        store.close()
+
+    elapsed_time = round(time.time() - start_time, 2)
+    print(f"[OK] Перепроцессинг завершен: {written} вакансий за {elapsed_time} секунд")
+    return written
@@ -0,0 +1,159 @@
+"""
+Очередь повторных попыток для вакансий, которые не удалось спарсить
+
+Для каждой ссылки хранится число попыток, класс последней ошибки и время,
+раньше которого повторять не нужно (экспоненциальная задержка). После
+PARSER_CONFIG['max_retries'] неудачных попыток ссылка помечается как
+окончательно не собранная и остается в файле очереди для учета.
+Закрытая или удаленная вакансия (PageGoneError) не повторяется вовсе.
+
+Файл очереди перезаписывается целиком, поэтому при обработке множества
+ссылок изменения копятся в памяти (save=False) и сохраняются один раз
+на пачку через flush().
+"""
+
+import os
+import json
+import time
+import shutil
+from typing import Dict, List, Optional
+
+
+class RetryQueue:
+    """Персистентная очередь повторных попыток с экспоненциальной задержкой"""
+
+    STATUS_PENDING = 'pending'
+    STATUS_FAILED = 'failed'
+    STATUS_GONE = 'gone'
+
+    # Ошибка, после которой повторять бесполезно: вакансия закрыта или удалена
+    GONE_ERROR = 'PageGoneError'
+
+    def __init__(self, queue_file: str, max_retries: int, backoff_base: float, backoff_max: float):
+        self.queue_file = queue_file
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+
+        if os.path.exists(queue_file):
+            try:
+                with open(queue_file, 'r', encoding='utf-8') as f:
+                    self.entries = {entry['url']: entry for entry in json.load(f)}
+            except (json.JSONDecodeError, IOError, KeyError, TypeError):
+                print(f"   [!] Не удалось прочитать очередь повторов {queue_file}, начинаем заново")
+                self.entries = {}
+
+    @classmethod
+    def for_month(cls, config, date_str: str) -> 'RetryQueue':
+        """Открывает очередь повторов за месяц (MM.YYYY)"""
+        parser_config = config.PARSER_CONFIG
+        return cls(
+            config.get_data_file(f'retry_queue_{date_str}_rabota_by.json'),
+            max_retries=parser_config['max_retries'],
+            backoff_base=parser_config['retry_backoff_base'],
+            backoff_max=parser_config['retry_backoff_max'],
+        )
+
+    def save(self):
+        """Атомарно сохраняет очередь"""
+        tmp_file = self.queue_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(list(self.entries.values()), f, indent=4, ensure_ascii=False)
+        shutil.move(tmp_file, self.queue_file)
+        self._dirty = False
+
+    def flush(self):
+        """Сохраняет очередь, если после последнего сохранения она изменилась"""
+        if self._dirty:
+            self.save()
+
+    def record_failure(self, url: str, specializations: List[str], error: Optional[str], save: bool = True) -> Dict:
+        """
+        Учитывает неудачную попытку и назначает время следующей
+
+        Args:
+            url: URL вакансии
+            specializations: Специализации вакансии (нужны при повторной обработке)
+            error: Класс последней ошибки
+            save: Сразу сохранить очередь (False — при записи пачкой, flush() вызывается после пачки)
+
+        Returns:
+            Dict: Обновленная запись очереди
+        """
+        entry = self.entries.setdefault(url, {
+            'url': url,
+            'specialization': specializations[0] if specializations else None,
+            'specializations': list(specializations),
+            'attempts': 0,
+        })
+        entry['attempts'] += 1
+        entry['last_error'] = error or 'Unknown'
+        entry['last_attempt_at'] = time.time()
+
+        if error == self.GONE_ERROR:
+            entry['status'] = self.STATUS_GONE
+            entry['next_attempt_at'] = None
+        elif entry['attempts'] >= self.max_retries:
+            entry['status'] = self.STATUS_FAILED
+            entry['next_attempt_at'] = None
+        else:
+            delay = min(self.backoff_base * 2 ** (entry['attempts'] - 1), self.backoff_max)
+            entry['status'] = self.STATUS_PENDING
+            entry['next_attempt_at'] = entry['last_attempt_at'] + delay
+
+        self._dirty = True
+        if save:
+            self.save()
+        return entry
+
+    def record_success(self, url: str, save: bool = True) -> bool:
+        """
+        Убирает ссылку из очереди после успешной обработки
+
+        Returns:
+            bool: Ссылка была в очереди
+        """
+        removed = self.entries.pop(url, None) is not None
+        if removed:
+            self._dirty = True
+            if save:
+                self.save()
+        return removed
+
+    def pending(self) -> List[Dict]:
+        """Ссылки, которые ещё будут повторяться"""
+        return [e for e in self.entries.values() if e['status'] == self.STATUS_PENDING]
+
+    def failed(self) -> List[Dict]:
+        """Ссылки, исчерпавшие все попытки"""
+        return [e for e in self.entries.values() if e['status'] == self.STATUS_FAILED]
+
+    def gone(self) -> List[Dict]:
+        """Закрытые или удаленные вакансии"""
+        return [e for e in self.entries.values() if e['status'] == self.STATUS_GONE]
+
+    def is_held(self, url: str, now: Optional[float] = None) -> bool:
+        """
+        Ссылка в очереди, и загружать её сейчас не нужно: время следующей попытки
+        ещё не наступило, попытки закончились или вакансия закрыта
+        """
+        entry = self.entries.get(url)
+        if entry is None:
+            return False
+        if entry['status'] != self.STATUS_PENDING:
+            return True
+        now = time.time() if now is None else now
+        return entry['next_attempt_at'] > now
+
+    def due(self, now: Optional[float] = None) -> List[Dict]:
+        """Ссылки, для которых уже наступило время следующей попытки"""
+        now = time.time() if now is None else now
+        return [e for e in self.pending() if e['next_attempt_at'] <= now]
+
+    def next_due_in(self, now: Optional[float] = None) -> Optional[float]:
+        """Через сколько секунд наступит ближайшая попытка (None — очередь пуста)"""
+        now = time.time() if now is None else now
+        times = [e['next_attempt_at'] for e in self.pending()]
+        return max(0.0, min(times) - now) if times else None
@@ -0,0 +1,274 @@
+"""
+Реестр селекторов полей вакансии
+
+Селекторы хранятся в config/selectors.json: для каждого поля — список
+запасных вариантов по порядку. Файл читается и компилируется один раз
+(план ExtractionPlan, XPath, CSS и т.д. строятся по требованию и
+кэшируются до следующей перезагрузки). Каждые
+PARSER_CONFIG['selectors_reload_every'] страниц проверяется время
+изменения файла: исправленные селекторы подхватываются без перезапуска.
+
+SelectorStats считает, какой селектор сработал для каждого поля, сколько
+раз поле получило значение по умолчанию и сколько времени занял каждый
+селектор. Если после 'selectors_check_after' страниц поле почти всегда
+остается без значения — скорее всего изменилась разметка, об этом
+сразу выводится предупреждение. Счетчики процессов разбора передаются
+в главный процесс через drain()/merge().
+"""
+
+import os
+import json
+import time
+import shutil
+import threading
+from typing import Callable, Dict, List, Optional
+
+from src.extraction_plan import FIELD_VALUES, ExtractionPlan, Selector, css_selector
+
+
+def parse_selector(raw: Dict) -> Selector:
+    """
+    Селектор из записи файла: {"tag": "span", "data-qa": "..."}, {"tag": "div", "class": "..."}
+    или {"tag": "h1"} — тег и не больше одного атрибута
+    """
+    if not isinstance(raw, dict):
+        raise ValueError(f"Селектор должен быть объектом: {raw!r}")
+
+    tag = raw.get('tag')
+    attrs = [(attr, value) for attr, value in raw.items() if attr != 'tag']
+    if len(attrs) > 1:
+        raise ValueError(f"В селекторе больше одного атрибута: {raw!r}")
+    if not attrs:
+        if not tag:
+            raise ValueError(f"Пустой селектор: {raw!r}")
+        return (tag, None, None)
+
+    attr, value = attrs[0]
+    if not isinstance(value, str) or not value or (attr == 'class' and len(value.split()) != 1):
+        raise ValueError(f"Неверное значение атрибута в селекторе: {raw!r}")
+    return (tag, attr, value)
+
+
+def load_selectors(path: str) -> Dict:
+    """
+    Читает и проверяет файл селекторов
+
+    Returns:
+        Dict: {'version': ..., 'fields': {поле: [селектор, ...]}}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    raw_fields = data.get('fields') or {}
+    missing = [field for field in FIELD_VALUES if not raw_fields.get(field)]
+    unknown = [field for field in raw_fields if field not in FIELD_VALUES]
+    if missing or unknown:
+        raise ValueError(f"Поля без селекторов: {missing}, неизвестные поля: {unknown}")
+
+    fields = {field: [parse_selector(raw) for raw in raw_fields[field]] for field in FIELD_VALUES}
+    return {'version': data.get('version'), 'fields': fields}
+
+
+class SelectorStats:
+    """Срабатывания селекторов, значения по умолчанию и время по каждому полю"""
+
+    def __init__(self, field_selectors: Dict[str, List[Selector]], check_after: int, alert_default_rate: float):
+        self.field_selectors = field_selectors
+        self.check_after = check_after
+        self.alert_default_rate = alert_default_rate
+
+        self.alerts: List[str] = []
+        self._checked = False
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.pages = 0
+        self.hits = {field: [0] * len(selectors) for field, selectors in self.field_selectors.items()}
+        self.seconds = {field: [0.0] * len(selectors) for field, selectors in self.field_selectors.items()}
+        self.defaults = {field: 0 for field in self.field_selectors}
+
+    def record_page(self, trace: Dict):
+        """Учитывает одну страницу: trace из resolve_fields"""
+        with self._lock:
+            self.pages += 1
+            for field, (matched, timings) in trace.items():
+                if field not in self.hits:
+                    continue
+                for index, seconds in enumerate(timings):
+                    self.seconds[field][index] += seconds
+                if matched is None:
+                    self.defaults[field] += 1
+                else:
+                    self.hits[field][matched] += 1
+
+            self._maybe_check()
+
+    def drain(self) -> Dict:
+        """
+        Забирает накопленные счетчики и обнуляет их.
+        Так процесс разбора передает статистику в главный процесс (см. merge).
+        """
+        with self._lock:
+            counts = {'pages': self.pages, 'hits': self.hits, 'seconds': self.seconds, 'defaults': self.defaults}
+            self._reset()
+        return counts
+
+    def merge(self, counts: Dict):
+        """Добавляет счетчики drain() из другого процесса с теми же селекторами"""
+        with self._lock:
+            self.pages += counts['pages']
+            for field, hits in counts['hits'].items():
+                if field not in self.hits:
+                    continue
+                for index in range(min(len(hits), len(self.hits[field]))):
+                    self.hits[field][index] += hits[index]
+                    self.seconds[field][index] += counts['seconds'][field][index]
+                self.defaults[field] += counts['defaults'][field]
+
+            self._maybe_check()
+
+    def _maybe_check(self):
+        if not self._checked and self.check_after and self.pages >= self.check_after:
+            self._checked = True
+            self._check_markup()
+
+    def default_rate(self, field: str) -> float:
+        return self.defaults[field] / self.pages if self.pages else 0.0
+
+    def _check_markup(self):
+        """Предупреждает о полях, которые почти ни на одной странице не нашлись"""
+        for field in self.field_selectors:
+            if self.default_rate(field) >= self.alert_default_rate:
+                labels = ', '.join(css_selector(selector) for selector in self.field_selectors[field])
+                self.alerts.append(field)
+                print(f"   [!] Поле {field} не найдено на {self.defaults[field]} из {self.pages} страниц "
+                      f"(селекторы: {labels}) — вероятно, изменилась разметка, проверьте config/selectors.json")
+
+    def summary(self) -> Dict:
+        """Статистика в виде для сохранения в JSON"""
+        return {
+            'pages': self.pages,
+            'alerts': self.alerts,
+            'fields': {
+                field: {
+                    'defaults': self.defaults[field],
+                    'default_rate': round(self.default_rate(field), 4),
+                    'selectors': [
+                        {
+                            'selector': css_selector(selector),
+                            'hits': self.hits[field][index],
+                            'ms_total': round(self.seconds[field][index] * 1000, 2),
+                        }
+                        for index, selector in enumerate(selectors)
+                    ],
+                }
+                for field, selectors in self.field_selectors.items()
+            },
+        }
+
+
+class SelectorSet:
+    """Селекторы одной версии файла и всё, что из них скомпилировано"""
+
+    def __init__(self, version, field_selectors: Dict[str, List[Selector]], stats: SelectorStats):
+        self.version = version
+        self.field_selectors = field_selectors
+        self.plan = ExtractionPlan(field_selectors)
+        self.stats = stats
+        self._compiled: Dict[str, object] = {}
+
+    def compiled(self, name: str, build: Callable):
+        """Скомпилированное представление селекторов (XPath, CSS, фильтр разбора), строится один раз"""
+        value = self._compiled.get(name)
+        if value is None:
+            value = build(self.field_selectors)
+            self._compiled[name] = value
+        return value
+
+
+class SelectorRegistry:
+    """
+    Селекторы полей из config/selectors.json с перезагрузкой при изменении файла.
+    Разбор страницы берет current один раз: перезагрузка посреди страницы на него не влияет.
+    """
+
+    def __init__(self, path: str, reload_every: int = 0, check_after: int = 0,
+                 alert_default_rate: float = 1.0, stats_file: Optional[str] = None):
+        self.path = path
+        self.reload_every = reload_every
+        self.check_after = check_after
+        self.alert_default_rate = alert_default_rate
+        self.stats_file = stats_file
+
+        self.current: Optional[SelectorSet] = None
+        self._mtime = None
+        self._calls = 0
+        self._lock = threading.Lock()
+
+        self._load(load_selectors(path))
+
+    @classmethod
+    def from_config(cls, config) -> 'SelectorRegistry':
+        parser_config = config.PARSER_CONFIG
+        return cls(
+            config.SELECTORS_FILE,
+            reload_every=parser_config['selectors_reload_every'],
+            check_after=parser_config['selectors_check_after'],
+            alert_default_rate=parser_config['selectors_alert_default_rate'],
+            stats_file=config.get_data_file('selector_stats_rabota_by.json'),
+        )
+
+    def _load(self, loaded: Dict):
+        stats = SelectorStats(loaded['fields'], self.check_after, self.alert_default_rate)
+        self.current = SelectorSet(loaded['version'], loaded['fields'], stats)
+        self._mtime = os.path.getmtime(self.path)
+
+    def maybe_reload(self) -> bool:
+        """
+        Раз в reload_every вызовов проверяет, не изменился ли файл, и перечитывает его.
+        Статистика для новых селекторов начинается заново.
+
+        Returns:
+            bool: Селекторы перезагружены
+        """
+        if not self.reload_every:
+            return False
+
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.reload_every:
+                return False
+
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError as e:
+                print(f"   [!] Файл селекторов недоступен, остаются прежние селекторы: {str(e)[:80]}")
+                return False
+            if mtime == self._mtime:
+                return False
+
+            # Ошибочный файл не перечитываем до следующего изменения
+            self._mtime = mtime
+            try:
+                loaded = load_selectors(self.path)
+            except (OSError, ValueError) as e:
+                # json.JSONDecodeError — подкласс ValueError
+                print(f"   [!] Не удалось перечитать {self.path}, остаются прежние селекторы: {str(e)[:80]}")
+                return False
+
+            self._load(loaded)
+            print(f"   [INFO] Селекторы перезагружены из {self.path} (версия {self.current.version})")
+            return True
+
+    def save_stats(self):
+        """Атомарно сохраняет статистику текущих селекторов"""
+        current = self.current
+        if self.stats_file is None or not current.stats.pages:
+            return
+
+        data = {'version': current.version, 'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'), **current.stats.summary()}
+        tmp_file = self.stats_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+        shutil.move(tmp_file, self.stats_file)
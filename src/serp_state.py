@@ -0,0 +1,77 @@
+"""
+Состояние инкрементального сбора ссылок по специализациям
+
+Для каждой специализации хранится отметка (наибольший ID вакансии,
+встреченный в выдаче) и время последнего полного обхода. По времени
+полного обхода решается, когда снова пройти все страницы выдачи, чтобы
+заметить закрытые вакансии.
+"""
+
+import os
+import json
+import time
+import shutil
+from typing import Dict, Iterable, Optional
+
+from src.urls import extract_vacancy_id
+
+
+class SerpState:
+    """Отметки и время полного обхода по специализациям"""
+
+    def __init__(self, state_file: str, full_sweep_days: float):
+        self.state_file = state_file
+        self.full_sweep_days = full_sweep_days
+        self.specs: Dict[str, Dict] = {}
+
+        if os.path.exists(state_file):
+            try:
+                with open(state_file, 'r', encoding='utf-8') as f:
+                    self.specs = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                print(f"   [!] Не удалось прочитать состояние сбора ссылок {state_file}, начинаем заново")
+                self.specs = {}
+
+    @classmethod
+    def from_config(cls, config) -> 'SerpState':
+        return cls(
+            config.get_data_file('serp_state_rabota_by.json'),
+            full_sweep_days=config.PARSER_CONFIG['serp_full_sweep_days'],
+        )
+
+    def save(self):
+        """Атомарно сохраняет состояние"""
+        tmp_file = self.state_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.specs, f, indent=4, ensure_ascii=False)
+        shutil.move(tmp_file, self.state_file)
+
+    def needs_full_sweep(self, spec_name: str, now: Optional[float] = None) -> bool:
+        """Пора ли пройти все страницы выдачи специализации"""
+        entry = self.specs.get(spec_name)
+        if not entry or not entry.get('last_full_sweep_at'):
+            return True
+        now = time.time() if now is None else now
+        return now - entry['last_full_sweep_at'] >= self.full_sweep_days * 86400
+
+    def update(self, spec_name: str, vacancy_urls: Iterable[str], full_sweep: bool,
+               now: Optional[float] = None) -> int:
+        """
+        Запоминает результат обхода специализации
+
+        Returns:
+            int: Сколько вакансий с ID выше прежней отметки встретилось в выдаче
+        """
+        now = time.time() if now is None else now
+        entry = self.specs.setdefault(spec_name, {'high_water_id': None, 'last_full_sweep_at': None})
+        previous = entry['high_water_id']
+
+        ids = [i for i in (extract_vacancy_id(url) for url in vacancy_urls) if i is not None]
+        above = sum(1 for i in ids if previous is None or i > previous)
+        if ids:
+            entry['high_water_id'] = max(ids) if previous is None else max(previous, max(ids))
+
+        entry['last_run_at'] = now
+        if full_sweep:
+            entry['last_full_sweep_at'] = now
+        return above
@@ -0,0 +1,185 @@
+"""
+Извлечение полей вакансии из встроенного JSON состояния страницы
+
+Страница вакансии содержит данные не только в разметке, но и в JSON
+внутри <template id="HH-Lux-InitialState">. Этот JSON находится одним
+поиском подстроки по сырому HTML, без построения дерева, и переводится
+в поля записи parse_vacancy_html. Поля, которых в состоянии нет или
+которые показываются на странице в другом виде (тип занятости, формат
+работы), извлекаются прежними _extract_* из небольшого фрагмента HTML
+вокруг нужного элемента.
+"""
+
+import json
+import html
+from typing import Dict, List, Optional
+
+import lxml.html
+
+from src.harmonization import extract_salary_range
+
+
+STATE_MARKER = 'id="HH-Lux-InitialState"'
+
+# Опыт работы так, как он написан на странице вакансии
+EXPERIENCE_LABELS = {
+    'noExperience': 'не требуется',
+    'between1And3': '1–3 года',
+    'between3And6': '3–6 лет',
+    'moreThan6': 'более 6 лет',
+}
+
+CURRENCY_SYMBOLS = {
+    'BYR': 'Br',
+    'BYN': 'Br',
+    'USD': '$',
+    'EUR': '€',
+    'RUR': '₽',
+    'RUB': '₽',
+}
+
+
+def find_initial_state(content: str) -> Optional[Dict]:
+    """Находит и декодирует JSON состояния страницы (или None, если его нет)"""
+    marker_pos = content.find(STATE_MARKER)
+    if marker_pos == -1:
+        return None
+
+    start = content.find('>', marker_pos) + 1
+    end = content.find('</template>', start)
+    if start == 0 or end == -1:
+        return None
+
+    raw = content[start:end]
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        pass
+
+    # Иногда JSON внутри template экранирован как HTML
+    try:
+        return json.loads(html.unescape(raw))
+    except json.JSONDecodeError:
+        return None
+
+
+def _format_amount(amount: int) -> str:
+    return f'{amount:,}'.replace(',', ' ')
+
+
+def _salary_from_state(compensation: Optional[Dict]) -> Optional[str]:
+    """
+    Строка зарплаты в том же виде, в каком её разбирает extract_salary_range:
+    'от 2 500 до 3 000 Br на руки'
+    """
+    if compensation is None:
+        return None
+
+    amount_from, amount_to = compensation.get('from'), compensation.get('to')
+    if amount_from is None and amount_to is None:
+        return 'Уровень дохода не указан'
+
+    parts = []
+    if amount_from is not None:
+        parts.append(f'от {_format_amount(amount_from)}')
+    if amount_to is not None:
+        parts.append(f'до {_format_amount(amount_to)}')
+
+    currency = compensation.get('currencyCode')
+    if currency:
+        parts.append(CURRENCY_SYMBOLS.get(currency, currency))
+    if compensation.get('gross') is not None:
+        parts.append('до вычета налогов' if compensation['gross'] else 'на руки')
+
+    return ' '.join(parts)
+
+
+def _description_text(description: Optional[str]) -> Optional[str]:
+    """Текст описания вакансии из его HTML"""
+    if description is None:
+        return None
+    if not description.strip():
+        return 'Не указано'
+    return lxml.html.fragment_fromstring(description, create_parent='div').text_content().strip()
+
+
+def fields_from_state(state: Dict) -> Dict[str, Optional[str]]:
+    """
+    Переводит состояние страницы в поля записи.
+    None — поле в состоянии не найдено, его нужно извлечь из разметки.
+    """
+    vacancy = state.get('vacancyView') or {}
+    if not vacancy:
+        return {}
+
+    company = vacancy.get('company') or {}
+    address = vacancy.get('address') or {}
+    key_skills = (vacancy.get('keySkills') or {}).get('keySkill')
+
+    skills = None
+    if key_skills is not None:
+        skills = '; '.join(key_skills) if key_skills else 'Не указано'
+
+    return {
+        'title': (vacancy.get('name') or '').strip() or None,
+        'salary_raw': _salary_from_state(vacancy.get('compensation')),
+        'experience': EXPERIENCE_LABELS.get(vacancy.get('workExperience')),
+        'company': company.get('visibleName') or company.get('name'),
+        'address': (address.get('displayName') or address.get('rawAddress')) if address else None,
+        'description': _description_text(vacancy.get('description')),
+        'skills': skills,
+    }
+
+
+def compare_with_dom(state_fields: Dict, dom_fields: Dict) -> List[str]:
+    """
+    Поля, в которых состояние страницы разошлось с разметкой.
+    Зарплата из состояния записывается в своем виде, поэтому сравнивается после разбора extract_salary_range.
+    """
+    mismatched = []
+    for field, value in state_fields.items():
+        if field == 'salary_raw':
+            same = extract_salary_range(value) == extract_salary_range(dom_fields.get(field))
+        else:
+            same = value == dom_fields.get(field)
+        if not same:
+            mismatched.append(field)
+    return mismatched
+
+
+def element_fragment(content: str, marker: str, tag: str) -> Optional[str]:
+    """
+    Вырезает из сырого HTML элемент tag, в открывающем теге которого есть marker.
+    Вложенные одноименные теги учитываются.
+
+    Returns:
+        str: HTML элемента или None, если marker на странице нет или элемент не удалось выделить
+    """
+    marker_pos = content.find(marker)
+    if marker_pos == -1:
+        return None
+
+    start = content.rfind(f'<{tag}', 0, marker_pos)
+    if start == -1 or content.find('>', start) < marker_pos:
+        return None
+
+    open_tag, close_tag = f'<{tag}', f'</{tag}>'
+    depth = 0
+    pos = start
+    while True:
+        next_open = content.find(open_tag, pos)
+        next_close = content.find(close_tag, pos)
+        if next_close == -1:
+            return None
+
+        if next_open != -1 and next_open < next_close:
+            # Пропускаем теги, которые только начинаются с имени tag (<p> и <path>)
+            after = content[next_open + len(open_tag):next_open + len(open_tag) + 1]
+            if after in (' ', '>', '\n', '\t', '/'):
+                depth += 1
+            pos = next_open + len(open_tag)
+        else:
+            depth -= 1
+            pos = next_close + len(close_tag)
+            if depth == 0:
+                return content[start:pos]
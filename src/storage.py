@@ -0,0 +1,329 @@
+"""
+Модуль хранения собранных вакансий
+
+Два бэкенда с одинаковым интерфейсом:
+- VacancyJournal — журнал JSONL (одна строка — одна вакансия) с дозаписью в конец файла;
+- VacancyStore — база SQLite (WAL) с первичным ключом по ID вакансии и индексами.
+
+В обоих случаях сохранение очередной вакансии не требует перезаписи всего файла.
+Итоговый data_finally_*.json собирается отдельным шагом компактизации.
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from src.urls import extract_vacancy_id, vacancy_key
+
+
+def write_json_array(records: Iterable[Dict], output_file: str) -> int:
+    """
+    Атомарно записывает вакансии в JSON-массив (формат как у json.dump с indent=4),
+    не держа весь массив в памяти. Дубликаты по ID вакансии пропускаются.
+
+    Returns:
+        int: Количество записанных вакансий
+    """
+    tmp_file = output_file + '.tmp'
+    seen_keys = set()
+    written = 0
+
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in records:
+            key = vacancy_key(record.get('url', ''))
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+
+            body = json.dumps(record, indent=4, ensure_ascii=False)
+            f.write(',\n' if written else '\n')
+            f.write('\n'.join('    ' + line for line in body.split('\n')))
+            written += 1
+        f.write('\n]' if written else ']')
+
+    shutil.move(tmp_file, output_file)
+    return written
+
+
+class VacancyJournal:
+    """Журнал обработанных вакансий с дозаписью в конец файла"""
+
+    def __init__(self, journal_file: str, fsync_every: int = 50):
+        self.journal_file = journal_file
+        self.fsync_every = max(1, fsync_every)
+        # Ключи собранных вакансий: ID (int), а для ссылок без ID — URL
+        self.collected_keys: Set = set()
+        self._count = 0
+        self._pending = 0
+        self._file = None
+
+        self._replay()
+
+    def _replay(self):
+        """Перечитывает журнал и восстанавливает множество уже собранных вакансий"""
+        for record in self.iter_records():
+            self.collected_keys.add(vacancy_key(record.get('url', '')))
+            self._count += 1
+
+    def _open(self):
+        """Открывает журнал на дозапись"""
+        if self._file is None:
+            needs_newline = False
+            if os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > 0:
+                # Если прошлый запуск оборвался посреди строки — начинаем с новой строки
+                with open(self.journal_file, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b'\n'
+
+            self._file = open(self.journal_file, 'a', encoding='utf-8')
+            if needs_newline:
+                self._file.write('\n')
+
+    def __contains__(self, url: str) -> bool:
+        return vacancy_key(url) in self.collected_keys
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, record: Dict):
+        """Дописывает одну вакансию в журнал (fsync выполняется пачками)"""
+        self._open()
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.collected_keys.add(vacancy_key(record.get('url', '')))
+        self._count += 1
+        self._pending += 1
+
+        if self._pending >= self.fsync_every:
+            self.flush()
+
+    def flush(self):
+        """Сбрасывает буфер журнала на диск"""
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def close(self):
+        """Сбрасывает буфер и закрывает журнал"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Последовательно возвращает вакансии из журнала"""
+        if not os.path.exists(self.journal_file):
+            return
+
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Оборванная строка после аварийного завершения — пропускаем
+                    continue
+
+    def import_records(self, records: Iterable[Dict]):
+        """Переносит в журнал вакансии из старого data_finally_*.json"""
+        for record in records:
+            if record.get('url', '') not in self:
+                self.append(record)
+        self.flush()
+
+    def compact(self, output_file: str) -> int:
+        """
+        Собирает из журнала итоговый JSON-массив (формат как у json.dump с indent=4)
+
+        Args:
+            output_file: Путь к data_finally_*.json
+
+        Returns:
+            int: Количество вакансий в итоговом файле
+        """
+        self.flush()
+        return write_json_array(self.iter_records(), output_file)
+
+
+class VacancyStore:
+    """Хранилище вакансий в SQLite: первичный ключ по ID вакансии, пакетная вставка"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vacancies (
+            vacancy_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            specialization TEXT,
+            specializations TEXT,
+            city TEXT,
+            specialization_category TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_vacancies_url ON vacancies (url);
+        CREATE INDEX IF NOT EXISTS idx_vacancies_seq ON vacancies (seq);
+        CREATE INDEX IF NOT EXISTS idx_vacancies_specialization ON vacancies (specialization);
+        CREATE INDEX IF NOT EXISTS idx_vacancies_city ON vacancies (city);
+        CREATE INDEX IF NOT EXISTS idx_vacancies_category ON vacancies (specialization_category);
+    """
+
+    def __init__(self, db_file: str, batch_size: int = 50):
+        self.db_file = db_file
+        self.batch_size = max(1, batch_size)
+        self._buffer: List[tuple] = []
+        self._buffered_keys: Set = set()
+
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+        self._migrate()
+
+        row = self.conn.execute('SELECT COUNT(*), COALESCE(MAX(seq), 0) FROM vacancies').fetchone()
+        self._count, self._seq = row
+
+    def _migrate(self):
+        """Добавляет столбцы, которых нет в базах, созданных прежними версиями"""
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(vacancies)')}
+        if 'specializations' not in columns:
+            with self.conn:
+                self.conn.execute('ALTER TABLE vacancies ADD COLUMN specializations TEXT')
+
+    def __contains__(self, url: str) -> bool:
+        vacancy_id = extract_vacancy_id(url)
+        key = vacancy_id if vacancy_id is not None else url
+        if key in self._buffered_keys:
+            return True
+
+        if vacancy_id is not None:
+            row = self.conn.execute(
+                'SELECT 1 FROM vacancies WHERE vacancy_id = ?', (vacancy_id,)
+            ).fetchone()
+        else:
+            row = self.conn.execute(
+                'SELECT 1 FROM vacancies WHERE url = ?', (url,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, record: Dict):
+        """Добавляет вакансию в буфер; вставка в базу выполняется пачками"""
+        url = record.get('url', '')
+        if url in self:
+            return
+
+        vacancy_id = extract_vacancy_id(url)
+        self._seq += 1
+        self._buffer.append((
+            vacancy_id,
+            self._seq,
+            url,
+            record.get('specialization'),
+            # Все специализации — JSON-список
+            json.dumps(record['specializations'], ensure_ascii=False) if 'specializations' in record else None,
+            record.get('city'),
+            record.get('specialization_category'),
+            json.dumps(record, ensure_ascii=False),
+        ))
+        self._buffered_keys.add(vacancy_id if vacancy_id is not None else url)
+        self._count += 1
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Записывает накопленные вакансии одной транзакцией"""
+        if not self._buffer:
+            return
+
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO vacancies '
+                '(vacancy_id, seq, url, specialization, specializations, city, specialization_category, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                self._buffer
+            )
+        self._buffer = []
+        self._buffered_keys = set()
+
+    def close(self):
+        """Сбрасывает буфер и закрывает соединение"""
+        if self.conn is not None:
+            self.flush()
+            self.conn.close()
+            self.conn = None
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Последовательно возвращает вакансии в порядке добавления"""
+        self.flush()
+        cursor = self.conn.execute('SELECT data FROM vacancies ORDER BY seq')
+        for (data,) in cursor:
+            yield json.loads(data)
+
+    def import_records(self, records: Iterable[Dict]):
+        """Переносит в базу вакансии из старого data_finally_*.json"""
+        for record in records:
+            self.append(record)
+        self.flush()
+
+    def compact(self, output_file: str) -> int:
+        """
+        Собирает из базы итоговый JSON-массив (формат как у json.dump с indent=4)
+
+        Args:
+            output_file: Путь к data_finally_*.json
+
+        Returns:
+            int: Количество вакансий в итоговом файле
+        """
+        return write_json_array(self.iter_records(), output_file)
+
+
+def get_store_path(config, date_str: str) -> str:
+    """Возвращает путь к файлу хранилища вакансий за месяц согласно STORAGE_CONFIG['backend']"""
+    backend = config.STORAGE_CONFIG['backend']
+
+    if backend == 'sqlite':
+        return config.get_store_file(date_str)
+    if backend == 'journal':
+        return config.get_journal_file(date_str)
+
+    raise ValueError(f"Неизвестный бэкенд хранения: {backend}")
+
+
+def open_vacancy_store(config, date_str: str, path: Optional[str] = None):
+    """
+    Открывает хранилище вакансий за месяц согласно STORAGE_CONFIG['backend']
+
+    Args:
+        config: Конфигурация
+        date_str: Месяц в формате MM.YYYY
+        path: Другой путь к файлу хранилища (например, временный при пересборке)
+    """
+    storage_config = config.STORAGE_CONFIG
+    path = path or get_store_path(config, date_str)
+
+    if storage_config['backend'] == 'sqlite':
+        return VacancyStore(path, batch_size=storage_config['fsync_every'])
+    return VacancyJournal(path, fsync_every=storage_config['fsync_every'])
+
+
+def remove_store_files(path: str):
+    """Удаляет файл хранилища вместе со служебными файлами SQLite (-wal, -shm)"""
+    for file_path in (path, path + '-wal', path + '-shm'):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def replace_store_files(src_path: str, dst_path: str):
+    """Заменяет хранилище dst_path закрытым хранилищем src_path"""
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(dst_path + suffix):
+            os.remove(dst_path + suffix)
+    os.replace(src_path, dst_path)
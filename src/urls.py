@@ -0,0 +1,45 @@
+"""
+Модуль нормализации ссылок на вакансии rabota.by
+
+Одна и та же вакансия встречается в выдаче под разными URL: к ссылке
+добавляются служебные параметры (?hhtmFrom=vacancy_search_list, hhtmFromLabel=...).
+Поэтому вакансии сравниваются по числовому ID из пути /vacancy/<id>.
+"""
+
+import re
+from typing import Optional, Union
+from urllib.parse import urlsplit
+
+
+VACANCY_ID_RE = re.compile(r'/vacancy/(\d+)')
+DEFAULT_HOST = 'https://rabota.by'
+
+
+def extract_vacancy_id(url: str) -> Optional[int]:
+    """Извлекает числовой ID вакансии из URL (или None, если это не ссылка на вакансию)"""
+    match = VACANCY_ID_RE.search(url or '')
+    return int(match.group(1)) if match else None
+
+
+def canonical_vacancy_url(url: str) -> str:
+    """
+    Приводит ссылку на вакансию к каноническому виду без служебных параметров
+
+    'https://rabota.by/vacancy/129935107?hhtmFrom=vacancy_search_list'
+        -> 'https://rabota.by/vacancy/129935107'
+
+    Ссылки без ID вакансии возвращаются без изменений.
+    """
+    vacancy_id = extract_vacancy_id(url)
+    if vacancy_id is None:
+        return url
+
+    parts = urlsplit(url)
+    host = f'{parts.scheme}://{parts.netloc}' if parts.scheme and parts.netloc else DEFAULT_HOST
+    return f'{host}/vacancy/{vacancy_id}'
+
+
+def vacancy_key(url: str) -> Union[int, str]:
+    """Ключ для дедупликации: ID вакансии, а для ссылок без ID — сам URL"""
+    vacancy_id = extract_vacancy_id(url)
+    return vacancy_id if vacancy_id is not None else url
@@ -18,6 +18,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.parser import VacancyParser
 from src.processor import DataProcessor
+from src.link_registry import link_specializations
 from src.config import Config
 
 # Установка кодировки UTF-8 для Windows
@@ -257,7 +258,7 @@ def main():
             else:
                 print(f"[+] Этап 2-3: Парсинг и обработка ({len(new_links)} вакансий)...")
 
-                links_dict = {item['url']: item['specialization'] for item in links_data}
+                links_dict = {item['url']: link_specializations(item) for item in links_data}
 
                 for idx, link_info in enumerate(new_links, 1):
                     url = link_info['url']
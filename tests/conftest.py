@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_addoption(parser):
+    parser.addoption('--benchmark', action='store_true', default=False,
+                     help='Запустить замеры производительности (тесты с меткой benchmark)')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: замеры скорости и памяти, запускаются только с --benchmark')
+
+
+def pytest_collection_modifyitems(config, items):
+    # Замеры времени зависят от загрузки машины — в обычный запуск они не входят
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='замеры производительности запускаются с --benchmark')
+    for item in items:
+        if item.get_closest_marker('benchmark') is not None:
+            item.add_marker(skip)
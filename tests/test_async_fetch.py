@@ -0,0 +1,134 @@
+"""
+Параллельная загрузка: token bucket на виртуальном времени, ошибки по каждой ссылке, счетчики из потоков
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.async_fetch import HostRateLimiter, TokenBucket, fetch_concurrently
+from src.config import Config
+from src.parser import VacancyParser
+
+from tests.test_pipeline import OfflineParser
+from benchmarks.bench_parser import load_corpus
+
+
+class FakeClock:
+    """Виртуальное время: sleep не ждет, а сдвигает часы"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def _acquire_times(make_limiter, urls, concurrent=False):
+    """Время (виртуальное), когда каждый запрос получил токен"""
+    clock = FakeClock()
+
+    async def run():
+        limiter = make_limiter(clock)
+        times = []
+
+        async def one(url):
+            await limiter.acquire(url) if isinstance(limiter, HostRateLimiter) else await limiter.acquire()
+            times.append(clock.now)
+
+        if concurrent:
+            await asyncio.gather(*(one(url) for url in urls))
+        else:
+            for url in urls:
+                await one(url)
+        return times
+
+    return asyncio.run(run()), clock
+
+
+def test_token_bucket_burst_then_rate():
+    times, clock = _acquire_times(lambda clock: TokenBucket(2, 3, clock.monotonic, clock.sleep), [None] * 7)
+
+    # Первые capacity запросов — сразу, дальше по одному каждые 1 / rate секунды
+    assert times == pytest.approx([0, 0, 0, 0.5, 1.0, 1.5, 2.0])
+    assert all(seconds > 0 for seconds in clock.sleeps)
+
+
+def test_token_bucket_refill_is_capped():
+    clock = FakeClock()
+
+    async def run():
+        bucket = TokenBucket(8, 2, clock.monotonic, clock.sleep)
+        await bucket.acquire()
+        clock.now += 128
+        started = clock.now
+        for _ in range(4):
+            await bucket.acquire()
+        return clock.now - started
+
+    # За простой копится не больше capacity токенов
+    assert asyncio.run(run()) == pytest.approx(0.25)
+
+
+def test_token_bucket_concurrent_waiters():
+    times, _ = _acquire_times(lambda clock: TokenBucket(5, 1, clock.monotonic, clock.sleep), [None] * 10,
+                              concurrent=True)
+    assert times == pytest.approx([index / 5 for index in range(10)])
+
+
+def test_host_rate_limiter_per_host():
+    urls = ['https://rabota.by/vacancy/1', 'https://minsk.rabota.by/vacancy/2',
+            'https://rabota.by/vacancy/3', 'https://minsk.rabota.by/vacancy/4',
+            'https://rabota.by/vacancy/5']
+    times, _ = _acquire_times(lambda clock: HostRateLimiter(1, 2, clock.monotonic, clock.sleep), urls)
+
+    # У каждого хоста свой запас: ждать пришлось только пятому запросу (третьему к rabota.by)
+    assert times == pytest.approx([0, 0, 0, 0, 1])
+
+
+def test_fetch_concurrently_reports_errors_per_link():
+    corpus = load_corpus()['vacancy']
+    pages = {f'https://rabota.by/vacancy/{index}': content for index, content in enumerate(corpus.values())}
+    pages['https://rabota.by/vacancy/100'] = None
+    pages['https://rabota.by/vacancy/101'] = None
+
+    parser = OfflineParser(Config(), pages)
+    links = [{'url': url, 'specialization': 'Программист'} for url in pages]
+    results = list(fetch_concurrently(parser, links, concurrency=4, rate=1000, burst=1000))
+
+    assert sorted(link['url'] for link, _, _ in results) == sorted(pages)
+    errors = {link['url']: error for link, data, error in results if data is None}
+    assert errors == {'https://rabota.by/vacancy/100': 'ConnectionError',
+                      'https://rabota.by/vacancy/101': 'ConnectionError'}
+
+
+def test_parser_state_from_threads():
+    config = Config()
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'extraction_mode': 'state', 'extraction_cross_check_every': 0}
+    parser = VacancyParser(config, use_cache=False)
+    content = load_corpus()['vacancy']['multi_skill']
+    seen_errors = {}
+
+    def work(index):
+        parser.last_error = f'Ошибка {index}'
+        for _ in range(25):
+            parser.parse_vacancy_html(content, 'https://rabota.by/vacancy/1')
+        seen_errors[index] = parser.last_error
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # last_error у каждого потока свой
+    assert seen_errors == {index: f'Ошибка {index}' for index in range(8)}
+    assert parser.last_error is None
+    assert parser.extraction_stats['state'] == 8 * 25
@@ -0,0 +1,26 @@
+"""
+Пороги производительности разбора на корпусе tests/fixtures (benchmarks/thresholds.json)
+
+Запускаются только с флагом: python -m pytest tests --benchmark
+"""
+
+import pytest
+
+from benchmarks.bench_parser import check_thresholds, load_thresholds, run_benchmarks
+
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_no_performance_regressions():
+    thresholds = load_thresholds()
+    results = run_benchmarks()
+    regressions = check_thresholds(results, thresholds)
+
+    if regressions:
+        # Единичный медленный замер (другие процессы на машине) перемеряется один раз
+        failed = [name for name in thresholds if any(line.startswith(f'{name}:') for line in regressions)]
+        results.update(run_benchmarks(names=failed))
+        regressions = check_thresholds(results, thresholds)
+
+    assert not regressions, '\n'.join(regressions)
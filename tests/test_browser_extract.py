@@ -0,0 +1,65 @@
+"""
+Извлечение полей в браузере: селекторы для страницы, значения по умолчанию, статистика, сверка
+
+EXTRACT_JS выполняется в Chrome; здесь проверяется все, что вокруг него, с драйвером-заглушкой.
+"""
+
+from src.browser_extract import FIELD_DEFAULTS, compare_fields, css_selectors, extract_fields
+from src.config import Config
+from src.selector_registry import SelectorRegistry
+
+
+class FakeDriver:
+    """Отвечает на execute_script заранее заданным результатом EXTRACT_JS"""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.result
+
+
+def _selectors():
+    return SelectorRegistry.from_config(Config()).current
+
+
+def test_css_selectors():
+    css = css_selectors(_selectors().field_selectors)
+    assert css['title'] == ['h1']
+    assert css['salary_raw'] == ['[data-qa="vacancy-salary"]', '[data-qa="vacancy-salary-compensation-type-net"]']
+    assert css['company'] == ['span.vacancy-company-name']
+    assert set(css) == set(FIELD_DEFAULTS)
+
+
+def test_extract_fields_defaults_and_stats():
+    selectors = _selectors()
+    driver = FakeDriver({
+        'values': {'title': 'Программист Python', 'description': 'Описание', 'skills': None},
+        'matched': {'title': 0, 'description': 1},
+    })
+
+    fields = extract_fields(driver, selectors)
+    extract_fields(driver, selectors)
+
+    assert fields == {**FIELD_DEFAULTS, 'title': 'Программист Python', 'description': 'Описание'}
+    # CSS селекторы строятся один раз на версию файла селекторов
+    assert driver.calls[0][0] is driver.calls[1][0]
+
+    stats = selectors.stats
+    assert stats.pages == 2
+    assert stats.hits['title'] == [2]
+    assert stats.hits['description'] == [0, 2]
+    assert stats.defaults['skills'] == 2
+
+
+def test_extract_fields_empty_result():
+    # Скрипт вернул null (страница закрылась во время выполнения) — все поля по умолчанию
+    assert extract_fields(FakeDriver(None), _selectors()) == FIELD_DEFAULTS
+
+
+def test_compare_fields():
+    soup_fields = {**FIELD_DEFAULTS, 'title': 'Программист', 'url': 'https://rabota.by/vacancy/1'}
+    assert compare_fields(dict(soup_fields), soup_fields) == []
+    assert compare_fields({**soup_fields, 'title': 'Тестировщик', 'skills': 'SQL'}, soup_fields) == ['title', 'skills']
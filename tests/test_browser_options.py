@@ -0,0 +1,107 @@
+"""
+Блокировка ресурсов: шаблоны адресов и закрытие Chrome при неудачной настройке
+"""
+
+import pytest
+
+from src import parser as parser_module
+from src.browser_options import blocked_url_patterns, url_matches
+from src.config import Config
+from src.parser import VacancyParser
+
+
+# Адреса, которые широкие шаблоны задевали по ошибке: страницы сайта с именем трекера
+# или расширения в адресе и скрипты сайта
+PROBE_URLS = [
+    'https://rabota.by/vacancy/129935107',
+    'https://rabota.by/search/vacancy?text=google-analytics.com',
+    'https://i.hh.ru/scripts/main.js',
+    'https://i.hh.ru/scripts/icons.js',
+    'https://i.rabotaby.by/static/vacancy.icon-set.css',
+    'https://i.rabotaby.by/static/bloko.6940f675.css',
+    'https://rabota.by/article/png-to-jpg',
+]
+
+
+def _blocked(url):
+    return any(url_matches(url, pattern) for pattern in blocked_url_patterns(Config()))
+
+
+@pytest.mark.parametrize('url', [
+    'https://i.rabotaby.by/favicon.ico',
+    'https://img.rabota.by/logo/123.png?v=2',
+    'https://i.rabotaby.by/static/fonts/inter.woff2',
+    'https://www.google-analytics.com/collect?v=1',
+    'https://mc.yandex.ru/metrika/tag.js',
+    'https://vk.com/rtrg?p=VK-RTRG-1',
+])
+def test_blocked(url):
+    assert _blocked(url)
+
+
+@pytest.mark.parametrize('url', PROBE_URLS)
+def test_not_blocked(url):
+    assert not _blocked(url)
+
+
+def test_default_patterns_have_no_conflicts(capsys):
+    config = Config()
+    assert blocked_url_patterns(config) == config.RESOURCE_BLOCKING_CONFIG['blocked_urls']
+    assert capsys.readouterr().out == ''
+
+
+def test_url_matches_only_star_is_wildcard():
+    assert url_matches('https://a.by/x.png?v=1', '*.png?*')
+    assert not url_matches('https://a.by/x.pngv=1', '*.png?*')
+    assert not url_matches('https://a.by/x_png', '*.png')
+
+
+def test_conflicting_pattern_is_skipped(capsys):
+    config = Config()
+    config.RESOURCE_BLOCKING_CONFIG = {**config.RESOURCE_BLOCKING_CONFIG, 'blocked_urls': ['*.png', '*rabota.by*']}
+
+    assert blocked_url_patterns(config) == ['*.png']
+    assert 'Шаблон блокировки *rabota.by* пропущен' in capsys.readouterr().out
+
+
+def test_search_links_are_protected(tmp_path, capsys):
+    (tmp_path / 'links.txt').write_text('# комментарий\nhttps://rabota.by/search/vacancy?text=png&area=1002\n',
+                                        encoding='utf-8')
+    config = Config()
+    config.LINKS_FILE = str(tmp_path / 'links.txt')
+    config.RESOURCE_BLOCKING_CONFIG = {**config.RESOURCE_BLOCKING_CONFIG,
+                                       'blocked_urls': ['*text=png*', '*.png'], 'allowed_urls': []}
+
+    # Шаблон задевает ссылку на поиск из LINKS_FILE
+    assert blocked_url_patterns(config) == ['*.png']
+    assert 'под него попадает https://rabota.by/search/vacancy?text=png&area=1002' in capsys.readouterr().out
+
+
+class FakeChrome:
+    """Chrome, у которого CDP-команда падает в первых запусках"""
+
+    started = []
+
+    def __init__(self, options=None, **kwargs):
+        self.quit_called = False
+        FakeChrome.started.append(self)
+
+    def execute_cdp_cmd(self, command, params):
+        if len(FakeChrome.started) < 3:
+            raise RuntimeError('CDP недоступен')
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_driver_quit_when_setup_fails(monkeypatch):
+    FakeChrome.started = []
+    monkeypatch.setattr(parser_module.uc, 'Chrome', FakeChrome)
+    monkeypatch.setattr(parser_module.time, 'sleep', lambda seconds: None)
+
+    parser = VacancyParser(Config(), use_cache=False)
+    parser._init_driver()
+
+    # Браузеры неудачных попыток закрыты, остался только последний
+    assert [chrome.quit_called for chrome in FakeChrome.started] == [True, True, False]
+    assert parser.driver is FakeChrome.started[-1]
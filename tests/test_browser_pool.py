@@ -0,0 +1,117 @@
+"""
+Пул браузеров: страницы из кэша HTML не уходят в процессы, падение процесса — WorkerCrashed
+
+Вместо Chrome процессы запускают fake_worker с тем же протоколом сообщений.
+"""
+
+import os
+
+from src.browser_pool import BrowserPool
+from src.config import Config
+from src.parser import VacancyParser
+
+from benchmarks.bench_parser import load_corpus
+
+
+CRASH_URL = 'https://rabota.by/vacancy/3'
+
+
+def fake_worker(worker_id, config, profile_dir, tasks, results, stop):
+    """Процесс без браузера: отвечает заглушкой, на CRASH_URL падает, не отправив результат"""
+    while not stop.is_set():
+        link_info = tasks.get()
+        if link_info is None:
+            break
+        if link_info['url'] == CRASH_URL:
+            # Уже отправленные результаты дописываются в очередь до падения
+            results.close()
+            results.join_thread()
+            os._exit(1)
+        data = {'url': link_info['url'], 'worker_id': worker_id}
+        results.put(('result', worker_id, (link_info, data, None), f'<html>{link_info["url"]}</html>'))
+    results.put(('exit', worker_id, 2))
+
+
+def dying_worker(worker_id, config, profile_dir, tasks, results, stop):
+    """Процесс, который падает при запуске, не взяв ни одной задачи (например, неверный selectors.json)"""
+    os._exit(1)
+
+
+class FakePool(BrowserPool):
+    worker_target = staticmethod(fake_worker)
+
+
+class DyingPool(BrowserPool):
+    worker_target = staticmethod(dying_worker)
+
+
+def _config(tmp_path):
+    config = Config()
+    config.DATA_DIR = str(tmp_path)
+    return config
+
+
+def _links(*ids):
+    return [{'url': f'https://rabota.by/vacancy/{vacancy_id}', 'specialization': 'Программист'}
+            for vacancy_id in ids]
+
+
+def test_crashed_worker(tmp_path):
+    pool = FakePool(_config(tmp_path), workers=1)
+    results = {link['url']: (data, error) for link, data, error in pool.run(_links(1, 2, 3, 4, 5))}
+
+    # Ссылка, на которой упал процесс, отдается как неудачная; перезапущенный процесс дорабатывает остальные
+    assert results.pop(CRASH_URL) == (None, 'WorkerCrashed')
+    assert sorted(results) == [link['url'] for link in _links(1, 2, 4, 5)]
+    assert all(error is None for _, error in results.values())
+    assert pool.process_restarts == 1
+    assert pool.driver_restarts == 2
+
+
+def test_workers_dying_at_startup(tmp_path):
+    config = _config(tmp_path)
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'browser_worker_max_restarts': 2}
+    pool = DyingPool(config, workers=2)
+
+    results = list(pool.run(_links(1, 2, 3)))
+
+    # Исчерпав лимит перезапусков, пул останавливается и отдает все ссылки как неудачные
+    assert [(link['url'], data, error) for link, data, error in results] == [
+        (link['url'], None, 'WorkerCrashed') for link in _links(1, 2, 3)
+    ]
+    assert pool.process_restarts == 4
+    assert pool.processes == {}
+
+
+def test_cached_pages_are_parsed_in_main_process(tmp_path):
+    config = _config(tmp_path)
+    parser = VacancyParser(config)
+    content = load_corpus()['vacancy']['multi_skill']
+    parser.html_cache.put(1, content)
+    parser.html_cache.put(2, content)
+
+    pool = FakePool(config, workers=2)
+    results = {link['url']: data for link, data, error in pool.run(_links(1, 2, 4, 5), parser=parser)}
+
+    assert pool.cache_hits == 2
+    assert parser.html_cache.hits == 2
+    # Страницы из кэша разобраны парсером главного процесса, остальные — процессами
+    for url in ('https://rabota.by/vacancy/1', 'https://rabota.by/vacancy/2'):
+        assert 'worker_id' not in results[url] and results[url]['title']
+    for url in ('https://rabota.by/vacancy/4', 'https://rabota.by/vacancy/5'):
+        assert results[url]['worker_id'] in (0, 1)
+
+    # Загруженные процессами страницы сохраняются в кэш главного процесса
+    assert parser.html_cache.get(4) == '<html>https://rabota.by/vacancy/4</html>'
+
+
+def test_all_pages_cached(tmp_path):
+    config = _config(tmp_path)
+    parser = VacancyParser(config)
+    parser.html_cache.put(1, load_corpus()['vacancy']['multi_skill'])
+
+    pool = FakePool(config, workers=2)
+    results = list(pool.run(_links(1), parser=parser))
+
+    assert [(link['url'], error) for link, _, error in results] == [('https://rabota.by/vacancy/1', None)]
+    assert pool.processes == {}
@@ -0,0 +1,67 @@
+"""
+Колоночная выгрузка: типы колонок, пропуски, словари и повторная выгрузка
+"""
+
+import json
+
+import numpy as np
+
+from src.columnar import COLUMNS, INT_NULL, decode_column, export_columns, load_column, load_schema
+
+
+VACANCIES = [
+    {'url': 'https://rabota.by/vacancy/129935107', 'salary_min': 2500, 'salary_max': 3000, 'salary_avg': 2750,
+     'has_salary': True, 'remote_work': False, 'monitoring_date': '05.01.2026', 'city': 'Минск',
+     'specialization': 'Программист', 'currency': 'BYN', 'skills_count': 3, 'description_length': 1200},
+    {'url': 'https://rabota.by/vacancy/2?hhtmFrom=vacancy_search_list', 'salary_min': None, 'salary_max': None,
+     'has_salary': False, 'remote_work': True, 'monitoring_date': 'не дата', 'city': 'Гомель',
+     'specialization': 'Аналитик', 'currency': 'Не указано'},
+    {'url': 'https://rabota.by/employer/1', 'city': 'Минск', 'specialization': '', 'monitoring_date': None},
+]
+
+
+def _export(tmp_path):
+    data_file = tmp_path / 'data_finally_01.2026_Rabota_by.json'
+    data_file.write_text(json.dumps(VACANCIES, indent=4, ensure_ascii=False), encoding='utf-8')
+    output_dir = str(tmp_path / 'columns')
+    return export_columns(str(data_file), output_dir), output_dir
+
+
+def test_export_columns(tmp_path):
+    rows, output_dir = _export(tmp_path)
+    assert rows == 3
+
+    schema = load_schema(output_dir)
+    assert schema['rows'] == 3
+    assert set(schema['columns']) == set(COLUMNS)
+
+    for name, (_, dtype) in COLUMNS.items():
+        column = load_column(output_dir, name)
+        assert column.dtype == np.dtype(dtype)
+        assert len(column) == 3
+
+    assert load_column(output_dir, 'vacancy_id').tolist() == [129935107, 2, INT_NULL]
+    assert load_column(output_dir, 'salary_min').tolist() == [2500, INT_NULL, INT_NULL]
+    assert load_column(output_dir, 'skills_count').tolist() == [3, INT_NULL, INT_NULL]
+    assert load_column(output_dir, 'has_salary').tolist() == [True, False, False]
+    assert load_column(output_dir, 'remote_work').tolist() == [False, True, False]
+
+    dates = load_column(output_dir, 'monitoring_date', mmap=False)
+    assert dates[0] == np.datetime64('2026-01-05')
+    assert np.isnat(dates[1:]).all()
+
+    # Словари в порядке первого появления, пустое значение — 'Не указано'
+    assert schema['columns']['city']['dictionary'] == ['Минск', 'Гомель']
+    assert load_column(output_dir, 'city').tolist() == [0, 1, 0]
+    assert decode_column(output_dir, 'specialization').tolist() == ['Программист', 'Аналитик', 'Не указано']
+    assert decode_column(output_dir, 'company').tolist() == ['Не указано'] * 3
+
+
+def test_export_replaces_previous_output(tmp_path):
+    _, output_dir = _export(tmp_path)
+    (tmp_path / 'columns' / 'stale.npy').write_bytes(b'')
+
+    _export(tmp_path)
+    assert not (tmp_path / 'columns' / 'stale.npy').exists()
+    assert not (tmp_path / 'columns.tmp').exists()
+    assert load_schema(output_dir)['rows'] == 3
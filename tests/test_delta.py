@@ -0,0 +1,78 @@
+"""
+Дельта между месяцами: новые, измененные и исчезнувшие вакансии
+"""
+
+import json
+
+from src.config import Config
+from src.delta import build_index, merge_indexes, month_delta
+
+
+def _vacancy(vacancy_id, title='Программист', salary_raw='от 2 500 Br', **fields):
+    return {'title': title, 'salary_raw': salary_raw, 'company': 'ООО Ромашка', 'description': 'Описание',
+            'url': f'https://rabota.by/vacancy/{vacancy_id}', 'city': 'Минск', **fields}
+
+
+def _write_month(config, date_str, vacancies):
+    with open(config.get_output_file(date_str), 'w', encoding='utf-8') as f:
+        json.dump(vacancies, f, indent=4, ensure_ascii=False)
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_merge_indexes():
+    old_index = [(1, 'a', 'u1'), (3, 'c', 'u3'), (5, 'e', 'u5'), (9, 'i', 'u9')]
+    new_index = [(2, 'b', 'u2'), (3, 'c', 'u3'), (5, 'E', 'u5'), (10, 'j', 'u10'), (11, 'k', 'u11')]
+
+    assert merge_indexes(old_index, new_index) == {
+        'new': [(2, 'u2'), (10, 'u10'), (11, 'u11')],
+        'updated': [(5, 'u5')],
+        'closed': [(1, 'u1'), (9, 'u9')],
+    }
+    assert merge_indexes([], new_index)['new'] == [(vacancy_id, url) for vacancy_id, _, url in new_index]
+    assert merge_indexes(old_index, [])['closed'] == [(vacancy_id, url) for vacancy_id, _, url in old_index]
+
+
+def test_build_index_sorted_and_deduplicated(tmp_path):
+    config = Config()
+    config.DATA_DIR = str(tmp_path)
+    _write_month(config, '01.2026', [
+        _vacancy(30), _vacancy(10, url='https://rabota.by/vacancy/10?hhtmFrom=vacancy_search_list'),
+        _vacancy(10, title='Дубликат'), {'title': 'Без ID', 'url': 'https://rabota.by/employer/1'},
+    ])
+
+    index = build_index(config.get_output_file('01.2026'))
+    assert [(vacancy_id, url) for vacancy_id, _, url in index] == [
+        (10, 'https://rabota.by/vacancy/10?hhtmFrom=vacancy_search_list'), (30, 'https://rabota.by/vacancy/30'),
+    ]
+
+
+def test_month_delta(tmp_path):
+    config = Config()
+    config.DATA_DIR = str(tmp_path)
+
+    _write_month(config, '01.2026', [_vacancy(1), _vacancy(2), _vacancy(3), _vacancy(4)])
+    _write_month(config, '02.2026', [
+        _vacancy(5),
+        _vacancy(2, salary_raw='от 3 000 Br'),  # Изменилась зарплата
+        _vacancy(3, city='Гомель'),  # Поле вне отпечатка — изменением не считается
+        _vacancy(6, title='Аналитик'),
+        _vacancy(4, title='Ведущий программист'),
+        _vacancy(6, title='Дубликат'),
+    ])
+
+    summary = month_delta(config, '01.2026', '02.2026')
+    assert summary == {'new': 2, 'updated': 2, 'closed': 1}
+
+    prefix = config.get_data_file('delta_01.2026_to_02.2026_Rabota_by')
+    # Полные записи из новой выгрузки в ее порядке, при повторах ID — первая
+    assert _read(f'{prefix}_new.json') == [_vacancy(5), _vacancy(6, title='Аналитик')]
+    assert _read(f'{prefix}_updated.json') == [_vacancy(2, salary_raw='от 3 000 Br'),
+                                               _vacancy(4, title='Ведущий программист')]
+    assert _read(f'{prefix}_closed.json') == [{'vacancy_id': 1, 'url': 'https://rabota.by/vacancy/1'}]
+    assert _read(f'{prefix}_summary.json') == {
+        'old_file': config.get_output_file('01.2026'), 'new_file': config.get_output_file('02.2026'), **summary,
+    }
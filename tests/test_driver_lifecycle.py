@@ -0,0 +1,140 @@
+"""
+Перезапуск браузера: по числу страниц, памяти и ошибкам подряд, перенос cookies
+"""
+
+import pytest
+
+from src import driver_lifecycle as lifecycle_module
+from src.driver_lifecycle import REASON_FAILURES, REASON_MEMORY, REASON_PAGES, DriverLifecycle
+from src.fetchers import BASE_URL
+
+
+COOKIES = [{'name': 'hhtoken', 'value': 'abc'}, {'name': 'hhuid', 'value': '42'}]
+
+
+class FakeDriver:
+    def __init__(self, cookies=None, broken=False):
+        self.cookies = list(cookies or [])
+        self.broken = broken
+        self.urls = []
+        self.quit_called = False
+
+    def get_cookies(self):
+        if self.broken:
+            raise RuntimeError('браузер не отвечает')
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def quit(self):
+        self.quit_called = True
+        if self.broken:
+            raise RuntimeError('браузер не отвечает')
+
+
+class FakeParser:
+    """Парсер, который вместо Chrome создает FakeDriver"""
+
+    def __init__(self):
+        self.driver = None
+        self.drivers = []
+
+    def _init_driver(self):
+        self.driver = FakeDriver()
+        self.drivers.append(self.driver)
+
+
+def _lifecycle(max_pages=0, max_rss_mb=0, max_failures=0, rss_check_every=1):
+    parser = FakeParser()
+    lifecycle = DriverLifecycle(parser, max_pages=max_pages, max_rss_mb=max_rss_mb,
+                                max_failures=max_failures, rss_check_every=rss_check_every)
+    lifecycle.before_fetch()
+    return parser, lifecycle
+
+
+def _fetch(lifecycle, ok=True):
+    lifecycle.before_fetch()
+    lifecycle.record(ok)
+
+
+def test_first_fetch_starts_browser():
+    parser, lifecycle = _lifecycle(max_pages=2)
+    assert len(parser.drivers) == 1
+    assert (lifecycle.pages, lifecycle.total_restarts) == (0, 0)
+
+
+def test_restart_by_pages_keeps_cookies():
+    parser, lifecycle = _lifecycle(max_pages=3)
+    parser.driver.cookies = list(COOKIES)
+
+    for _ in range(3):
+        _fetch(lifecycle)
+    assert len(parser.drivers) == 1
+
+    # Четвертая страница — уже в новом браузере с cookies старого
+    _fetch(lifecycle)
+    old, new = parser.drivers
+    assert old.quit_called
+    assert new.urls == [BASE_URL]
+    assert new.cookies == COOKIES
+    assert lifecycle.restarts[REASON_PAGES] == 1
+    assert lifecycle.pages == 1
+
+
+def test_restart_after_failures_in_row():
+    parser, lifecycle = _lifecycle(max_failures=2)
+
+    # Успешная загрузка сбрасывает счетчик ошибок
+    for ok in (False, True, False):
+        _fetch(lifecycle, ok)
+    assert (len(parser.drivers), lifecycle.failures) == (1, 1)
+
+    _fetch(lifecycle, ok=False)
+    lifecycle.before_fetch()
+    assert len(parser.drivers) == 2
+    assert lifecycle.restarts[REASON_FAILURES] == 1
+    assert lifecycle.failures == 0
+
+
+@pytest.mark.parametrize('rss_mb, restarted', [(400.0, False), (600.0, True)])
+def test_restart_by_memory(monkeypatch, rss_mb, restarted):
+    checks = []
+    monkeypatch.setattr(lifecycle_module, 'browser_rss_mb', lambda driver: checks.append(driver) or rss_mb)
+    parser, lifecycle = _lifecycle(max_rss_mb=500, rss_check_every=3)
+
+    for _ in range(3):
+        _fetch(lifecycle)
+    # Память проверяется только каждые rss_check_every страниц
+    assert checks == []
+
+    lifecycle.before_fetch()
+    assert len(checks) == 1
+    assert lifecycle.restarts[REASON_MEMORY] == int(restarted)
+    assert len(parser.drivers) == 1 + int(restarted)
+
+
+def test_memory_check_disabled(monkeypatch):
+    monkeypatch.setattr(lifecycle_module, 'browser_rss_mb', lambda driver: 10000.0)
+    parser, lifecycle = _lifecycle(max_rss_mb=500, rss_check_every=0)
+
+    # 0 — память не проверяется, как и у остальных порогов
+    for _ in range(5):
+        _fetch(lifecycle)
+    assert len(parser.drivers) == 1
+
+
+def test_restart_unresponsive_browser(capsys):
+    parser, lifecycle = _lifecycle()
+    parser.driver.broken = True
+
+    lifecycle.restart(REASON_FAILURES)
+
+    # Cookies не получить — новый браузер начинает с чистой сессии
+    new = parser.drivers[-1]
+    assert (new.cookies, new.urls) == ([], [])
+    assert parser.driver is new
+    assert 'Предупреждение при закрытии драйвера' in capsys.readouterr().out
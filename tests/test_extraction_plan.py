@@ -0,0 +1,106 @@
+"""
+План извлечения: один обход дерева дает те же поля, что отдельные soup.find по каждому селектору
+"""
+
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.extraction_plan import MULTI_FIELDS, SOUP_VALUES, ExtractionPlan, find_elements, resolve_fields
+
+
+FIELD_SELECTORS = {
+    'title': [('h1', None, None)],
+    'salary_raw': [(None, 'data-qa', 'vacancy-salary'), (None, 'data-qa', 'vacancy-salary-compensation-type-net')],
+    'experience': [('span', 'data-qa', 'vacancy-experience')],
+    'work_schedule': [('div', 'class', 'schedule')],
+    'work_format': [('p', 'data-qa', 'work-formats-text')],
+    'company': [('span', 'class', 'vacancy-company-name'), ('a', 'data-qa', 'vacancy-company-name')],
+    'address': [('span', 'data-qa', 'vacancy-view-raw-address')],
+    'description': [('div', 'class', 'tmpl_hh_wrapper'), ('div', 'class', 'g-user-content')],
+    'skills': [('li', 'data-qa', 'skills-element')],
+}
+
+PAGE = """
+<html><body>
+<div class="header"><span class="vacancy-company-name other">Шапка</span></div>
+<h1> Программист Python </h1>
+<div data-qa="vacancy-salary">   </div>
+<span data-qa="vacancy-salary-compensation-type-net">от <b>2 500</b> Br</span>
+<div data-qa="vacancy-experience">не тот тег</div>
+<span data-qa="vacancy-experience">1–3 года</span>
+<p data-qa="work-formats-text">удаленно<br/>гибрид</p>
+<p class="schedule">не тот тег</p>
+<div class="g-user-content">Запасное описание</div>
+<ul>
+<li data-qa="skills-element"><div>Python</div></li>
+<li data-qa="skills-element"><div>SQL</div></li>
+</ul>
+</body></html>
+"""
+
+
+def _separate_finds(soup, field_selectors):
+    """Поля так, как их находят _extract_*: по селектору за раз"""
+    found = {
+        field: [find_elements(soup, selector, field in MULTI_FIELDS) for selector in selectors]
+        for field, selectors in field_selectors.items()
+    }
+    return resolve_fields(found, SOUP_VALUES)
+
+
+def test_plan_fields():
+    soup = BeautifulSoup(PAGE, 'lxml')
+    trace = {}
+    fields = ExtractionPlan(FIELD_SELECTORS).extract(soup, trace)
+
+    assert fields == {
+        'title': 'Программист Python',
+        # Первый селектор нашел пустой блок — берется второй
+        'salary_raw': 'от 2 500 Br',
+        'experience': '1–3 года',
+        'work_schedule': 'Не указано',
+        'work_format': 'удаленно, гибрид',
+        'company': 'Шапка',
+        'address': 'Не указано',
+        'description': 'Запасное описание',
+        'skills': 'Python; SQL',
+    }
+    assert {field: matched for field, (matched, _) in trace.items()} == {
+        'title': 0, 'salary_raw': 1, 'experience': 0, 'work_schedule': None, 'work_format': 0,
+        'company': 0, 'address': None, 'description': 1, 'skills': 0,
+    }
+    assert fields == _separate_finds(soup, FIELD_SELECTORS)
+
+
+def test_shared_selector_is_indexed_once():
+    field_selectors = {**FIELD_SELECTORS, 'title': [('span', 'class', 'vacancy-company-name'), ('h1', None, None)]}
+    plan = ExtractionPlan(field_selectors)
+
+    assert plan.selectors.count(('span', 'class', 'vacancy-company-name')) == 1
+    assert plan.field_indexes['title'][0] == plan.field_indexes['company'][0]
+
+    soup = BeautifulSoup(PAGE, 'lxml')
+    assert plan.extract(soup) == _separate_finds(soup, field_selectors)
+
+
+def _random_page(rng):
+    """Случайный набор элементов из селекторов полей, в т.ч. с чужими тегами и пустым текстом"""
+    pieces = []
+    for _ in range(rng.randint(0, 25)):
+        tag = rng.choice(['div', 'span', 'p', 'li', 'h1', 'a'])
+        attr = rng.choice(['', ' data-qa="vacancy-salary"', ' data-qa="vacancy-experience"',
+                           ' data-qa="skills-element"', ' class="tmpl_hh_wrapper x"', ' class="g-user-content"',
+                           ' class="vacancy-company-name"', ' data-qa="vacancy-company-name"', ' class="schedule"'])
+        text = rng.choice(['', ' ', 'текст', '<div>навык</div>', '<b>2 000</b> $'])
+        pieces.append(f'<{tag}{attr}>{text}</{tag}>')
+    return f'<html><body>{"".join(pieces)}</body></html>'
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_plan_matches_separate_finds(seed):
+    rng = random.Random(seed)
+    for _ in range(10):
+        soup = BeautifulSoup(_random_page(rng), 'lxml')
+        assert ExtractionPlan(FIELD_SELECTORS).extract(soup) == _separate_finds(soup, FIELD_SELECTORS)
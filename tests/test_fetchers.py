@@ -0,0 +1,237 @@
+"""
+Загрузчики страниц: разбор HTTP-ответов, ожидание маркеров в браузере, конечные страницы, переход на браузер
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from src.config import Config
+from src.fetchers import (
+    SERP_MARKERS, VACANCY_MARKERS, BrowserFetcher, ChallengeError, FallbackFetcher, FetchError, HttpFetcher,
+    PageGoneError,
+)
+from src.pacing import AdaptivePacer
+
+from benchmarks.bench_parser import load_corpus
+
+
+CORPUS = load_corpus()
+URL = 'https://rabota.by/vacancy/1'
+SERP_URL = 'https://rabota.by/search/vacancy?professional_role=96'
+
+
+class FakeResponse:
+    def __init__(self, text, status_code=200, url=URL):
+        self.text = text
+        self.status_code = status_code
+        self.url = url
+
+
+class FakeSession:
+    """Сессия requests, которая возвращает заранее заданный ответ"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, timeout=None):
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.urls = []
+
+    def fetch(self, url, markers, delay=None):
+        self.urls.append(url)
+        return 'из браузера'
+
+
+def _http(response):
+    fetcher = HttpFetcher(timeout=1)
+    fetcher.session = FakeSession(response)
+    return fetcher
+
+
+def _fallback(response):
+    fetcher = FallbackFetcher(_http(response), FakeBrowser())
+    fetcher._session_loaded = True
+    fetcher._load_session = lambda: None
+    return fetcher
+
+
+def test_vacancy_page():
+    content = CORPUS['vacancy']['multi_skill']
+    fetcher = _http(FakeResponse(content))
+    assert fetcher.fetch(URL, VACANCY_MARKERS) == content
+    assert fetcher.pages == 1
+
+
+def test_serp_without_results_is_valid():
+    content = CORPUS['serp']['no_results']
+    fetcher = _fallback(FakeResponse(content, url=SERP_URL))
+
+    assert fetcher.fetch(SERP_URL, SERP_MARKERS) == content
+    assert fetcher.browser.urls == []
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse('<html><body><div data-qa="vacancy-removed">Вакансия удалена</div></body></html>'),
+    FakeResponse('<html><body>Страница не найдена</body></html>', status_code=404),
+    FakeResponse('<html><body>Вакансия в архиве</body></html>', status_code=410),
+])
+def test_gone_vacancy_without_fallback(response):
+    fetcher = _fallback(response)
+    with pytest.raises(PageGoneError):
+        fetcher.fetch(URL, VACANCY_MARKERS)
+    assert fetcher.browser.urls == []
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse('<html>Доступ ограничен</html>', status_code=403),
+    FakeResponse('<html>Слишком много запросов</html>', status_code=429),
+    FakeResponse('<html><script src="/ddos-guard/check.js"></script></html>'),
+    FakeResponse('<html>Подтвердите, что вы не робот</html>', url='https://rabota.by/account/captcha?backurl=%2F'),
+])
+def test_challenge(response):
+    with pytest.raises(ChallengeError):
+        _http(response).fetch(URL, VACANCY_MARKERS)
+
+    fetcher = _fallback(response)
+    assert fetcher.fetch(URL, VACANCY_MARKERS) == 'из браузера'
+    assert (fetcher.browser.urls, fetcher.fallbacks) == ([URL], 1)
+
+
+def test_challenge_words_on_a_ready_page_are_ignored():
+    # Слово captcha в скриптах обычной страницы — не проверка на бота
+    content = CORPUS['vacancy']['title_only'].replace('</body>', '<script>loadCaptchaWidget()</script></body>')
+    assert _http(FakeResponse(content)).fetch(URL, VACANCY_MARKERS) == content
+
+
+@pytest.mark.parametrize('response', [
+    FakeResponse('<html><body>Идут технические работы</body></html>', status_code=503),
+    FakeResponse(CORPUS['vacancy']['multi_skill'], status_code=500),
+    FakeResponse('<html><body><div id="root"></div></body></html>'),
+    requests.ConnectionError('connection reset'),
+])
+def test_other_errors_are_not_challenges(response):
+    with pytest.raises(FetchError) as error:
+        _http(response).fetch(URL, VACANCY_MARKERS)
+    assert not isinstance(error.value, (ChallengeError, PageGoneError))
+
+    fetcher = _fallback(response)
+    assert fetcher.fetch(URL, VACANCY_MARKERS) == 'из браузера'
+
+
+def test_every_http_request_is_paced(monkeypatch):
+    waits = []
+    pacer = AdaptivePacer(0.5, min_delay=0.5, max_delay=0.5)
+    monkeypatch.setattr(pacer, 'wait', lambda min_delay=None: waits.append(min_delay))
+    fetcher = HttpFetcher(timeout=1, pacer=pacer)
+    fetcher.session = FakeSession(FakeResponse(CORPUS['vacancy']['multi_skill']))
+
+    # Задержка выдерживается и без delay у вызывающего кода
+    fetcher.fetch(URL, VACANCY_MARKERS)
+    fetcher.fetch(URL, VACANCY_MARKERS, delay=2.0)
+    assert waits == [None, 2.0]
+
+
+@pytest.mark.parametrize('response, slowdowns', [
+    (FakeResponse(CORPUS['vacancy']['multi_skill']), 0),
+    (FakeResponse('<html><body>Вакансия в архиве</body></html>', status_code=410), 0),
+    (FakeResponse('<html>Слишком много запросов</html>', status_code=429), 1),
+    (FakeResponse('<html><script src="/ddos-guard/check.js"></script></html>'), 1),
+    (FakeResponse('<html><body>Идут технические работы</body></html>', status_code=503), 1),
+    (requests.ConnectionError('connection reset'), 1),
+])
+def test_http_outcomes_reach_pacer(response, slowdowns):
+    pacer = AdaptivePacer(0.0, min_delay=0.0, max_delay=8.0)
+    fetcher = HttpFetcher(timeout=1, pacer=pacer)
+    fetcher.session = FakeSession(response)
+
+    try:
+        fetcher.fetch(URL, VACANCY_MARKERS)
+    except FetchError:
+        pass
+
+    # 429 и проверка на бота замедляют темп и без браузера; закрытая вакансия — нет
+    assert pacer.slowdowns == slowdowns
+    assert pacer.delay == (1.0 if slowdowns else 0.0)
+    assert list(pacer.avg_latency) == ([] if slowdowns else ['http'])
+
+
+class FakeDriver:
+    """Драйвер, у которого на любой странице один и тот же HTML"""
+
+    def __init__(self, content):
+        self.page_source = content
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+
+    def find_elements(self, by, selector):
+        # Селектор вида [data-qa="..."]
+        return [selector] if selector[1:-1] in self.page_source else []
+
+    def execute_script(self, script):
+        return self.page_source[:5000]
+
+
+class FakeLifecycle:
+    def __init__(self):
+        self.results = []
+
+    def before_fetch(self):
+        pass
+
+    def record(self, ok):
+        self.results.append(ok)
+
+
+def _browser(content):
+    config = Config()
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'page_ready_timeout': 0.3}
+    parser = SimpleNamespace(config=config, driver=FakeDriver(content), lifecycle=FakeLifecycle(),
+                             pacer=AdaptivePacer(0.0, min_delay=0.0, max_delay=8.0))
+    return BrowserFetcher(parser)
+
+
+@pytest.mark.parametrize('content, markers', [
+    (CORPUS['vacancy']['multi_skill'], VACANCY_MARKERS),
+    (CORPUS['serp']['no_results'], SERP_MARKERS),
+])
+def test_browser_loaded_page(content, markers):
+    fetcher = _browser(content)
+    assert fetcher.fetch(URL, markers) == content
+    assert fetcher.pages == 1
+    # Выдача без результатов — нормальная загрузка, темп не замедляется
+    assert fetcher.parser.lifecycle.results == [True]
+    assert fetcher.parser.pacer.slowdowns == 0
+
+
+def test_browser_gone_vacancy():
+    fetcher = _browser('<html><body><div data-qa="vacancy-removed">Вакансия удалена</div></body></html>')
+    with pytest.raises(PageGoneError):
+        fetcher.fetch(URL, VACANCY_MARKERS)
+    assert fetcher.parser.lifecycle.results == [True]
+    assert fetcher.parser.pacer.slowdowns == 0
+
+
+@pytest.mark.parametrize('content, error', [
+    ('<html><body><div id="root"></div></body></html>', FetchError),
+    ('<html><script src="/ddos-guard/check.js"></script></html>', ChallengeError),
+])
+def test_browser_markers_timeout(content, error):
+    fetcher = _browser(content)
+    with pytest.raises(FetchError) as raised:
+        fetcher.fetch(URL, VACANCY_MARKERS)
+
+    # Недогруженная страница не возвращается: ссылка уйдет в очередь повторов
+    assert type(raised.value) is error
+    assert fetcher.pages == 0
+    assert fetcher.parser.lifecycle.results == [False]
+    assert fetcher.parser.pacer.slowdowns == 1
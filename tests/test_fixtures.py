@@ -0,0 +1,116 @@
+"""
+Разбор корпуса tests/fixtures: ожидаемые поля в tests/fixtures/expected.json
+
+Корпус синтетический: страницы собраны вручную по разметке rabota.by
+(те же data-qa, классы и JSON состояния страницы), вакансии и компании
+выдуманы. Реальные страницы в репозиторий не сохраняются, поэтому
+изменение разметки на сайте этот корпус не заметит — для этого есть
+статистика селекторов (src/selector_registry.py).
+
+Варианты: зарплата (диапазон, только от / до, валюты, не указана,
+пустой блок), страницы без части полей, много навыков, брендированное
+описание, страницы выдачи с пейджером, без него и без результатов.
+"""
+
+import os
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.config import Config
+from src.harmonization import extract_salary_range
+from src.parser import VacancyParser
+from src.parser_backends import PARSER_BACKENDS
+from src.processor import DataProcessor
+
+from benchmarks.bench_parser import FIXTURES_DIR, load_corpus
+
+
+CORPUS = load_corpus()
+
+with open(os.path.join(FIXTURES_DIR, 'expected.json'), 'r', encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+
+@pytest.fixture(scope='module')
+def parser():
+    return VacancyParser(Config(), use_cache=False)
+
+
+@pytest.fixture(scope='module')
+def state_parser():
+    config = Config()
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'extraction_mode': 'state'}
+    return VacancyParser(config, use_cache=False)
+
+
+def test_corpus_matches_expected_file():
+    assert set(CORPUS['vacancy']) == set(EXPECTED['vacancy'])
+    assert set(CORPUS['serp']) == set(EXPECTED['serp'])
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED['vacancy']))
+def test_extract_methods(parser, name):
+    soup = BeautifulSoup(CORPUS['vacancy'][name], 'lxml')
+    fields = {field: extractor(soup) for field, extractor in parser._field_extractors().items()}
+    assert fields == EXPECTED['vacancy'][name]
+
+
+@pytest.mark.parametrize('backend_name', sorted(PARSER_BACKENDS))
+@pytest.mark.parametrize('name', sorted(EXPECTED['vacancy']))
+def test_backends(parser, backend_name, name):
+    backend = PARSER_BACKENDS[backend_name](parser)
+    assert backend.vacancy_fields(CORPUS['vacancy'][name]) == EXPECTED['vacancy'][name]
+
+
+@pytest.mark.parametrize('name', sorted(EXPECTED['vacancy']))
+def test_state_extraction(state_parser, name):
+    record = state_parser.parse_vacancy_html(CORPUS['vacancy'][name], 'https://rabota.by/vacancy/1')
+    expected = EXPECTED['vacancy'][name]
+
+    # Зарплата из состояния записывается в своем виде — сравнивается после разбора
+    assert extract_salary_range(record['salary_raw']) == extract_salary_range(expected['salary_raw'])
+    assert {field: record[field] for field in expected if field != 'salary_raw'} == \
+           {field: value for field, value in expected.items() if field != 'salary_raw'}
+
+
+@pytest.mark.parametrize('backend_name', sorted(PARSER_BACKENDS))
+@pytest.mark.parametrize('name', sorted(EXPECTED['serp']))
+def test_serp(parser, backend_name, name):
+    backend = PARSER_BACKENDS[backend_name](parser)
+    doc = backend.serp_document(CORPUS['serp'][name])
+    expected = EXPECTED['serp'][name]
+
+    assert backend.pages_count(doc) == expected['pages_count']
+    if expected['links'] is None:
+        with pytest.raises((AttributeError, ValueError)):
+            backend.serp_links(doc)
+    else:
+        assert backend.serp_links(doc) == expected['links']
+
+
+@pytest.mark.parametrize('name, salary_min, salary_max, currency, salary_type', [
+    ('salary_range_byn', 2500, 3000, 'BYN', 'На руки'),
+    ('salary_to_eur', None, 1800, 'EUR', 'На руки'),
+    ('multi_skill', 5100, 7650, 'USD', 'До вычета'),
+    ('salary_not_specified', None, None, 'Не указано', 'Не указано'),
+    ('salary_empty_block', None, None, 'Не указано', 'На руки'),
+])
+def test_harmonized_salary(parser, name, salary_min, salary_max, currency, salary_type):
+    url = 'https://rabota.by/vacancy/1'
+    record = parser._make_record(dict(EXPECTED['vacancy'][name]), url)
+    processed = DataProcessor(parser.config).process_single_vacancy(record, {url: ['Программист']})
+
+    assert (processed['salary_min'], processed['salary_max'], processed['currency'], processed['salary_type']) == \
+           (salary_min, salary_max, currency, salary_type)
+
+
+def test_harmonized_multi_skill(parser):
+    url = 'https://rabota.by/vacancy/1'
+    record = parser._make_record(dict(EXPECTED['vacancy']['multi_skill']), url)
+    processed = DataProcessor(parser.config).process_single_vacancy(record, {url: ['Программист']})
+
+    assert processed['skills_count'] == 20
+    assert processed['city'] == 'Минск'
+    assert processed['specialist_level'] == 'Главный специалист'
@@ -0,0 +1,123 @@
+"""
+Кэш HTML страниц вакансий: чтение и запись, срок годности, вытеснение и потерянные файлы
+"""
+
+import os
+import random
+
+import pytest
+
+from src import html_cache
+from src.html_cache import HtmlCache
+
+
+class FakeClock:
+    """Подменяет модуль time в src.html_cache: время двигается только вручную"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(html_cache, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = HtmlCache(str(tmp_path / 'html_cache'), max_bytes=10 * 1024 * 1024, max_age_hours=1)
+    yield cache
+    cache.close()
+
+
+def _page(seed):
+    # Случайный текст почти не сжимается — размеры страниц в кэше близки
+    rng = random.Random(seed)
+    return '<html><body>' + ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(4000)) + \
+           '</body></html>'
+
+
+def test_put_get(cache, tmp_path):
+    cache.put(129935107, _page(1))
+
+    assert 129935107 in cache
+    assert cache.get(129935107) == _page(1)
+    assert cache.get(129935108) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Страница лежит сжатой в подкаталоге по младшему байту ID, читается и без индекса
+    path = HtmlCache.page_path(cache.cache_dir, 129935107)
+    assert os.path.dirname(path) == os.path.join(cache.cache_dir, f'{129935107 % 256:02x}')
+    assert HtmlCache.read_page(cache.cache_dir, 129935107) == _page(1)
+
+    # Размер кэша восстанавливается по индексу после перезапуска
+    reopened = HtmlCache(cache.cache_dir, max_bytes=cache.max_bytes)
+    assert reopened.total_bytes == cache.total_bytes == os.path.getsize(path)
+    reopened.close()
+
+
+def test_put_replaces_changed_page(cache):
+    cache.put(1, _page(1))
+    cache.put(1, _page(1))
+    cache.put(1, _page(2))
+
+    assert cache.get(1) == _page(2)
+    assert cache.total_bytes == os.path.getsize(HtmlCache.page_path(cache.cache_dir, 1))
+
+
+def test_get_fresh_expiry(cache, clock):
+    cache.put(1, _page(1))
+
+    clock.now += 3599
+    assert cache.get_fresh(1) == _page(1)
+
+    clock.now += 2
+    assert cache.get_fresh(1) is None
+    # Без ограничения возраста устаревшая страница по-прежнему доступна
+    assert cache.get(1) == _page(1)
+
+    # Повторная запись того же содержимого обновляет время сохранения
+    cache.put(1, _page(1))
+    assert cache.get_fresh(1) == _page(1)
+
+
+def test_lru_eviction_down_to_90_percent(cache, clock):
+    for vacancy_id in (1, 2, 3):
+        clock.now += 1
+        cache.put(vacancy_id, _page(vacancy_id))
+
+    # Лимит ровно по текущему размеру: следующая страница его превысит
+    cache.max_bytes = cache.total_bytes
+    clock.now += 1
+    assert cache.get(1) == _page(1)
+
+    clock.now += 1
+    cache.put(4, _page(4))
+
+    # Вытеснены давно не использовавшиеся 2 и 3, страница 1 недавно читалась
+    assert [vacancy_id for vacancy_id in (1, 2, 3, 4) if vacancy_id in cache] == [1, 4]
+    assert not os.path.exists(HtmlCache.page_path(cache.cache_dir, 2))
+    assert cache.total_bytes <= cache.max_bytes * 0.9
+    assert cache.total_bytes == sum(os.path.getsize(HtmlCache.page_path(cache.cache_dir, vacancy_id))
+                                    for vacancy_id in (1, 4))
+
+
+def test_manifest_entry_without_file(cache):
+    cache.put(1, _page(1))
+    cache.put(2, _page(2))
+    os.remove(HtmlCache.page_path(cache.cache_dir, 1))
+
+    assert cache.get(1) is None
+    assert cache.misses == 1
+    # Запись без файла убрана из индекса, размер кэша пересчитан
+    assert 1 not in cache
+    assert cache.total_bytes == os.path.getsize(HtmlCache.page_path(cache.cache_dir, 2))
+
+    # Та же страница записывается заново
+    cache.put(1, _page(1))
+    assert cache.get(1) == _page(1)
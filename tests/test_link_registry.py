@@ -0,0 +1,115 @@
+"""
+Реестр ссылок: новые ссылки, объединение специализаций вакансии, сборка links_and_names_*.json
+"""
+
+import json
+
+from src.link_registry import LinkRegistry, link_specializations
+
+
+def _link(vacancy_id, *specializations, suffix=''):
+    return {
+        'specialization': specializations[0],
+        'specializations': list(specializations),
+        'url': f'https://rabota.by/vacancy/{vacancy_id}{suffix}',
+    }
+
+
+def _open(tmp_path):
+    return LinkRegistry(str(tmp_path / 'links_log.jsonl'), str(tmp_path / 'url_list.txt'),
+                        str(tmp_path / 'links_and_names.json'))
+
+
+def test_link_specializations_old_format():
+    assert link_specializations({'url': 'https://rabota.by/vacancy/1', 'specialization': 'Программист'}) == \
+           ['Программист']
+    assert link_specializations(_link(1, 'Аналитик', 'Программист')) == ['Аналитик', 'Программист']
+    assert link_specializations({'url': 'https://rabota.by/vacancy/1'}) == []
+
+
+def test_add_links_merges_specializations(tmp_path):
+    registry = _open(tmp_path)
+    assert registry.add_links([_link(1, 'Программист'), _link(2, 'Аналитик')]) == \
+           [_link(1, 'Программист'), _link(2, 'Аналитик')]
+
+    # Та же вакансия в выдаче другой специализации — ссылка не новая, но специализация добавляется
+    new_links = registry.add_links([_link(1, 'Тестировщик', suffix='?hhtmFrom=vacancy_search_list'),
+                                    _link(2, 'Аналитик')])
+    assert new_links == []
+    assert registry.specializations_of('https://rabota.by/vacancy/1') == ['Программист', 'Тестировщик']
+    assert registry.specializations_of('https://rabota.by/vacancy/2') == ['Аналитик']
+
+    # В url_list только новые ссылки, в журнале — еще и строка дополнения
+    assert (tmp_path / 'url_list.txt').read_text(encoding='utf-8').split() == \
+           ['https://rabota.by/vacancy/1', 'https://rabota.by/vacancy/2']
+    assert len((tmp_path / 'links_log.jsonl').read_text(encoding='utf-8').splitlines()) == 3
+
+    # После перезапуска специализации объединяются по журналу
+    reopened = _open(tmp_path)
+    assert len(reopened) == 2
+    assert reopened.specializations_of('https://rabota.by/vacancy/1') == ['Программист', 'Тестировщик']
+
+
+def test_duplicates_within_batch_are_merged(tmp_path):
+    registry = _open(tmp_path)
+    new_links = registry.add_links([_link(1, 'Программист'), _link(1, 'Тестировщик', suffix='/'),
+                                    _link(1, 'Программист')])
+
+    assert new_links == [_link(1, 'Программист', 'Тестировщик')]
+    assert registry.specializations_of('https://rabota.by/vacancy/1') == ['Программист', 'Тестировщик']
+
+
+def test_export_json_has_merged_specializations(tmp_path):
+    registry = _open(tmp_path)
+    registry.add_links([_link(1, 'Программист'), _link(2, 'Аналитик')])
+    registry.add_links([_link(1, 'Тестировщик')])
+
+    assert registry.export_json() == 2
+    with open(registry.json_file, 'r', encoding='utf-8') as f:
+        assert json.load(f) == [_link(1, 'Программист', 'Тестировщик'), _link(2, 'Аналитик')]
+
+
+def test_known_keys_after_reopen(tmp_path):
+    registry = _open(tmp_path)
+    registry.add_links([_link(1, 'Программист'), _link(2, 'Аналитик', suffix='?hhtmFrom=vacancy_search_list')])
+    registry.add_links([_link(3, 'Аналитик')])
+
+    reopened = _open(tmp_path)
+    assert reopened.known_keys == {1, 2, 3}
+    assert 'https://minsk.rabota.by/vacancy/2/' in reopened
+    assert 'https://rabota.by/vacancy/4' not in reopened
+    assert reopened.add_links([_link(3, 'Аналитик'), _link(4, 'Аналитик')]) == [_link(4, 'Аналитик')]
+
+
+def test_migration_from_links_and_names(tmp_path):
+    # links_and_names_*.json в старом формате: одна специализация, дубликаты по ID вакансии
+    old_links = [
+        {'specialization': 'Программист', 'url': 'https://rabota.by/vacancy/1'},
+        {'specialization': 'Аналитик', 'url': 'https://rabota.by/vacancy/2'},
+        {'specialization': 'Тестировщик', 'url': 'https://rabota.by/vacancy/1?hhtmFrom=vacancy_search_list'},
+    ]
+    (tmp_path / 'links_and_names.json').write_text(json.dumps(old_links, indent=4, ensure_ascii=False),
+                                                   encoding='utf-8')
+
+    registry = _open(tmp_path)
+    assert registry.known_keys == {1, 2}
+    assert registry.specializations_of('https://rabota.by/vacancy/1') == ['Программист', 'Тестировщик']
+    # Перенесенные ссылки в url_list не дописываются — он уже был собран старой версией
+    assert not (tmp_path / 'url_list.txt').exists()
+
+    # Повторно перенос не выполняется: журнал уже не пуст
+    reopened = _open(tmp_path)
+    assert len((tmp_path / 'links_log.jsonl').read_text(encoding='utf-8').splitlines()) == 2
+    assert reopened.export_json() == 2
+    with open(reopened.json_file, 'r', encoding='utf-8') as f:
+        assert json.load(f) == [_link(1, 'Программист', 'Тестировщик'), _link(2, 'Аналитик')]
+
+
+def test_migration_from_broken_links_and_names(tmp_path, capsys):
+    (tmp_path / 'links_and_names.json').write_text('[{"specialization": "Программист", "url": "https://rab',
+                                                   encoding='utf-8')
+
+    registry = _open(tmp_path)
+    assert len(registry) == 0
+    assert 'Не удалось прочитать' in capsys.readouterr().out
+    assert registry.add_links([_link(1, 'Программист')]) == [_link(1, 'Программист')]
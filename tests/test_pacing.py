@@ -0,0 +1,112 @@
+"""
+Адаптивная задержка (AIMD) на виртуальном времени
+"""
+
+import pytest
+
+from src import pacing as pacing_module
+from src.config import Config
+from src.pacing import AdaptivePacer
+
+
+class FakeClock:
+    """Подменяет модуль time в src.pacing: sleep не ждет, а сдвигает часы"""
+
+    def __init__(self, now=100.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(pacing_module, 'time', fake)
+    return fake
+
+
+def _pacer(initial_delay=0.0):
+    return AdaptivePacer(initial_delay, min_delay=0.0, max_delay=8.0, backoff_floor=1.0, recovery_step=0.25)
+
+
+def test_multiplicative_backoff_capped():
+    pacer = _pacer()
+    pacer.record(1.0, ok=True)
+    assert (pacer.delay, pacer.slowdowns) == (0.0, 0)
+
+    # Первое замедление поднимает нулевую задержку до backoff_floor, дальше — удвоение до max_delay
+    delays = []
+    for _ in range(5):
+        pacer.record(1.0, ok=False)
+        delays.append(pacer.delay)
+    assert delays == [1.0, 2.0, 4.0, 8.0, 8.0]
+    assert pacer.slowdowns == 5
+
+
+def test_additive_recovery_down_to_min():
+    pacer = _pacer(initial_delay=1.0)
+    delays = []
+    for _ in range(6):
+        pacer.record(1.0, ok=True)
+        delays.append(pacer.delay)
+    assert delays == [0.75, 0.5, 0.25, 0.0, 0.0, 0.0]
+
+
+def test_slow_page_counts_as_slowdown():
+    pacer = _pacer(initial_delay=1.0)
+    pacer.record(1.0, ok=True)
+    assert pacer.avg_latency == {'browser': 1.0}
+
+    # Загрузка дольше slow_factor средних — замедляемся, хотя страница загрузилась
+    pacer.record(3.5, ok=True)
+    assert (pacer.delay, pacer.slowdowns) == (1.5, 1)
+    assert pacer.avg_latency['browser'] == pytest.approx(1.5)
+
+    # Неудачные загрузки в среднее не попадают
+    pacer.record(60.0, ok=False)
+    assert pacer.avg_latency['browser'] == pytest.approx(1.5)
+
+
+def test_latency_is_averaged_per_source():
+    pacer = _pacer(initial_delay=1.0)
+    pacer.record(0.2, ok=True, source='http')
+    pacer.record(3.0, ok=True, source='browser')
+
+    # Chrome медленнее HTTP, но это не замедление; медленный HTTP-ответ — замедление
+    assert (pacer.delay, pacer.slowdowns) == (0.5, 0)
+    pacer.record(1.0, ok=True, source='http')
+    assert pacer.slowdowns == 1
+
+
+def test_wait_keeps_gap(clock):
+    pacer = _pacer(initial_delay=2.0)
+    pacer.wait()
+    assert clock.sleeps == []
+
+    clock.now += 0.5
+    pacer.wait()
+    assert clock.sleeps == [1.5]
+
+    # min_delay — нижняя граница паузы
+    pacer.wait(min_delay=4.0)
+    assert clock.sleeps == [1.5, 4.0]
+
+    clock.now += 10
+    pacer.wait()
+    assert clock.sleeps == [1.5, 4.0]
+
+
+def test_constant_delay_without_adaptive_pacing():
+    config = Config()
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'adaptive_pacing': False, 'delay_between_requests': 0.5}
+    pacer = AdaptivePacer.from_config(config)
+
+    pacer.record(1.0, ok=False)
+    pacer.record(1.0, ok=True)
+    assert pacer.delay == 0.5
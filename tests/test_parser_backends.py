@@ -0,0 +1,163 @@
+"""
+Равенство бэкендов разбора (PARSER_CONFIG['parser_backend'])
+
+Страницы вакансий и выдачи собираются из случайных вариантов разметки:
+отсутствующие и пустые элементы, запасные селекторы, комментарии и скрипты
+внутри текста, вложенные совпадения, несколько классов. Каждый бэкенд должен
+вернуть то же, что эталонный 'bs4' и прежние _extract_* по очереди.
+"""
+
+import random
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.config import Config
+from src.parser import VacancyParser
+from src.parser_backends import PARSER_BACKENDS
+
+
+PAGES = 300
+
+
+@pytest.fixture(scope='module')
+def parser():
+    return VacancyParser(Config(), use_cache=False)
+
+
+@pytest.fixture(scope='module')
+def backends(parser):
+    return {name: backend_cls(parser) for name, backend_cls in PARSER_BACKENDS.items()}
+
+
+def _noise(rng):
+    return rng.choice([
+        '',
+        ' ',
+        '\n  ',
+        '<!-- комментарий -->',
+        '<script>var s = "скрипт";</script>',
+        '<style>.x { color: red }</style>',
+        '<b>жирный</b>',
+        '&nbsp;&amp;',
+        '<br>',
+        '<span class="extra">доп.</span>',
+    ])
+
+
+def _text(rng, words):
+    return _noise(rng) + ' '.join(rng.sample(words, rng.randint(1, len(words)))) + _noise(rng)
+
+
+def _maybe(rng, html, probability=0.8):
+    return html if rng.random() < probability else ''
+
+
+def vacancy_page(rng) -> str:
+    words = ['Python', 'разработчик', 'Senior', 'Минск', 'гибрид', 'офис', '2 500', 'Br', 'от', 'до']
+    blocks = []
+
+    blocks.append(_maybe(rng, f'<h1 data-qa="vacancy-title">{_text(rng, words)}</h1>'))
+    salary_tag = rng.choice(['div', 'p', 'span'])
+    blocks.append(_maybe(rng, rng.choice([
+        f'<{salary_tag} data-qa="vacancy-salary"><span>от 2&nbsp;500</span> <span>до 3 000 Br</span>{_noise(rng)}</{salary_tag}>',
+        f'<{salary_tag} data-qa="vacancy-salary"></{salary_tag}>',
+        f'<{salary_tag} data-qa="vacancy-salary">  <!-- пусто --> </{salary_tag}>',
+    ])))
+    blocks.append(_maybe(rng, f'<span data-qa="vacancy-salary-compensation-type-net">на руки {_noise(rng)}</span>', 0.5))
+    blocks.append(_maybe(rng, f'<p>Опыт: <span data-qa="vacancy-experience">{_text(rng, ["1–3", "года"])}</span></p>'))
+    blocks.append(_maybe(rng, rng.choice([
+        f'<div class="dotted-wrapper--xVk7Cm8wgsAU4cbP">{_text(rng, ["Полная", "занятость"])}</div>',
+        f'<div class="a dotted-wrapper--xVk7Cm8wgsAU4cbP b">{_text(rng, ["Частичная"])}</div>',
+        '<span class="dotted-wrapper--xVk7Cm8wgsAU4cbP">не div</span>',
+    ])))
+    blocks.append(_maybe(rng, rng.choice([
+        '<p data-qa="work-formats-text">Формат работы: <span>удалённо</span><span>гибрид</span></p>',
+        '<p data-qa="work-formats-text"></p>',
+        '<div data-qa="work-formats-text">не p</div>',
+    ])))
+    blocks.append(_maybe(rng, f'<a href="/employer/1"><span class="vacancy-company-name">{_text(rng, ["ООО", "Ромашка"])}</span></a>'))
+    blocks.append(_maybe(rng, f'<span data-qa="vacancy-view-raw-address">{_text(rng, ["Минск,", "ул.", "Ленина"])}</span>'))
+
+    description = f'<p>{_text(rng, words)}</p><ul><li>{_text(rng, words)}</li></ul>{_noise(rng)}'
+    blocks.append(_maybe(rng, rng.choice([
+        f'<div class="g-user-content" data-qa="vacancy-description">{description}</div>',
+        f'<div class="tmpl_hh_wrapper">{description}</div>',
+        f'<div class="tmpl_hh_wrapper"></div><div class="g-user-content">{description}</div>',
+        f'<div class="g-user-content"><h1>Заголовок в описании</h1>{description}</div>',
+    ])))
+
+    skills = []
+    for _ in range(rng.randint(0, 6)):
+        skill = _text(rng, ['SQL', 'Git', 'Docker', 'Linux'])
+        skills.append(rng.choice([
+            f'<li data-qa="skills-element"><div class="magritte-tag">{skill}</div></li>',
+            f'<li data-qa="skills-element"><span><div>{skill}</div></span></li>',
+        ] + ([f'<li data-qa="skills-element">{skill}</li>'] if rng.random() < 0.1 else [])))
+    blocks.append(f'<ul>{"".join(skills)}</ul>' if skills else '')
+
+    rng.shuffle(blocks)
+    body = ''.join(f'<div class="row">{_noise(rng)}{block}</div>' for block in blocks)
+    head = '<head><meta charset="utf-8"><title>Вакансия</title><script>window.x = "<h1>нет</h1>";</script></head>'
+    return f'<!DOCTYPE html><html>{head}<body>{body}</body></html>'
+
+
+def serp_page(rng) -> str:
+    items = []
+    for index in range(rng.randint(0, 20)):
+        href = rng.choice([f'https://rabota.by/vacancy/{100000 + index}?query=x', ''])
+        href_attr = f' href="{href}"' if href or rng.random() < 0.5 else ''
+        items.append(f'<div class="serp-item"><h2><a data-qa="serp-item__title"{href_attr}>'
+                     f'<span>Вакансия {index}</span></a></h2>{_noise(rng)}</div>')
+
+    results = f'<div data-qa="vacancy-serp__results">{"".join(items)}</div>'
+    pager = ''.join(f'<a data-qa="pager-page" href="?page={page}">{page + 1}</a>' for page in range(rng.randint(0, 8)))
+    decoy = '<a data-qa="serp-item__title" href="https://rabota.by/vacancy/1">вне выдачи</a>'
+
+    body = (decoy + _maybe(rng, results, 0.9) + _maybe(rng, f'<div class="pager">{pager}</div>')
+            + _maybe(rng, '<a data-qa="pager-page">дальше</a>', 0.1))
+    return f'<html><body>{body}</body></html>'
+
+
+def _serp_result(backend, content):
+    doc = backend.serp_document(content)
+    try:
+        links = backend.serp_links(doc)
+    except Exception:
+        links = None
+    return backend.pages_count(doc), links
+
+
+def test_vacancy_fields_match_reference(parser, backends):
+    rng = random.Random(22)
+    extractors = parser._field_extractors()
+
+    for _ in range(PAGES):
+        content = vacancy_page(rng)
+        soup = BeautifulSoup(content, 'lxml')
+        expected = {field: extractor(soup) for field, extractor in extractors.items()}
+
+        for name, backend in backends.items():
+            assert backend.vacancy_fields(content) == expected, (name, content)
+
+
+def test_serp_results_match_reference(backends):
+    rng = random.Random(22)
+
+    for _ in range(PAGES):
+        content = serp_page(rng)
+        expected = _serp_result(backends['bs4'], content)
+
+        for name, backend in backends.items():
+            assert _serp_result(backend, content) == expected, (name, content)
+
+
+@pytest.mark.parametrize('content', [
+    '',
+    '<html></html>',
+    '<?xml version="1.0" encoding="utf-8"?><html><body><h1>Заголовок</h1></body></html>',
+    '<h1>Без html и body</h1><p data-qa="work-formats-text">офис</p>',
+])
+def test_degenerate_documents(backends, content):
+    results = {name: backend.vacancy_fields(content) for name, backend in backends.items()}
+    assert all(fields == results['bs4'] for fields in results.values()), results
@@ -0,0 +1,142 @@
+"""
+Конвейер сбора вакансий: те же записи, что у последовательного цикла, ошибки в очереди повторов,
+статистика селекторов из процессов разбора, остановка при падении процесса разбора
+"""
+
+import os
+import queue
+import random
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src import pipeline as pipeline_module
+from src.config import Config
+from src.parser import VacancyParser
+from src.pipeline import VacancyPipeline
+from src.processor import DataProcessor
+from src.retry_queue import RetryQueue
+from src.storage import VacancyJournal
+
+from tests.test_parser_backends import vacancy_page
+
+
+class OfflineParser(VacancyParser):
+    """Парсер, который берет страницы из словаря вместо сети"""
+
+    def __init__(self, config, pages):
+        super().__init__(config, use_cache=False)
+        self.pages = pages
+
+    def fetch_vacancy_source(self, url):
+        content = self.pages[url]
+        if content is None:
+            raise ConnectionError('нет ответа')
+        return None, content
+
+
+def _links(count):
+    return [{'url': f'https://rabota.by/vacancy/{100000 + index}', 'specialization': 'Программист'}
+            for index in range(count)]
+
+
+def _pipeline(tmp_path, pages, parse_workers, batch_size=7):
+    config = Config()
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'fetch_mode': 'http', 'concurrency': 1}
+    parser = OfflineParser(config, pages)
+    store = VacancyJournal(str(tmp_path / 'journal.jsonl'))
+    retry_queue = RetryQueue(str(tmp_path / 'retry.json'), max_retries=3, backoff_base=1, backoff_max=10)
+    links_dict = {url: ['Программист'] for url in pages}
+
+    return VacancyPipeline(config, parser, DataProcessor(config), store, retry_queue, links_dict,
+                           parse_workers=parse_workers, queue_size=4, batch_size=batch_size)
+
+
+def _run(tmp_path, pages, parse_workers, batch_size=7):
+    pipeline = _pipeline(tmp_path, pages, parse_workers, batch_size)
+    written, failed = pipeline.run(_links(len(pages)))
+    pipeline.store.close()
+    return pipeline.parser, written, failed, list(pipeline.store.iter_records()), pipeline.retry_queue
+
+
+@pytest.mark.parametrize('parse_workers', [0, 2])
+def test_pipeline_matches_sequential(tmp_path, parse_workers):
+    rng = random.Random(24)
+    links = _links(40)
+    pages = {link['url']: vacancy_page(rng) for link in links}
+    pages[links[5]['url']] = None
+    pages[links[30]['url']] = None
+
+    parser, written, failed, records, retry_queue = _run(tmp_path, pages, parse_workers)
+
+    assert (written, failed) == (38, 2)
+    assert set(retry_queue.entries) == {links[5]['url'], links[30]['url']}
+
+    # Порядок записи при нескольких процессах разбора может отличаться
+    processor = DataProcessor(parser.config)
+    expected = {}
+    for url, content in pages.items():
+        if content is not None:
+            data = parser.parse_vacancy_html(content, url)
+            expected[url] = processor.process_single_vacancy(data, {url: ['Программист']})
+
+    ignored = ('monitoring_date', 'monitoring_time')
+    assert len(records) == len(expected)
+    for record in records:
+        reference = expected[record['url']]
+        assert {k: v for k, v in record.items() if k not in ignored} == \
+               {k: v for k, v in reference.items() if k not in ignored}
+
+
+
+@pytest.mark.parametrize('parse_workers', [0, 2])
+def test_selector_stats_from_parse_workers(tmp_path, parse_workers):
+    rng = random.Random(7)
+    pages = {link['url']: vacancy_page(rng) for link in _links(12)}
+
+    parser, written, _, _, _ = _run(tmp_path, pages, parse_workers)
+
+    # Страницы, разобранные в процессах, учтены в статистике парсера главного процесса
+    stats = parser.selectors.current.stats
+    assert stats.pages == written == 12
+    assert sum(stats.hits['title']) + stats.defaults['title'] == 12
+
+
+def crashing_parse(content, url):
+    """Разбор в процессе пула, который падает на помеченной странице"""
+    if 'CRASH' in content:
+        os._exit(1)
+    return pipeline_module._parse_in_worker(content, url)
+
+
+def test_broken_parse_pool_aborts(tmp_path, monkeypatch):
+    rng = random.Random(3)
+    links = _links(30)
+    pages = {link['url']: vacancy_page(rng) for link in links}
+    pages[links[8]['url']] = 'CRASH'
+    monkeypatch.setattr(pipeline_module, '_parse_in_worker', crashing_parse)
+
+    pipeline = _pipeline(tmp_path, pages, parse_workers=2)
+    with pytest.raises(BrokenProcessPool):
+        pipeline.run(links)
+    pipeline.store.close()
+
+    # Уже разобранное записано, а необработанные ссылки не превращены в неудачные попытки
+    assert pipeline.failed == 0
+    assert pipeline.retry_queue.entries == {}
+    assert pipeline.written < 30
+    assert len(list(pipeline.store.iter_records())) == pipeline.written
+
+
+def test_feed_stops_on_full_queue(tmp_path):
+    pipeline = _pipeline(tmp_path, {}, parse_workers=0)
+    outbox = queue.Queue(maxsize=1)
+    outbox.put('занято')
+
+    # Разбор не идет, очередь полна: после прерывания загрузка не должна ждать вечно
+    feeder = threading.Thread(target=pipeline._feed, args=(iter(['страница']), outbox), daemon=True)
+    feeder.start()
+    pipeline.stop.set()
+    feeder.join(timeout=5)
+    assert not feeder.is_alive()
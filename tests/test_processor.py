@@ -0,0 +1,19 @@
+"""
+Обработка вакансий: специализации из словаря ссылок
+"""
+
+from src.config import Config
+from src.processor import DataProcessor
+
+
+def test_processor_keeps_all_specializations():
+    processor = DataProcessor(Config())
+    url = 'https://rabota.by/vacancy/1'
+    links_dict = {url: ['Программист', 'Тестировщик']}
+
+    processed = processor.process_single_vacancy({'url': url + '?hhtmFrom=vacancy_search_list'}, links_dict)
+    assert processed['specialization'] == 'Программист'
+    assert processed['specializations'] == ['Программист', 'Тестировщик']
+
+    processed = processor.process_single_vacancy({'url': 'https://rabota.by/vacancy/2'}, links_dict)
+    assert processed['specializations'] == ['Не указано']
@@ -0,0 +1,60 @@
+"""
+Потоковое чтение data_finally_*.json и журналов JSONL
+"""
+
+import json
+
+import pytest
+
+from src.reader import iter_vacancies
+
+
+RECORDS = [
+    {'url': 'https://rabota.by/vacancy/1', 'title': 'Программист "Python"', 'salary_min': 2500,
+     'description': 'Длинное описание\nс переводом строки, запятыми, [скобками] и {фигурными скобками}. ' * 20,
+     'skills': 'Python; SQL', 'has_salary': True, 'salary_max': None},
+    {'url': 'https://rabota.by/vacancy/2', 'title': 'Аналитик \\ данных', 'salary_min': 123456789,
+     'description': '', 'skills': '', 'has_salary': False, 'salary_max': 1.5},
+    {'url': 'https://rabota.by/vacancy/3', 'title': 'Тестировщик', 'salary_min': None,
+     'description': 'Ёлка 🎄', 'skills': 'QA', 'has_salary': False, 'salary_max': None},
+]
+
+
+def _write(path, text):
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 64, 64 * 1024])
+def test_values_across_chunk_boundaries(tmp_path, chunk_size):
+    path = _write(tmp_path / 'data_finally.json', json.dumps(RECORDS, indent=4, ensure_ascii=False))
+    assert list(iter_vacancies(path, chunk_size=chunk_size)) == RECORDS
+
+
+def test_journal_jsonl(tmp_path):
+    text = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in RECORDS)
+    path = _write(tmp_path / 'data_journal.jsonl', text)
+    assert list(iter_vacancies(path, chunk_size=5)) == RECORDS
+
+
+@pytest.mark.parametrize('text', ['[]', '[\n]\n', '', '  \n'])
+def test_empty_files(tmp_path, text):
+    assert list(iter_vacancies(_write(tmp_path / 'empty.json', text))) == []
+
+
+def test_field_projection(tmp_path):
+    path = _write(tmp_path / 'data_finally.json', json.dumps(RECORDS, indent=4, ensure_ascii=False))
+    projected = list(iter_vacancies(path, fields=['url', 'has_salary', 'missing'], chunk_size=16))
+
+    assert projected == [{'url': record['url'], 'has_salary': record['has_salary']} for record in RECORDS]
+
+
+def test_truncated_file_raises(tmp_path):
+    text = json.dumps(RECORDS, indent=4, ensure_ascii=False)
+    path = _write(tmp_path / 'data_finally.json', text[:text.index('"https://rabota.by/vacancy/3"') + 10])
+
+    vacancies = iter_vacancies(path, chunk_size=32)
+    assert next(vacancies) == RECORDS[0]
+    assert next(vacancies) == RECORDS[1]
+    with pytest.raises(ValueError):
+        next(vacancies)
@@ -0,0 +1,73 @@
+"""
+Офлайн-перепроцессинг: разбор из кэша HTML, гармонизация по сырым полям, порядок вакансий
+"""
+
+import json
+
+import pytest
+
+from src.config import Config
+from src.html_cache import HtmlCache
+from src.processor import DataProcessor
+from src.reprocess import reprocess_month
+from src.storage import open_vacancy_store
+
+
+DATE_STR = '01.2026'
+
+# Страница вакансии из кэша (только нужные разбору блоки)
+CACHED_PAGE = (
+    '<html><body>'
+    '<h1 data-qa="vacancy-title">Главный архитектор решений</h1>'
+    '<div data-qa="vacancy-salary"><span>от 6 000 до 9 000 $</span> <span>до вычета налогов</span></div>'
+    '<span data-qa="vacancy-view-raw-address">Минск, Парк высоких технологий</span>'
+    '</body></html>'
+)
+
+
+def _config(tmp_path, backend):
+    config = Config()
+    config.DATA_DIR = str(tmp_path)
+    config.STORAGE_CONFIG = {**config.STORAGE_CONFIG, 'backend': backend}
+    return config
+
+
+def _stored(processor, vacancy_id, **fields):
+    url = f'https://rabota.by/vacancy/{vacancy_id}'
+    raw = {'title': f'Вакансия {vacancy_id}', 'salary_raw': 'от 2 500 до 3 000 Br на руки',
+           'address': 'Гомель, ул. Советская', 'url': url,
+           'monitoring_date': '05.01.2026', 'monitoring_time': '10:00:00', **fields}
+    return processor.process_single_vacancy(raw, {url: ['Программист', 'Тестировщик']})
+
+
+@pytest.mark.parametrize('backend', ['journal', 'sqlite'])
+def test_reprocess_month(tmp_path, backend):
+    config = _config(tmp_path, backend)
+    processor = DataProcessor(config)
+
+    store = open_vacancy_store(config, DATE_STR)
+    for vacancy_id in (3, 1, 2):
+        store.append(_stored(processor, vacancy_id))
+    store.close()
+
+    # Для вакансии 1 в кэше есть страница — поля берутся из нее, а не из хранилища
+    cache = HtmlCache(config.get_data_file('html_cache'), max_bytes=10 * 1024 * 1024)
+    cache.put(1, CACHED_PAGE)
+    cache.close()
+
+    assert reprocess_month(config, DATE_STR, workers=1, chunk_size=2) == 3
+
+    with open(config.get_output_file(DATE_STR), 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    assert [record['url'] for record in records] == [f'https://rabota.by/vacancy/{i}' for i in (3, 1, 2)]
+    by_id = {record['url'][-1]: record for record in records}
+
+    assert by_id['1']['title'] == 'Главный архитектор решений'
+    assert (by_id['1']['salary_min'], by_id['1']['currency']) == (5100, 'USD')
+    assert by_id['1']['monitoring_date'] == '05.01.2026'
+
+    # Без страницы в кэше запись гармонизируется заново по сырым полям
+    assert by_id['2'] == _stored(processor, 2)
+    for record in records:
+        assert record['specializations'] == ['Программист', 'Тестировщик']
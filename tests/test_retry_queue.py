@@ -0,0 +1,141 @@
+"""
+Очередь повторов: экспоненциальная задержка, due()/next_due_in(), max_retries, закрытые вакансии,
+сохранение пачкой
+"""
+
+import json
+
+import pytest
+
+from src import retry_queue as retry_queue_module
+from src.retry_queue import RetryQueue
+
+
+URL = 'https://rabota.by/vacancy/1'
+
+
+class FakeClock:
+    """Подменяет модуль time в src.retry_queue: время двигается только вручную"""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(retry_queue_module, 'time', fake)
+    return fake
+
+
+def _open(tmp_path, max_retries=4):
+    return RetryQueue(str(tmp_path / 'retry.json'), max_retries=max_retries, backoff_base=10, backoff_max=25)
+
+
+def test_backoff_and_due(tmp_path, clock):
+    queue = _open(tmp_path)
+    start = clock.now
+
+    entry = queue.record_failure(URL, ['Программист', 'Тестировщик'], 'TimeoutException')
+    assert (entry['attempts'], entry['status'], entry['next_attempt_at']) == (1, 'pending', start + 10)
+    assert (entry['specialization'], entry['specializations']) == ('Программист', ['Программист', 'Тестировщик'])
+
+    assert queue.due() == []
+    assert queue.due(start + 9.9) == []
+    assert queue.due(start + 10) == [entry]
+    assert queue.next_due_in() == 10
+    assert queue.next_due_in(start + 4) == 6
+    # Время попытки уже прошло — ждать не нужно
+    assert queue.next_due_in(start + 60) == 0
+
+    # Задержка удваивается, но не превышает backoff_max
+    clock.now += 10
+    assert queue.record_failure(URL, ['Программист'], None)['next_attempt_at'] == clock.now + 20
+    assert queue.entries[URL]['last_error'] == 'Unknown'
+    clock.now += 20
+    assert queue.record_failure(URL, ['Программист'], 'FetchError')['next_attempt_at'] == clock.now + 25
+
+
+def test_max_retries(tmp_path, clock):
+    queue = _open(tmp_path, max_retries=2)
+    queue.record_failure(URL, ['Программист'], 'FetchError')
+    entry = queue.record_failure(URL, ['Программист'], 'ChallengeError')
+
+    assert (entry['attempts'], entry['status'], entry['next_attempt_at']) == (2, 'failed', None)
+    assert queue.pending() == []
+    assert queue.failed() == [entry]
+    assert queue.due(clock.now + 1000) == []
+    assert queue.next_due_in() is None
+
+
+def test_gone_vacancy_is_not_retried(tmp_path, clock):
+    queue = _open(tmp_path)
+    queue.record_failure(URL, ['Программист'], 'FetchError')
+    entry = queue.record_failure(URL, ['Программист'], 'PageGoneError')
+
+    assert (entry['attempts'], entry['status'], entry['next_attempt_at']) == (2, 'gone', None)
+    assert (queue.pending(), queue.failed(), queue.gone()) == ([], [], [entry])
+    assert queue.next_due_in() is None
+
+
+def test_is_held(tmp_path, clock):
+    queue = _open(tmp_path, max_retries=1)
+    queue.record_failure(URL, ['Программист'], 'FetchError')
+    queue.record_failure('https://rabota.by/vacancy/2', ['Программист'], 'PageGoneError')
+    queue = _open(tmp_path, max_retries=2)
+    queue.record_failure('https://rabota.by/vacancy/3', ['Программист'], 'FetchError')
+
+    # Попытки закончились или вакансия закрыта — не загружается вовсе
+    assert queue.is_held(URL, clock.now + 1000)
+    assert queue.is_held('https://rabota.by/vacancy/2', clock.now + 1000)
+    # Ожидающая ссылка — только до времени своей попытки
+    assert queue.is_held('https://rabota.by/vacancy/3')
+    assert not queue.is_held('https://rabota.by/vacancy/3', clock.now + 10)
+    assert not queue.is_held('https://rabota.by/vacancy/4')
+
+
+def test_success_and_reopen(tmp_path, clock):
+    queue = _open(tmp_path)
+    queue.record_failure(URL, ['Программист'], 'FetchError')
+    queue.record_failure('https://rabota.by/vacancy/2', ['Аналитик'], 'FetchError')
+
+    assert queue.record_success(URL) is True
+    assert queue.record_success(URL) is False
+
+    reopened = _open(tmp_path)
+    assert list(reopened.entries) == ['https://rabota.by/vacancy/2']
+    assert reopened.entries['https://rabota.by/vacancy/2']['next_attempt_at'] == clock.now + 10
+
+
+def test_batched_save(tmp_path, clock, monkeypatch):
+    queue = _open(tmp_path)
+    saves = []
+    original_save = queue.save
+    monkeypatch.setattr(queue, 'save', lambda: saves.append(len(queue.entries)) or original_save())
+
+    for index in range(100):
+        queue.record_failure(f'https://rabota.by/vacancy/{index}', ['Программист'], 'FetchError', save=False)
+    queue.record_success('https://rabota.by/vacancy/0', save=False)
+    assert saves == []
+    assert not (tmp_path / 'retry.json').exists()
+
+    # Одна запись файла на пачку; без изменений flush файл не трогает
+    queue.flush()
+    queue.flush()
+    queue.record_success('https://rabota.by/vacancy/1000', save=False)
+    queue.flush()
+    assert saves == [99]
+
+    with open(tmp_path / 'retry.json', 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 99
+
+
+def test_broken_queue_file(tmp_path, capsys):
+    (tmp_path / 'retry.json').write_text('[{"url": "https://rabota.by/vac', encoding='utf-8')
+
+    queue = _open(tmp_path)
+    assert queue.entries == {}
+    assert 'Не удалось прочитать очередь повторов' in capsys.readouterr().out
@@ -0,0 +1,89 @@
+"""
+Реестр селекторов: проверка файла, запасные селекторы, статистика и перезагрузка
+"""
+
+import os
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.config import Config
+from src.selector_registry import SelectorRegistry, load_selectors
+
+
+def _write(path, fields, version=1):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'fields': fields}, f)
+
+
+@pytest.fixture
+def fields():
+    with open(Config().SELECTORS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)['fields']
+
+
+def test_repository_file_is_valid():
+    loaded = load_selectors(Config().SELECTORS_FILE)
+    assert loaded['fields']['title'] == [('h1', None, None)]
+    assert loaded['fields']['description'][1] == ('div', 'class', 'g-user-content')
+
+
+@pytest.mark.parametrize('broken', [
+    {'title': []},
+    {'title': [{'tag': 'h1', 'class': 'a', 'data-qa': 'b'}]},
+    {'title': [{'class': 'two classes'}]},
+    {'unknown_field': [{'tag': 'h1'}]},
+])
+def test_invalid_files_are_rejected(tmp_path, fields, broken):
+    path = str(tmp_path / 'selectors.json')
+    _write(path, {**fields, **broken})
+    with pytest.raises(ValueError):
+        load_selectors(path)
+
+
+def test_fallback_selector_and_stats(tmp_path, fields):
+    path = str(tmp_path / 'selectors.json')
+    fields['title'] = [{'tag': 'h1', 'class': 'new-title'}, {'tag': 'h1'}]
+    _write(path, fields)
+
+    registry = SelectorRegistry(path, check_after=3, alert_default_rate=0.99)
+    current = registry.current
+    soup = BeautifulSoup('<h1>Старый заголовок</h1><span class="vacancy-company-name">ООО</span>', 'lxml')
+
+    for _ in range(3):
+        trace = {}
+        result = current.plan.extract(soup, trace)
+        current.stats.record_page(trace)
+
+    assert result['title'] == 'Старый заголовок'
+    assert current.stats.hits['title'] == [0, 3]
+    assert current.stats.hits['company'] == [3]
+    assert current.stats.defaults['experience'] == 3
+    assert 'experience' in current.stats.alerts and 'title' not in current.stats.alerts
+
+
+def test_hot_reload(tmp_path, fields):
+    path = str(tmp_path / 'selectors.json')
+    _write(path, fields)
+    registry = SelectorRegistry(path, reload_every=2)
+    first = registry.current
+
+    fields['work_schedule'].append({'data-qa': 'vacancy-view-employment-mode'})
+    _write(path, fields, version=2)
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+
+    assert registry.maybe_reload() is False  # Файл проверяется раз в 2 вызова
+    assert registry.maybe_reload() is True
+    assert registry.current is not first and registry.current.version == 2
+
+    soup = BeautifulSoup('<p data-qa="vacancy-view-employment-mode">Полная занятость</p>', 'lxml')
+    assert registry.current.plan.extract(soup)['work_schedule'] == 'Полная занятость'
+
+    # Испорченный файл не заменяет рабочие селекторы
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{')
+    os.utime(path, (os.path.getmtime(path) + 20,) * 2)
+    registry.maybe_reload()
+    assert registry.maybe_reload() is False
+    assert registry.current.version == 2
@@ -0,0 +1,194 @@
+"""
+Сбор ссылок: параллельные специализации, отметки по специализациям, полный обход,
+остановка на известных вакансиях
+"""
+
+import time
+
+import pytest
+
+from src.async_fetch import HostRateLimiter
+from src.config import Config
+from src.parser import VacancyParser
+from src.serp_state import SerpState
+from src.urls import vacancy_key
+
+
+DAY = 86400
+SEARCH = 'https://rabota.by/search/vacancy?professional_role=96'
+
+
+def _state(tmp_path):
+    return SerpState(str(tmp_path / 'serp_state.json'), full_sweep_days=7)
+
+
+def _urls(*ids):
+    return [f'https://rabota.by/vacancy/{vacancy_id}?hhtmFrom=vacancy_search_list' for vacancy_id in ids]
+
+
+def test_high_water_mark(tmp_path):
+    state = _state(tmp_path)
+
+    assert state.update('Программист', _urls(5, 3, 9) + ['https://rabota.by/employer/1'], full_sweep=True,
+                        now=1000) == 3
+    assert state.specs['Программист'] == {'high_water_id': 9, 'last_full_sweep_at': 1000, 'last_run_at': 1000}
+
+    # Выше отметки — только новые ID; отметка не уменьшается
+    assert state.update('Программист', _urls(10, 9, 4, 12), full_sweep=False, now=2000) == 2
+    assert state.update('Программист', _urls(1), full_sweep=False, now=3000) == 0
+    assert state.specs['Программист'] == {'high_water_id': 12, 'last_full_sweep_at': 1000, 'last_run_at': 3000}
+
+
+def test_full_sweep_schedule_and_reopen(tmp_path):
+    state = _state(tmp_path)
+    assert state.needs_full_sweep('Программист')
+
+    state.update('Программист', _urls(1), full_sweep=True, now=1000)
+    state.update('Аналитик', _urls(2), full_sweep=False, now=1000)
+    state.save()
+
+    reopened = _state(tmp_path)
+    assert not reopened.needs_full_sweep('Программист', now=1000 + 7 * DAY - 1)
+    assert reopened.needs_full_sweep('Программист', now=1000 + 7 * DAY)
+    # Специализация, которую еще ни разу не проходили полностью
+    assert reopened.needs_full_sweep('Аналитик', now=1001)
+
+
+def test_broken_state_file(tmp_path, capsys):
+    (tmp_path / 'serp_state.json').write_text('{"Программист": {"high_wa', encoding='utf-8')
+    assert _state(tmp_path).specs == {}
+    assert 'Не удалось прочитать состояние сбора ссылок' in capsys.readouterr().out
+
+
+def _serp_page(ids, pages_count):
+    items = ''.join(f'<a data-qa="serp-item__title" href="{url}">Вакансия</a>' for url in _urls(*ids))
+    pager = ''.join(f'<a data-qa="pager-page" href="/search/vacancy?page={page}">{page + 1}</a>'
+                    for page in range(pages_count))
+    return f'<html><body><div data-qa="vacancy-serp__results">{items}</div>{pager}</body></html>'
+
+
+class FakeFetcher:
+    """Отдает страницы выдачи по номеру страницы в адресе"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+
+    def fetch(self, url, markers, delay=None):
+        self.urls.append(url)
+        page = int(url.split('&page=')[1]) if '&page=' in url else 0
+        return _serp_page(self.pages[page], len(self.pages))
+
+
+def _parser(pages, stop_after=3):
+    config = Config()
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'serp_stop_after_known': stop_after}
+    parser = VacancyParser(config, use_cache=False)
+    parser.fetcher = FakeFetcher(pages)
+    return parser
+
+
+PAGES = [[20, 19, 18, 17], [16, 15, 14, 13], [12, 11, 10, 9]]
+
+
+def test_incremental_stops_after_known_in_row():
+    parser = _parser(PAGES)
+    # 17 известна, но следом идет неизвестная 16 — счетчик сбрасывается
+    known_keys = {vacancy_key(url) for url in _urls(17, 15, 14, 13, 12, 11)}
+
+    urls = parser._collect_spec_links(SEARCH, 'Программист', known_keys)
+
+    assert urls == _urls(20, 19, 18, 17, 16, 15, 14, 13)
+    # Выдача по дате публикации, третья страница не загружалась
+    assert parser.fetcher.urls == [f'{SEARCH}&order_by=publication_time', f'{SEARCH}&order_by=publication_time&page=1']
+
+
+@pytest.mark.parametrize('known_keys', [None, set()])
+def test_full_walk(known_keys):
+    parser = _parser(PAGES)
+    urls = parser._collect_spec_links(SEARCH, 'Программист', known_keys)
+    assert urls == _urls(*(vacancy_id for page in PAGES for vacancy_id in page))
+    assert len(parser.fetcher.urls) == 3
+
+
+class SpecFetcher:
+    """Выдача своя у каждой специализации; первые специализации отвечают дольше последних"""
+
+    def __init__(self, serps):
+        self.serps = serps
+        self.urls = []
+
+    def fetch(self, url, markers, delay=None):
+        self.urls.append(url)
+        role, _, page = url.partition('&page=')
+        pages = self.serps[role]
+        time.sleep(0.01 * (len(self.serps) - list(self.serps).index(role)))
+        return _serp_page(pages[int(page or 0)], len(pages))
+
+
+def test_parallel_specializations_keep_order(tmp_path):
+    serps = {
+        f'{SEARCH}1': [[1, 2], [3]],
+        f'{SEARCH}2': [[4, 2]],
+        f'{SEARCH}3': [[5, 1, 6]],
+    }
+    (tmp_path / 'links.txt').write_text('\n'.join(serps), encoding='utf-8')
+    (tmp_path / 'names.txt').write_text('Программист\n# комментарий\nАналитик\nТестировщик', encoding='utf-8')
+
+    config = Config()
+    config.LINKS_FILE, config.NAMES_FILE = str(tmp_path / 'links.txt'), str(tmp_path / 'names.txt')
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'fetch_mode': 'http', 'serp_concurrency': 3}
+    parser = VacancyParser(config, use_cache=False)
+    parser.fetcher = SpecFetcher(serps)
+
+    links = parser.collect_vacancy_links()
+
+    # Порядок специализаций, а не порядок завершения загрузок; повторы — одна запись со всеми специализациями
+    assert [link['url'] for link in links] == [f'https://rabota.by/vacancy/{i}' for i in (1, 2, 3, 4, 5, 6)]
+    assert links[0]['specializations'] == ['Программист', 'Тестировщик']
+    assert links[1]['specializations'] == ['Программист', 'Аналитик']
+    # Первая страница выдачи загружается один раз
+    assert sorted(parser.fetcher.urls) == sorted(list(serps) + [f'{SEARCH}1&page=1'])
+
+
+class BlockingClock:
+    """Виртуальное время для потоков: sleep не ждет, а сдвигает часы"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_parallel_specializations_share_rate_limit(tmp_path):
+    serps = {f'{SEARCH}{role}': [[role]] for role in range(1, 5)}
+    (tmp_path / 'links.txt').write_text('\n'.join(serps), encoding='utf-8')
+    (tmp_path / 'names.txt').write_text('\n'.join(f'Специализация {role}' for role in range(1, 5)), encoding='utf-8')
+
+    config = Config()
+    config.LINKS_FILE, config.NAMES_FILE = str(tmp_path / 'links.txt'), str(tmp_path / 'names.txt')
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'fetch_mode': 'http', 'serp_concurrency': 4,
+                            'requests_per_second': 2.0, 'burst': 1}
+    parser = VacancyParser(config, use_cache=False)
+    parser.fetcher = SpecFetcher(serps)
+    clock = BlockingClock()
+    parser.serp_limiter = HostRateLimiter(2.0, 1, clock.monotonic, blocking_sleep=clock.sleep)
+
+    links = parser.collect_vacancy_links()
+
+    # Четыре потока, но к хосту не чаще 2 запросов в секунду: первый сразу, остальные — через 0.5 с
+    assert len(links) == 4
+    assert clock.sleeps == pytest.approx([0.5, 0.5, 0.5])
+
+
+def test_serp_limiter_from_config():
+    config = Config()
+    config.PARSER_CONFIG = {**config.PARSER_CONFIG, 'requests_per_second': 3.0, 'burst': 2}
+    limiter = VacancyParser(config, use_cache=False).serp_limiter
+    assert (limiter.rate, limiter.capacity) == (3.0, 2)
@@ -0,0 +1,105 @@
+"""
+Состояние страницы: поиск JSON, зарплата и поля из состояния, фрагменты разметки
+"""
+
+import json
+import html
+
+import pytest
+
+from src.state_extract import (
+    _salary_from_state, compare_with_dom, element_fragment, fields_from_state, find_initial_state,
+)
+
+
+STATE = {'vacancyView': {
+    'name': ' Программист Python ',
+    'compensation': {'from': 2500, 'to': 3000, 'currencyCode': 'BYN', 'gross': False},
+    'workExperience': 'between1And3',
+    'company': {'name': 'ООО Ромашка', 'visibleName': 'Ромашка'},
+    'address': {'rawAddress': 'Минск, ул. Немига, 5'},
+    'description': '<p>Пишем <b>парсеры</b></p>',
+    'keySkills': {'keySkill': ['Python', 'SQL']},
+}}
+
+
+def _page(template):
+    return f'<html><body><div id="app"></div>{template}</body></html>'
+
+
+def test_find_initial_state():
+    raw = json.dumps(STATE, ensure_ascii=False)
+    assert find_initial_state(_page(f'<template id="HH-Lux-InitialState">{raw}</template>')) == STATE
+    # JSON, экранированный как HTML
+    escaped = html.escape(raw)
+    assert find_initial_state(_page(f'<template id="HH-Lux-InitialState">{escaped}</template>')) == STATE
+
+
+@pytest.mark.parametrize('content', [
+    _page(''),
+    _page('<template id="HH-Lux-InitialState">{"vacancyView": {"name": "Про'),
+    _page('<template id="HH-Lux-InitialState">{"vacancyView": {"name": </template>'),
+    _page('<template id="HH-Lux-InitialState">not json &amp; not escaped json</template>'),
+    '<html><template id="HH-Lux-InitialState"',
+])
+def test_malformed_state(content):
+    assert find_initial_state(content) is None
+
+
+@pytest.mark.parametrize('compensation, expected', [
+    (None, None),
+    ({}, 'Уровень дохода не указан'),
+    ({'from': None, 'to': None, 'currencyCode': 'BYN'}, 'Уровень дохода не указан'),
+    ({'from': 2500, 'to': 3000, 'currencyCode': 'BYN', 'gross': False}, 'от 2 500 до 3 000 Br на руки'),
+    ({'from': 1500, 'currencyCode': 'USD', 'gross': True}, 'от 1 500 $ до вычета налогов'),
+    ({'to': 120000, 'currencyCode': 'RUR'}, 'до 120 000 ₽'),
+    ({'from': 900, 'to': 900, 'currencyCode': 'EUR'}, 'от 900 до 900 €'),
+    ({'from': 1000, 'currencyCode': 'KZT'}, 'от 1 000 KZT'),
+    ({'from': 1000}, 'от 1 000'),
+])
+def test_salary_from_state(compensation, expected):
+    assert _salary_from_state(compensation) == expected
+
+
+def test_fields_from_state():
+    assert fields_from_state(STATE) == {
+        'title': 'Программист Python',
+        'salary_raw': 'от 2 500 до 3 000 Br на руки',
+        'experience': '1–3 года',
+        'company': 'Ромашка',
+        'address': 'Минск, ул. Немига, 5',
+        'description': 'Пишем парсеры',
+        'skills': 'Python; SQL',
+    }
+
+
+def test_fields_missing_from_state():
+    assert fields_from_state({}) == {}
+    assert fields_from_state({'vacancyView': {'name': '', 'description': ' ', 'keySkills': {'keySkill': []},
+                                              'workExperience': 'unknown'}}) == {
+        'title': None, 'salary_raw': None, 'experience': None, 'company': None, 'address': None,
+        'description': 'Не указано', 'skills': 'Не указано',
+    }
+
+
+def test_compare_with_dom_normalizes_salary():
+    state_fields = fields_from_state(STATE)
+    dom_fields = {**state_fields, 'salary_raw': 'от 2\xa0500 до 3\xa0000 Br на руки'}
+    # На странице разряды разделены неразрывными пробелами
+    assert compare_with_dom(state_fields, dom_fields) == []
+    assert compare_with_dom(state_fields, {**dom_fields, 'company': 'ООО Ромашка'}) == ['company']
+    assert compare_with_dom(state_fields, {**dom_fields, 'salary_raw': 'от 2\u202f500 до 3\u202f000 Br на руки'}) == []
+    assert compare_with_dom(state_fields, {**dom_fields, 'salary_raw': 'от 2 500 до 3 500 Br на руки'}) == ['salary_raw']
+
+
+def test_element_fragment():
+    content = ('<div class="page"><p>Вступление</p><div data-qa="target" class="a">'
+               '<div><path d="M0"/>вложенный</div><p>текст</p></div><div>после</div></div>')
+    assert element_fragment(content, 'data-qa="target"', 'div') == (
+        '<div data-qa="target" class="a"><div><path d="M0"/>вложенный</div><p>текст</p></div>'
+    )
+    assert element_fragment(content, 'data-qa="missing"', 'div') is None
+    # Маркер в тексте, а не в открывающем теге
+    assert element_fragment('<div>data-qa="target"</div>', 'data-qa="target"', 'div') is None
+    # Незакрытый элемент
+    assert element_fragment('<div data-qa="target"><div>', 'data-qa="target"', 'div') is None
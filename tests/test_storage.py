@@ -0,0 +1,132 @@
+"""
+Хранилище вакансий: журнал JSONL и SQLite — восстановление, дедупликация, компактизация и перенос
+"""
+
+import json
+
+import pytest
+
+from src.storage import VacancyJournal, VacancyStore, write_json_array
+
+
+def _record(vacancy_id, **fields):
+    return {'url': f'https://rabota.by/vacancy/{vacancy_id}', 'title': f'Вакансия {vacancy_id}', **fields}
+
+
+@pytest.fixture(params=['journal', 'sqlite'])
+def open_store(request, tmp_path):
+    """Открывает хранилище выбранного бэкенда (повторный вызов — то же хранилище после перезапуска)"""
+    path = str(tmp_path / ('store.jsonl' if request.param == 'journal' else 'store.sqlite'))
+    opened = []
+
+    def open_():
+        store = VacancyJournal(path, fsync_every=2) if request.param == 'journal' else VacancyStore(path, batch_size=2)
+        opened.append(store)
+        return store
+
+    yield open_
+    for store in opened:
+        store.close()
+
+
+def test_journal_replay_skips_torn_last_line(tmp_path):
+    path = tmp_path / 'journal.jsonl'
+    lines = [json.dumps(_record(1), ensure_ascii=False), json.dumps(_record(2), ensure_ascii=False)]
+    # Запуск оборвался посреди записи третьей вакансии
+    path.write_text('\n'.join(lines) + '\n{"url": "https://rabota.by/vacancy/3", "tit', encoding='utf-8')
+
+    journal = VacancyJournal(str(path))
+    assert len(journal) == 2
+    assert 'https://rabota.by/vacancy/2' in journal
+    assert 'https://rabota.by/vacancy/3' not in journal
+
+    # Новая вакансия начинается с новой строки и читается после перезапуска
+    journal.append(_record(4))
+    journal.close()
+    reopened = VacancyJournal(str(path))
+    assert [record['url'][-1] for record in reopened.iter_records()] == ['1', '2', '4']
+    assert len(reopened) == 3
+
+
+def test_contains_uses_canonical_key(open_store):
+    store = open_store()
+    store.append(_record(129935107))
+
+    assert 'https://rabota.by/vacancy/129935107?hhtmFrom=vacancy_search_list' in store
+    assert 'https://minsk.rabota.by/vacancy/129935107/' in store
+    assert 'https://rabota.by/vacancy/129935108' not in store
+
+    # Та же вакансия под другим URL второй раз не добавляется
+    store.import_records([_record(129935107, title='Дубликат')])
+    assert len(store) == 1
+
+
+def test_flush_and_reopen(open_store):
+    store = open_store()
+    for vacancy_id in range(1, 6):
+        store.append(_record(vacancy_id))
+    store.flush()
+    store.close()
+
+    reopened = open_store()
+    assert len(reopened) == 5
+    assert 'https://rabota.by/vacancy/3' in reopened
+    assert [record['title'] for record in reopened.iter_records()] == [f'Вакансия {i}' for i in range(1, 6)]
+
+
+def test_compact_round_trip(open_store, tmp_path):
+    store = open_store()
+    records = [_record(vacancy_id, salary_raw='от 2 500 Br', skills='Python; SQL') for vacancy_id in (3, 1, 2)]
+    for record in records:
+        store.append(record)
+
+    output_file = str(tmp_path / 'data_finally_01.2026_Rabota_by.json')
+    assert store.compact(output_file) == 3
+
+    with open(output_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    # Формат как у json.dump(..., indent=4, ensure_ascii=False)
+    assert content == json.dumps(records, indent=4, ensure_ascii=False)
+
+
+def test_import_existing_data_finally(open_store, tmp_path):
+    from src.reader import iter_vacancies
+
+    output_file = str(tmp_path / 'data_finally_01.2026_Rabota_by.json')
+    records = [_record(1), _record(2), _record(1, title='Дубликат из другой специализации')]
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=4, ensure_ascii=False)
+
+    store = open_store()
+    store.import_records(iter_vacancies(output_file))
+
+    assert len(store) == 2
+    assert [record['title'] for record in store.iter_records()] == ['Вакансия 1', 'Вакансия 2']
+
+
+def test_write_json_array_empty(tmp_path):
+    output_file = str(tmp_path / 'empty.json')
+    assert write_json_array([], output_file) == 0
+    with open(output_file, 'r', encoding='utf-8') as f:
+        assert json.load(f) == []
+
+
+def test_sqlite_adds_specializations_column(tmp_path):
+    import sqlite3
+
+    # База, созданная до появления столбца specializations
+    path = str(tmp_path / 'store.sqlite')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE vacancies (vacancy_id INTEGER PRIMARY KEY, seq INTEGER NOT NULL, url TEXT NOT NULL, '
+                 'specialization TEXT, city TEXT, specialization_category TEXT, data TEXT NOT NULL)')
+    conn.commit()
+    conn.close()
+
+    store = VacancyStore(path)
+    store.append(_record(1, specialization='Программист', specializations=['Программист', 'Тестировщик']))
+    store.flush()
+
+    row = store.conn.execute('SELECT specializations FROM vacancies WHERE vacancy_id = 1').fetchone()
+    assert json.loads(row[0]) == ['Программист', 'Тестировщик']
+    assert next(store.iter_records())['specializations'] == ['Программист', 'Тестировщик']
+    store.close()
@@ -0,0 +1,46 @@
+"""
+Нормализация ссылок на вакансии: ID, канонический URL и ключ дедупликации
+"""
+
+import pytest
+
+from src.urls import canonical_vacancy_url, extract_vacancy_id, vacancy_key
+
+
+@pytest.mark.parametrize('url, vacancy_id, canonical', [
+    ('https://rabota.by/vacancy/129935107', 129935107, 'https://rabota.by/vacancy/129935107'),
+    ('https://rabota.by/vacancy/129935107?hhtmFrom=vacancy_search_list',
+     129935107, 'https://rabota.by/vacancy/129935107'),
+    ('https://rabota.by/vacancy/129935107?query=python&hhtmFrom=vacancy_search_list&hhtmFromLabel=rainbow_profession',
+     129935107, 'https://rabota.by/vacancy/129935107'),
+    ('https://rabota.by/vacancy/129935107/', 129935107, 'https://rabota.by/vacancy/129935107'),
+    ('https://rabota.by/vacancy/129935107/?hhtmFromLabel=similar_vacancies#anchor',
+     129935107, 'https://rabota.by/vacancy/129935107'),
+    # Поддомены и схема сохраняются, ключ у всех вариантов один
+    ('https://minsk.rabota.by/vacancy/129935107?hhtmFrom=main', 129935107, 'https://minsk.rabota.by/vacancy/129935107'),
+    ('http://www.rabota.by/vacancy/129935107', 129935107, 'http://www.rabota.by/vacancy/129935107'),
+    # Относительная ссылка из выдачи
+    ('/vacancy/129935107?hhtmFrom=vacancy_search_list', 129935107, 'https://rabota.by/vacancy/129935107'),
+])
+def test_vacancy_urls(url, vacancy_id, canonical):
+    assert extract_vacancy_id(url) == vacancy_id
+    assert canonical_vacancy_url(url) == canonical
+    assert vacancy_key(url) == vacancy_id
+    assert canonical_vacancy_url(canonical) == canonical
+
+
+@pytest.mark.parametrize('url', [
+    'https://rabota.by/employer/1234567',
+    'https://rabota.by/search/vacancy?text=python&area=16',
+    'https://rabota.by/applicant/vacancy_response?vacancyId=129935107',
+    'https://rabota.by/vacancy/',
+    '',
+])
+def test_non_vacancy_urls(url):
+    assert extract_vacancy_id(url) is None
+    assert canonical_vacancy_url(url) == url
+    assert vacancy_key(url) == url
+
+
+def test_none_url():
+    assert extract_vacancy_id(None) is None